@@ -1,4 +1,52 @@
 // common.js
+
+// Aggregate cube written by the ETL pipeline (src/cube.py): counts of each chart
+// measure by survey year, gender, age band, country, remote work and tech company
+window.loadDashboardCube = function () {
+  return d3.json('final_dashboard_cube.json');
+};
+
+function normalizeGender(gender) {
+  if (!gender) return 'Other';
+  const g = gender.toLowerCase();
+  if (g.includes('female')) return 'Female';
+  if (g.includes('male')) return 'Male';
+  return 'Other';
+}
+
+// Decoded cells of a measure kept by keep(cell). A cell holds its dimension and
+// measure values, max_age (the upper age of its band, null if unknown) and count.
+window.cubeCells = function (cube, measure, keep = () => true) {
+  cube.decoded = cube.decoded || {};
+  if (!cube.decoded[measure]) {
+    const names = cube.dimensions.concat(cube.measures[measure].columns);
+    cube.decoded[measure] = cube.measures[measure].cells.map(codes => {
+      const cell = { count: codes[codes.length - 1] };
+      names.forEach((name, i) => { cell[name] = cube.values[name][codes[i]]; });
+      cell.gender = normalizeGender(cell.gender);
+      cell.max_age = cell.age_band === null ? null : cell.age_band + cube.age_band_years - 1;
+      return cell;
+    });
+  }
+  return cube.decoded[measure].filter(keep);
+};
+
+// Label of the age filter. The cube counts ages by bands of age_band_years years and a
+// band is kept if all its ages are at or below the selected age, so the label shows the
+// upper age of the last band kept (e.g. up to 30 keeps the ages up to 29 with 5-year bands)
+window.ageLimitLabel = function (age) {
+  const cube = window.dashboardCube;
+  if (!cube) return `Up to ${age}`;
+  const years = cube.age_band_years;
+  const limit = Math.floor((age + 1) / years) * years - 1;
+  return limit === age ? `Up to ${age}` : `Up to ${age} (ages up to ${limit}, ${years}-year bands)`;
+};
+
+// Number of respondents in cells
+window.cubeTotal = function (cells) {
+  return d3.sum(cells, d => d.count);
+};
+
 document.addEventListener('DOMContentLoaded', () => {
   const applyFiltersBtn = document.getElementById('apply-filters');
   const ageInput = document.getElementById('age');
@@ -6,15 +54,15 @@ document.addEventListener('DOMContentLoaded', () => {
   const countrySelect = document.getElementById('country');
   const toast = document.getElementById('toast');
 
-  // surveyData is expected to be set globally by index.js after CSV load
-  // So here, just declare it (do NOT initialize or load CSV)
-  window.surveyData = window.surveyData || [];
+  // dashboardCube is expected to be set globally by index.js after the cube load
+  // So here, just declare it (do NOT load the cube)
+  window.dashboardCube = window.dashboardCube || null;
 
   ageInput.addEventListener('input', () => {
-    ageValue.textContent = ageInput.value;
+    ageValue.textContent = window.ageLimitLabel(+ageInput.value);
   });
 
-  // Populate country dropdown when surveyData is ready
+  // Populate country dropdown when dashboardCube is ready
   function populateCountryOptions(data) {
     const countries = Array.from(new Set(data.map(d => d.country).filter(c => c && c.trim() !== '')));
     countries.sort();
@@ -27,7 +75,7 @@ document.addEventListener('DOMContentLoaded', () => {
     });
   }
 
-  // Expose a function for index.js to call after CSV load
+  // Expose a function for index.js to call after the cube load
   window.commonPopulateCountryOptions = populateCountryOptions;
 
   // Filter button
@@ -42,18 +90,19 @@ document.addEventListener('DOMContentLoaded', () => {
     const remoteFilter = document.getElementById('remote').value;
     const techFilter = document.getElementById('tech').value;
 
-    let filtered = window.surveyData.filter(d => {
+    // Ages are filtered by whole bands: a band is kept if all its ages are below the limit
+    const keep = d => {
       if (genderFilter !== 'All' && d.gender !== genderFilter) return false;
       if (countryFilter !== 'All' && d.country !== countryFilter) return false;
       if (remoteFilter !== 'All' && d.remote_work !== remoteFilter) return false;
       if (techFilter !== 'All' && d.tech_company !== techFilter) return false;
-      if (d.age === null || d.age > ageFilter) return false;
+      if (d.max_age === null || d.max_age > ageFilter) return false;
       return true;
-    });
+    };
 
     // Update the summary metrics and charts using functions from index.js
-    if (window.updateCharts) {
-      window.updateCharts(filtered);
+    if (window.updateCharts && window.dashboardCube) {
+      window.updateCharts(keep);
     }
 
     showToast("Filters applied successfully!");
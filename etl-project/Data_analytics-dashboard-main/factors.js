@@ -7,7 +7,7 @@ document.addEventListener('DOMContentLoaded', () => {
   const resetFiltersBtn = document.getElementById('reset-filters');
 
   ageRange.addEventListener('input', () => {
-    ageValue.textContent = `Up to ${ageRange.value}`;
+    ageValue.textContent = window.ageLimitLabel(+ageRange.value);
   });
 
   const genders = ['All', 'Male', 'Female', 'Other'];
@@ -19,35 +19,20 @@ document.addEventListener('DOMContentLoaded', () => {
   });
 
   function initPage() {
-    d3.csv("final_data.csv").then(data => {
-      window.surveyData = data.map(row => {
-        row.age = row.age ? +row.age : null;
-        if (row.gender) {
-          const g = row.gender.toLowerCase();
-          if (g.includes('female')) row.gender = 'female';
-          else if (g.includes('male')) row.gender = 'male';
-          else row.gender = 'other';
-        } else {
-          row.gender = 'other';
-        }
-        if (row.treatment) {
-          const t = row.treatment.toString().toLowerCase();
-          row.treatment = (t === '1' || t === 'yes') ? 1 : 0;
-        } else {
-          row.treatment = 0;
-        }
-        return row;
-      });
+    window.loadDashboardCube().then(cube => {
+      window.dashboardCube = cube;
+      ageValue.textContent = window.ageLimitLabel(+ageRange.value);
+      const cells = window.cubeCells(cube, 'respondents');
 
       if (typeof window.commonPopulateCountryOptions === 'function') {
-        window.commonPopulateCountryOptions(window.surveyData);
+        window.commonPopulateCountryOptions(cells);
       } else {
-        populateCountryOptions(window.surveyData);
+        populateCountryOptions(cells);
       }
 
       applyFilters();
     }).catch(error => {
-      console.error("Error loading the CSV file:", error);
+      console.error("Error loading the dashboard cube:", error);
     });
   }
 
@@ -66,7 +51,7 @@ document.addEventListener('DOMContentLoaded', () => {
     countryFilter.value = 'all';
     genderFilter.value = 'all';
     ageRange.value = 80;
-    ageValue.textContent = 'Up to 80';
+    ageValue.textContent = window.ageLimitLabel(80);
     applyFilters();
   });
 
@@ -75,7 +60,7 @@ document.addEventListener('DOMContentLoaded', () => {
   });
 
   function applyFilters() {
-    if (!window.surveyData || window.surveyData.length === 0) {
+    if (!window.dashboardCube) {
       console.warn('No data loaded yet');
       return;
     }
@@ -84,29 +69,34 @@ document.addEventListener('DOMContentLoaded', () => {
     const genderVal = genderFilter.value.toLowerCase();
     const ageVal = +ageRange.value;
 
-    const filteredData = window.surveyData.filter(d => {
+    // Filter of the cube cells; age bands are kept if all their ages are below the limit
+    const keep = d => {
       if (countryVal !== 'all' && (!d.country || d.country.toLowerCase() !== countryVal)) return false;
       if (genderVal !== 'all' && (!d.gender || d.gender.toLowerCase() !== genderVal)) return false;
-      if (d.age === null || d.age > ageVal) return false;
+      if (d.max_age === null || d.max_age > ageVal) return false;
       return true;
-    });
-
-    drawFamilyHistoryChart(filteredData);
-    drawSelfEmployedChart(filteredData);
-    drawTechCompanyChart(filteredData);
-    // drawCountryTreatmentChart(filteredData);  // REMOVED this line!
-    drawRemoteTreatmentChart(filteredData);
-    drawCompanySizeChart(filteredData);
+    };
+
+    drawFamilyHistoryChart(keep);
+    drawSelfEmployedChart(keep);
+    drawTechCompanyChart(keep);
+    // drawCountryTreatmentChart(keep);  // REMOVED this line!
+    drawRemoteTreatmentChart(keep);
+    drawCompanySizeChart(keep);
   }
 
-  function countTreatmentByCategory(data, factorKey) {
+  function countTreatmentByCategory(keep, factorKey) {
+    // remote_work and tech_company are cube dimensions, the other factors have their own measure
+    const cube = window.dashboardCube;
+    const measure = cube.measures[`${factorKey}_treatment`] ? `${factorKey}_treatment` : 'treatment';
     const counts = {};
-    data.forEach(d => {
+    window.cubeCells(cube, measure, keep).forEach(d => {
       const cat = d[factorKey] || 'Unknown';
-      const treated = d.treatment === 1 ? 1 : 0;
+      const t = d.treatment ? d.treatment.toLowerCase() : '';
+      const treated = (t === '1' || t === 'yes') ? d.count : 0;
       if (!counts[cat]) counts[cat] = { treated: 0, total: 0 };
       counts[cat].treated += treated;
-      counts[cat].total += 1;
+      counts[cat].total += d.count;
     });
     return counts;
   }
@@ -215,30 +205,30 @@ function drawBarChart(containerId, dataObj, chartTitle) {
       .text(chartTitle);
 }
 
-  function drawFamilyHistoryChart(data) {
-    const counts = countTreatmentByCategory(data, 'family_history');
+  function drawFamilyHistoryChart(keep) {
+    const counts = countTreatmentByCategory(keep, 'family_history');
     drawBarChart('family-history-chart', counts, 'Family History Impact on Treatment');
   }
 
-  function drawSelfEmployedChart(data) {
-    const counts = countTreatmentByCategory(data, 'self_employed');
+  function drawSelfEmployedChart(keep) {
+    const counts = countTreatmentByCategory(keep, 'self_employed');
     drawBarChart('self-employed-chart', counts, 'Self-Employment vs Treatment');
   }
 
-  function drawTechCompanyChart(data) {
-    const counts = countTreatmentByCategory(data, 'tech_company');
+  function drawTechCompanyChart(keep) {
+    const counts = countTreatmentByCategory(keep, 'tech_company');
     drawBarChart('tech-company-chart', counts, 'Tech Company Impact on Treatment');
   }
 
   // REMOVED drawCountryTreatmentChart
 
-  function drawRemoteTreatmentChart(data) {
-    const counts = countTreatmentByCategory(data, 'remote_work');
+  function drawRemoteTreatmentChart(keep) {
+    const counts = countTreatmentByCategory(keep, 'remote_work');
     drawBarChart('remote-treatment-chart', counts, 'Remote Work vs Treatment');
   }
 
-  function drawCompanySizeChart(data) {
-    const counts = countTreatmentByCategory(data, 'no_employees');
+  function drawCompanySizeChart(keep) {
+    const counts = countTreatmentByCategory(keep, 'no_employees');
     drawBarChart('company-size-chart', counts, 'Company Size Impact on Treatment');
   }
 
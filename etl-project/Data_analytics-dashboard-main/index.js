@@ -10,7 +10,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const toast = document.getElementById('toast');
 
     ageFilter.addEventListener('input', () => {
-        ageValue.textContent = `Up to ${ageFilter.value}`;
+        ageValue.textContent = window.ageLimitLabel(+ageFilter.value);
     });
 
     function showToast() {
@@ -21,33 +21,22 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     function initPage() {
-        d3.csv("final_data.csv").then(data => {
-            window.surveyData = data.map(row => {
-                row.age = row.age ? +row.age : null;
+        window.loadDashboardCube().then(cube => {
+            window.dashboardCube = cube;
+            ageValue.textContent = window.ageLimitLabel(+ageFilter.value);
+            const cells = window.cubeCells(cube, 'respondents');
 
-                if (row.gender) {
-                    const g = row.gender.toLowerCase();
-                    if (g.includes('female')) row.gender = 'Female';
-                    else if (g.includes('male')) row.gender = 'Male';
-                    else row.gender = 'Other';
-                } else {
-                    row.gender = 'Other';
-                }
-
-                return row;
-            });
-
-            console.log("Data loaded and normalized:", window.surveyData.slice(0, 5));
+            console.log("Cube loaded:", cube.rows, "respondents in", cells.length, "cells");
 
             if (typeof window.commonPopulateCountryOptions === 'function') {
-                window.commonPopulateCountryOptions(window.surveyData);
+                window.commonPopulateCountryOptions(cells);
             } else {
-                populateCountryOptions(window.surveyData);
+                populateCountryOptions(cells);
             }
 
-            updateCharts(window.surveyData);
+            updateCharts(() => true);
         }).catch(error => {
-            console.error("Error loading the CSV file:", error);
+            console.error("Error loading the dashboard cube:", error);
         });
     }
 
@@ -65,7 +54,7 @@ document.addEventListener('DOMContentLoaded', () => {
     resetFiltersBtn.addEventListener('click', () => {
         genderFilter.value = 'All';
         ageFilter.value = 30;
-        ageValue.textContent = 'Up to 30';
+        ageValue.textContent = window.ageLimitLabel(30);
         countryFilter.value = 'All';
         remoteFilter.value = 'All';
         techFilter.value = 'All';
@@ -78,7 +67,7 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     function applyFilters() {
-        if (!window.surveyData || window.surveyData.length === 0) {
+        if (!window.dashboardCube) {
             console.warn('No data loaded yet');
             return;
         }
@@ -89,35 +78,41 @@ document.addEventListener('DOMContentLoaded', () => {
         const remoteVal = remoteFilter.value;
         const techVal = techFilter.value;
 
-        const filteredData = window.surveyData.filter(d => {
+        const keep = d => {
             if (genderVal !== 'All' && d.gender !== genderVal) return false;
-            if (d.age === null || d.age > ageVal) return false;
+            if (d.max_age === null || d.max_age > ageVal) return false;
             if (countryVal !== 'All' && d.country !== countryVal) return false;
             if (remoteVal !== 'All' && d.remote_work !== remoteVal) return false;
             if (techVal !== 'All' && d.tech_company !== techVal) return false;
             return true;
-        });
+        };
 
-        updateCharts(filteredData);
+        updateCharts(keep);
     }
 
     function calculatePercentage(data, key, value) {
-        if (data.length === 0) return 0;
-        const count = data.filter(d => d[key] && d[key].toString().toLowerCase() === value.toString().toLowerCase()).length;
-        return ((count / data.length) * 100).toFixed(1);
+        const total = window.cubeTotal(data);
+        if (total === 0) return 0;
+        const count = window.cubeTotal(data.filter(d => d[key] && d[key].toString().toLowerCase() === value.toString().toLowerCase()));
+        return ((count / total) * 100).toFixed(1);
     }
 
-    function updateSummaryMetrics(data) {
-        const treatmentRate = calculatePercentage(data, 'treatment', '1');
+    function updateSummaryMetrics(keep) {
+        const cube = window.dashboardCube;
+        const treatmentRate = calculatePercentage(window.cubeCells(cube, 'treatment', keep), 'treatment', '1');
         document.getElementById('treatment-rate').textContent = treatmentRate === '0.0' ? '0.0%' : `${treatmentRate}%`;
 
+        const data = window.cubeCells(cube, 'work_interfere', keep);
         const interferenceData = data.filter(item => item.work_interfere && item.work_interfere.toLowerCase() !== 'never');
-        const interferenceRate = interferenceData.length > 0 ? ((interferenceData.length / data.length) * 100).toFixed(1) : 0;
+        const interferenceCount = window.cubeTotal(interferenceData);
+        const interferenceRate = interferenceCount > 0 ? ((interferenceCount / window.cubeTotal(data)) * 100).toFixed(1) : 0;
         document.getElementById('interference-rate').textContent = `${interferenceRate}%`;
     }
 
-    function updateCharts(data) {
-        updateSummaryMetrics(data);
+    // keep: filter of the cube cells (see applyFilters)
+    function updateCharts(keep) {
+        const data = window.cubeCells(window.dashboardCube, 'respondents', keep);
+        updateSummaryMetrics(keep);
         createGenderChart(data);
         createCountryChart(data);
         createAgeChart(data);
@@ -133,8 +128,8 @@ document.addEventListener('DOMContentLoaded', () => {
 
         const counts = { Male: 0, Female: 0, Other: 0 };
         data.forEach(d => {
-            if (counts.hasOwnProperty(d.gender)) counts[d.gender]++;
-            else counts.Other++;
+            if (counts.hasOwnProperty(d.gender)) counts[d.gender] += d.count;
+            else counts.Other += d.count;
         });
 
         const width = 300, height = 300, radius = Math.min(width, height) / 2;
@@ -187,7 +182,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
         const countryCounts = d3.rollup(
             data,
-            v => v.length,
+            v => window.cubeTotal(v),
             d => d.country || 'Unknown'
         );
 
@@ -271,8 +266,13 @@ document.addEventListener('DOMContentLoaded', () => {
     function createAgeChart(data) {
         clearChart('age-chart');
 
-        const ages = data.map(d => d.age).filter(age => age !== null && !isNaN(age));
-        if (ages.length === 0) return;
+        // One bin per age band of the cube
+        const bandYears = window.dashboardCube.age_band_years;
+        const bins = Array.from(
+            d3.rollup(data.filter(d => d.age_band !== null), v => window.cubeTotal(v), d => d.age_band),
+            ([x0, length]) => ({ x0, x1: x0 + bandYears, length })
+        ).sort((a, b) => a.x0 - b.x0);
+        if (bins.length === 0) return;
 
         const margin = {top: 30, right: 30, bottom: 50, left: 50};
         const width = 400 - margin.left - margin.right;
@@ -285,17 +285,11 @@ document.addEventListener('DOMContentLoaded', () => {
             .append('g')
             .attr('transform', `translate(${margin.left},${margin.top})`);
 
-        // X scale: age bins (5-year intervals)
+        // X scale: age bands
         const x = d3.scaleLinear()
-            .domain([d3.min(ages), d3.max(ages)])
+            .domain([bins[0].x0, bins[bins.length - 1].x1])
             .range([0, width]);
 
-        const histogram = d3.histogram()
-            .domain(x.domain())
-            .thresholds(x.ticks(Math.floor((d3.max(ages) - d3.min(ages))/5)));
-
-        const bins = histogram(ages);
-
         const y = d3.scaleLinear()
             .domain([0, d3.max(bins, d => d.length)])
             .nice()
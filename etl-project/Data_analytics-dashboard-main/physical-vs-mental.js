@@ -7,7 +7,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const resetFiltersBtn = document.getElementById('reset-filters');
 
     ageRange.addEventListener('input', () => {
-        ageValue.textContent = `Up to ${ageRange.value}`;
+        ageValue.textContent = window.ageLimitLabel(+ageRange.value);
     });
 
     const genders = ['All', 'Male', 'Female', 'Other'];
@@ -19,40 +19,20 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     function initPage() {
-        d3.csv("final_data.csv").then(data => {
-            window.surveyData = data.map(row => {
-                // Clean and normalize data
-                row.age = row.age ? +row.age : null;
-                
-                if (row.gender) {
-                    const g = row.gender.toLowerCase();
-                    if (g.includes('female')) row.gender = 'female';
-                    else if (g.includes('male')) row.gender = 'male';
-                    else row.gender = 'other';
-                } else {
-                    row.gender = 'other';
-                }
-                
-                // Clean text fields
-                row.mental_health_consequence = row.mental_health_consequence ? row.mental_health_consequence.trim() : 'Unknown';
-                row.phys_health_consequence = row.phys_health_consequence ? row.phys_health_consequence.trim() : 'Unknown';
-                row.mental_health_interview = row.mental_health_interview ? row.mental_health_interview.trim() : 'Unknown';
-                row.phys_health_interview = row.phys_health_interview ? row.phys_health_interview.trim() : 'Unknown';
-                row.coworkers = row.coworkers ? row.coworkers.trim() : 'Unknown';
-                row.mental_vs_physical = row.mental_vs_physical ? row.mental_vs_physical.trim() : 'Unknown';
-                
-                return row;
-            });
+        window.loadDashboardCube().then(cube => {
+            window.dashboardCube = cube;
+            ageValue.textContent = window.ageLimitLabel(+ageRange.value);
+            const cells = window.cubeCells(cube, 'respondents');
 
             if (typeof window.commonPopulateCountryOptions === 'function') {
-                window.commonPopulateCountryOptions(window.surveyData);
+                window.commonPopulateCountryOptions(cells);
             } else {
-                populateCountryOptions(window.surveyData);
+                populateCountryOptions(cells);
             }
 
             applyFilters();
         }).catch(error => {
-            console.error("Error loading the CSV file:", error);
+            console.error("Error loading the dashboard cube:", error);
         });
     }
 
@@ -71,7 +51,7 @@ document.addEventListener('DOMContentLoaded', () => {
         countryFilter.value = 'all';
         genderFilter.value = 'all';
         ageRange.value = 80;
-        ageValue.textContent = 'Up to 80';
+        ageValue.textContent = window.ageLimitLabel(80);
         applyFilters();
     });
 
@@ -80,7 +60,7 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     function applyFilters() {
-        if (!window.surveyData || window.surveyData.length === 0) {
+        if (!window.dashboardCube) {
             console.warn('No data loaded yet');
             return;
         }
@@ -89,21 +69,23 @@ document.addEventListener('DOMContentLoaded', () => {
         const genderVal = genderFilter.value.toLowerCase();
         const ageVal = +ageRange.value;
 
-        const filteredData = window.surveyData.filter(d => {
+        // Filter of the cube cells; age bands are kept if all their ages are below the limit
+        const keep = d => {
             if (countryVal !== 'all' && (!d.country || d.country.toLowerCase() !== countryVal)) return false;
             if (genderVal !== 'all' && (!d.gender || d.gender.toLowerCase() !== genderVal)) return false;
-            if (d.age === null || d.age > ageVal) return false;
+            if (d.max_age === null || d.max_age > ageVal) return false;
             return true;
-        });
+        };
 
-        createBarChart(filteredData, 'mental_health_consequence', '#mental-consequence-chart', 'Mental Health Consequences');
-        createBarChart(filteredData, 'phys_health_consequence', '#physical-consequence-chart', 'Physical Health Consequences');
-        createBarChart(filteredData, 'mental_health_interview', '#interview-comparison-chart', 'Interview Discussion Comparison');
-        createBarChart(filteredData, 'coworkers', '#coworkers-chart', 'Coworker Discussions');
-        createBarChart(filteredData, 'mental_vs_physical', '#employer-perception-chart', 'Employer Perception');
+        createBarChart(keep, 'mental_health_consequence', '#mental-consequence-chart', 'Mental Health Consequences');
+        createBarChart(keep, 'phys_health_consequence', '#physical-consequence-chart', 'Physical Health Consequences');
+        createBarChart(keep, 'mental_health_interview', '#interview-comparison-chart', 'Interview Discussion Comparison');
+        createBarChart(keep, 'coworkers', '#coworkers-chart', 'Coworker Discussions');
+        createBarChart(keep, 'mental_vs_physical', '#employer-perception-chart', 'Employer Perception');
     }
 
-    function createBarChart(data, column, container, title) {
+    function createBarChart(keep, column, container, title) {
+        const data = window.cubeCells(window.dashboardCube, column, keep);
         const margin = { top: 40, right: 20, bottom: 60, left: 60 };
         const containerWidth = d3.select(container).node().clientWidth;
         const width = containerWidth - margin.left - margin.right;
@@ -122,8 +104,8 @@ document.addEventListener('DOMContentLoaded', () => {
         // Count frequency
         const counts = {};
         data.forEach(d => {
-            const value = d[column] || "Unknown";
-            counts[value] = (counts[value] || 0) + 1;
+            const value = d[column] ? d[column].trim() : "Unknown";
+            counts[value] = (counts[value] || 0) + d.count;
         });
 
         const entries = Object.entries(counts).map(([key, value]) => ({ key, value }));
@@ -7,39 +7,19 @@ document.addEventListener('DOMContentLoaded', () => {
     const resetFiltersBtn = document.getElementById('reset-filters');
 
     ageRange.addEventListener('input', () => {
-        ageValue.textContent = `Up to ${ageRange.value}`;
+        ageValue.textContent = window.ageLimitLabel(+ageRange.value);
     });
 
     function initPage() {
-        d3.csv('final_data.csv').then(data => {
-            // Clean and normalize data
-            window.surveyData = data.map(row => {
-                row.age = row.age ? +row.age : null;
-                
-                if (row.gender) {
-                    const g = row.gender.toLowerCase();
-                    if (g.includes('female')) row.gender = 'female';
-                    else if (g.includes('male')) row.gender = 'male';
-                    else row.gender = 'other';
-                } else {
-                    row.gender = 'other';
-                }
-                
-                // Clean support-related fields
-                row.benefits = row.benefits ? row.benefits.trim() : 'Unknown';
-                row.care_options = row.care_options ? row.care_options.trim() : 'Unknown';
-                row.wellness_program = row.wellness_program ? row.wellness_program.trim() : 'Unknown';
-                row.seek_help = row.seek_help ? row.seek_help.trim() : 'Unknown';
-                row.anonymity = row.anonymity ? row.anonymity.trim() : 'Unknown';
-                row.leave = row.leave ? row.leave.trim() : 'Unknown';
-                
-                return row;
-            });
+        window.loadDashboardCube().then(cube => {
+            window.dashboardCube = cube;
+            ageValue.textContent = window.ageLimitLabel(+ageRange.value);
+            const cells = window.cubeCells(cube, 'respondents');
 
             if (typeof window.commonPopulateCountryOptions === 'function') {
-                window.commonPopulateCountryOptions(window.surveyData);
+                window.commonPopulateCountryOptions(cells);
             } else {
-                populateCountryOptions(window.surveyData);
+                populateCountryOptions(cells);
             }
 
             // Initialize gender filter options
@@ -54,7 +34,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
             applyFilters();
         }).catch(error => {
-            console.error("Error loading the CSV file:", error);
+            console.error("Error loading the dashboard cube:", error);
         });
     }
 
@@ -73,7 +53,7 @@ document.addEventListener('DOMContentLoaded', () => {
         countryFilter.value = 'all';
         genderFilter.value = 'all';
         ageRange.value = 80;
-        ageValue.textContent = 'Up to 80';
+        ageValue.textContent = window.ageLimitLabel(80);
         applyFilters();
     });
 
@@ -82,7 +62,7 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     function applyFilters() {
-        if (!window.surveyData || window.surveyData.length === 0) {
+        if (!window.dashboardCube) {
             console.warn('No data loaded yet');
             return;
         }
@@ -91,22 +71,26 @@ document.addEventListener('DOMContentLoaded', () => {
         const genderVal = genderFilter.value.toLowerCase();
         const ageVal = +ageRange.value;
 
-        const filteredData = window.surveyData.filter(d => {
+        // Filter of the cube cells; age bands are kept if all their ages are below the limit
+        const keep = d => {
             if (countryVal !== 'all' && (!d.country || d.country.toLowerCase() !== countryVal)) return false;
             if (genderVal !== 'all' && (!d.gender || d.gender.toLowerCase() !== genderVal)) return false;
-            if (d.age === null || d.age > ageVal) return false;
+            if (d.max_age === null || d.max_age > ageVal) return false;
             return true;
-        });
-
-        renderVerticalBarChart(filteredData, 'benefits-chart', 'benefits', 'Mental Health Benefits');
-        renderVerticalBarChart(filteredData, 'care-options-chart', 'care_options', 'Knowledge of Care Options');
-        renderVerticalBarChart(filteredData, 'wellness-program-chart', 'wellness_program', 'Wellness Program Inclusion');
-        renderVerticalBarChart(filteredData, 'resources-chart', 'seek_help', 'Employer Resources');
-        renderVerticalBarChart(filteredData, 'anonymity-chart', 'anonymity', 'Anonymity Protection');
-        renderVerticalBarChart(filteredData, 'leave-chart', 'leave', 'Medical Leave Accessibility');
+        };
+
+        renderVerticalBarChart(keep, 'benefits-chart', 'benefits', 'Mental Health Benefits');
+        renderVerticalBarChart(keep, 'care-options-chart', 'care_options', 'Knowledge of Care Options');
+        renderVerticalBarChart(keep, 'wellness-program-chart', 'wellness_program', 'Wellness Program Inclusion');
+        renderVerticalBarChart(keep, 'resources-chart', 'seek_help', 'Employer Resources');
+        renderVerticalBarChart(keep, 'anonymity-chart', 'anonymity', 'Anonymity Protection');
+        renderVerticalBarChart(keep, 'leave-chart', 'leave', 'Medical Leave Accessibility');
     }
 
-    function renderVerticalBarChart(data, containerId, field, title) {
+    function renderVerticalBarChart(keep, containerId, field, title) {
+        // Missing answers count as 'Unknown'
+        const data = window.cubeCells(window.dashboardCube, field, keep)
+            .map(d => ({ ...d, [field]: d[field] ? d[field].trim() : 'Unknown' }));
         const container = d3.select(`#${containerId}`);
         container.selectAll("*").remove();
 
@@ -123,7 +107,7 @@ document.addEventListener('DOMContentLoaded', () => {
             .attr("transform", `translate(${margin.left},${margin.top})`);
 
         // Group and count data
-        const groupedData = d3.rollups(data, v => v.length, d => d[field])
+        const groupedData = d3.rollups(data, v => window.cubeTotal(v), d => d[field])
                             .filter(d => d[0] && d[0].trim() !== '') // Remove empty responses
                             .sort((a, b) => b[1] - a[1]); // Sort by count descending
 
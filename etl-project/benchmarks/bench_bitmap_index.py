@@ -0,0 +1,93 @@
+"""
+Benchmark: multi-filter counts with the bitmap index vs boolean scans.
+
+Usage (from etl-project/):
+    python benchmarks/bench_bitmap_index.py [--scale 300] [--repeat 20]
+
+Synthetic surveys (see synthetic.py) are run through the pipeline; the
+integrated rows are tiled to reach about --scale times the real surveys and
+bitmap-indexed. Each conjunction is counted with a pandas boolean scan and
+with BitmapIndex.count (best of --repeat runs, in microseconds).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+import etl  # noqa: E402
+from bitmap_index import BitmapIndex  # noqa: E402
+from synthetic import synthetic_surveys  # noqa: E402
+
+# Base synthetic size; larger scales tile the integrated rows
+BASE_SCALE = 10
+
+QUERIES = [
+    {'country': 'UK', 'gender': 'Female'},
+    {'country': 'USA', 'gender': 'Male', 'benefits': 'Yes', 'survey_year': 2014},
+    {'country': ['USA', 'UK', 'Canada'], 'remote_work': 'Yes', 'treatment': 'Yes'},
+    {'gender': 'Other', 'family_history': 'Yes', 'leave': 'Very easy', 'coworkers': 'Yes', 'survey_year': 2016},
+]
+
+
+def integrated_rows(scale, seed):
+    """Integrated rows of the synthetic surveys, tiled to about scale times the real surveys"""
+    raw = synthetic_surveys(min(scale, BASE_SCALE), seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        surveys = etl.transform_surveys(etl.clean_survey_2014(raw[2014]), etl.clean_survey_2016(raw[2016]),
+                                        etl.clean_survey_2025(raw[2025]))
+        final_df = etl.clean_final_df(etl.merge_all_surveys(*surveys))
+    copies = max(1, round(scale / BASE_SCALE))
+    return pd.concat([final_df] * copies, ignore_index=True)
+
+
+def scan_count(df, filters):
+    """Count of the rows matching filters with a boolean scan"""
+    mask = pd.Series(True, index=df.index)
+    for column, wanted in filters.items():
+        mask &= df[column].isin(wanted if isinstance(wanted, list) else [wanted])
+    return int(mask.sum())
+
+
+def best_time(func, repeat):
+    """(best seconds, result) of func()"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=float, default=300, help='Size of the integrated rows (x real surveys)')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query (the best one is kept)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    etl.DATA_RAW_PATH = os.path.join(SRC_PATH, '..', 'data', 'raw')
+    df = integrated_rows(args.scale, args.seed)
+    seconds, index = best_time(lambda: BitmapIndex.build(df), 1)
+    print(f"rows: {len(df):,}, indexed columns: {len(index.bitmaps)}, build: {seconds:.2f}s")
+    print(f"{'filters':<6} {'rows':>10} {'scan us':>11} {'index us':>10} {'speedup':>8}")
+
+    for filters in QUERIES:
+        scan_seconds, expected = best_time(lambda: scan_count(df, filters), args.repeat)
+        index_seconds, count = best_time(lambda: index.count(**filters), args.repeat)
+        assert count == expected, (filters, count, expected)
+        print(f"{len(filters):<6} {count:>10,} {scan_seconds * 1e6:11.0f} {index_seconds * 1e6:10.0f} "
+              f"{scan_seconds / index_seconds:7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: open time and private memory of the integrated rows per reader process.
+
+Usage (from etl-project/):
+    python benchmarks/bench_columnar.py [--scale 100] [--workers 4]
+
+Synthetic integrated rows (see bench_dtype_plan.integrated_rows) are written
+as CSV, Feather and memory-mappable columns (see columnar.write_columnar).
+--workers processes then open each layout at the same time and read every
+column; the open time and the anonymous memory of each worker (its private
+copy of the data, as opposed to the shared page cache) are reported.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import warnings
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+import etl  # noqa: E402
+from bench_dtype_plan import integrated_rows  # noqa: E402
+from columnar import write_columnar  # noqa: E402
+from writers import write_output  # noqa: E402
+
+WORKER = '''
+import sys
+import time
+import warnings
+import pandas as pd
+from columnar import load_columnar
+
+def anonymous_kb():
+    with open('/proc/self/smaps_rollup') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith('Anonymous:'))
+
+warnings.simplefilter('ignore')
+READERS = {'csv': pd.read_csv, 'feather': pd.read_feather, 'columnar': load_columnar}
+before = anonymous_kb()
+start = time.perf_counter()
+df = READERS[sys.argv[1]](sys.argv[2])
+seconds = time.perf_counter() - start
+sum(int(df[column].notna().sum()) for column in df.columns)
+print(seconds, anonymous_kb() - before)
+'''
+
+
+def run_workers(layout, path, workers):
+    """[(open seconds, anonymous KB)] of workers processes opening path at the same time"""
+    env = dict(os.environ, PYTHONPATH=SRC_PATH)
+    processes = [subprocess.Popen([sys.executable, '-c', WORKER, layout, path], env=env, stdout=subprocess.PIPE,
+                                  text=True) for _ in range(workers)]
+    return [tuple(float(value) for value in process.communicate()[0].split()) for process in processes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=float, default=100, help='Size of the integrated rows (x real surveys)')
+    parser.add_argument('--workers', type=int, default=4, help='Reader processes opening each layout')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    etl.DATA_RAW_PATH = os.path.join(SRC_PATH, '..', 'data', 'raw')
+    df = integrated_rows(args.scale, args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {
+            'csv': write_output(df, os.path.join(directory, 'integrated'), 'csv'),
+            'feather': write_output(df, os.path.join(directory, 'integrated'), 'feather'),
+            'columnar': write_columnar(df, os.path.join(directory, 'integrated_columns')),
+        }
+        print(f"rows: {len(df):,}, {args.workers} workers per layout")
+        print(f"{'layout':<10} {'open s (mean)':>14} {'private MB (mean)':>18} {'private MB (all)':>17}")
+        for layout, path in paths.items():
+            results = run_workers(layout, path, args.workers)
+            seconds = sum(result[0] for result in results) / len(results)
+            megabytes = [result[1] / 1024 for result in results]
+            print(f"{layout:<10} {seconds:14.3f} {sum(megabytes) / len(megabytes):18.1f} {sum(megabytes):17.1f}")
+
+
+if __name__ == '__main__':
+    main()
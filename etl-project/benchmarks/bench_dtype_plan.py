@@ -0,0 +1,91 @@
+"""
+Benchmark: memory and group-by time of the integrated rows with and without the compact dtypes.
+
+Usage (from etl-project/):
+    python benchmarks/bench_dtype_plan.py [--scale 300] [--repeat 5]
+
+Synthetic surveys (see synthetic.py) are run through the pipeline; the
+integrated rows are tiled to reach about --scale times the real surveys and
+converted with schema.apply_dtype_plan. The deep memory usage of both frames
+is reported, then the time of dashboard-like group-by counts (best of
+--repeat runs, in milliseconds).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+import etl  # noqa: E402
+from schema import apply_dtype_plan, memory_report  # noqa: E402
+from synthetic import synthetic_surveys  # noqa: E402
+
+# Base synthetic size; larger scales tile the integrated rows
+BASE_SCALE = 10
+
+GROUP_BYS = [
+    ['gender'],
+    ['country', 'treatment'],
+    ['survey_year', 'gender', 'benefits'],
+    ['remote_work', 'tech_company', 'leave'],
+]
+
+
+def integrated_rows(scale, seed):
+    """Integrated rows of the synthetic surveys, tiled to about scale times the real surveys"""
+    raw = synthetic_surveys(min(scale, BASE_SCALE), seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        surveys = etl.transform_surveys(etl.clean_survey_2014(raw[2014]), etl.clean_survey_2016(raw[2016]),
+                                        etl.clean_survey_2025(raw[2025]))
+        final_df = etl.clean_final_df(etl.merge_all_surveys(*surveys))
+    copies = max(1, round(scale / BASE_SCALE))
+    return pd.concat([final_df] * copies, ignore_index=True)
+
+
+def best_time(func, repeat):
+    """Best seconds of func()"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=float, default=300, help='Size of the integrated rows (x real surveys)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per group-by (the best one is kept)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    etl.DATA_RAW_PATH = os.path.join(SRC_PATH, '..', 'data', 'raw')
+    df = integrated_rows(args.scale, args.seed)
+    start = time.perf_counter()
+    compact = apply_dtype_plan(df)
+    seconds = time.perf_counter() - start
+    report = memory_report(df, compact)
+    print(f"rows: {len(df):,}, apply_dtype_plan: {seconds:.2f}s")
+    print(f"memory: {report['before_mb']:.1f} MB -> {report['after_mb']:.1f} MB "
+          f"({report['before_mb'] / report['after_mb']:.1f}x smaller)")
+
+    print(f"{'group by':<40} {'object ms':>10} {'compact ms':>11} {'speedup':>8}")
+    for columns in GROUP_BYS:
+        object_seconds = best_time(lambda: df.groupby(columns, dropna=False).size(), args.repeat)
+        compact_seconds = best_time(lambda: compact.groupby(columns, dropna=False, observed=True).size(),
+                                    args.repeat)
+        print(f"{', '.join(columns):<40} {object_seconds * 1000:10.1f} {compact_seconds * 1000:11.1f} "
+              f"{object_seconds / compact_seconds:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: start-up time of the pipeline in a new interpreter.
+
+Usage (from etl-project/):
+    python benchmarks/bench_import.py [--repeat 5]
+
+Each command runs in a fresh process (best of --repeat runs, in
+milliseconds). "import etl, eager sklearn" also imports the sklearn modules
+that etl.py and impute.py used to import at module level, i.e. the start-up
+cost before they were deferred to the stages using them.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+COMMANDS = {
+    'python (empty)': ['-c', 'pass'],
+    'cli --help': [os.path.join(SRC_PATH, 'cli.py'), '--help'],
+    'import etl': ['-c', 'import etl'],
+    'import etl, eager sklearn': ['-c', 'import sklearn.impute, sklearn.preprocessing, etl'],
+}
+
+
+def best_time(arguments, repeat):
+    """Best seconds of a new interpreter running arguments"""
+    env = dict(os.environ, PYTHONPATH=SRC_PATH)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *arguments], env=env, stdout=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Runs of each command (the best one is kept)')
+    args = parser.parse_args()
+
+    seconds = {name: best_time(arguments, args.repeat) for name, arguments in COMMANDS.items()}
+    for name, command_seconds in seconds.items():
+        print(f"{name:<28} {command_seconds * 1000:8.0f} ms")
+    print(f"deferring sklearn saves {(seconds['import etl, eager sklearn'] - seconds['import etl']) * 1000:.0f} ms "
+          f"({seconds['import etl, eager sklearn'] / seconds['import etl']:.1f}x faster import)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: blocked KNN imputation vs exact KNN, time and accuracy.
+
+Usage (from etl-project/):
+    python benchmarks/bench_impute.py [--scale 3] [--block-rows 2000] [--workers 4]
+
+Synthetic surveys (see synthetic.py) are run through the pipeline and joined
+with the OECD features. A share of the observed values of every imputation
+column is hidden, then imputed with impute_knn in one block (exact KNN) and
+in blocks. The error is the RMSE on the hidden values, in units of the
+column standard deviation.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+import etl  # noqa: E402
+from config import KNN_BLOCK_ROWS  # noqa: E402
+from impute import encode_answers, imputation_columns, impute_knn  # noqa: E402
+from synthetic import synthetic_surveys  # noqa: E402
+
+
+def integrated_dataset(scale, seed):
+    """Synthetic surveys cleaned, merged and joined with the OECD features"""
+    raw = synthetic_surveys(scale, seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        surveys = etl.transform_surveys(etl.clean_survey_2014(raw[2014]), etl.clean_survey_2016(raw[2016]),
+                                        etl.clean_survey_2025(raw[2025]))
+        final_df = etl.clean_final_df(etl.merge_all_surveys(*surveys))
+    return etl.join_oecd_features(final_df, etl.transform_oecd(etl.clean_oecd(etl.load_oecd())))
+
+
+def hide_values(df, columns, rate, seed):
+    """Copy of df with a `rate` share of the observed values of columns set to NaN, and the hidden mask"""
+    rng = np.random.default_rng(seed)
+    observed = df[columns].notna().to_numpy()
+    hidden = observed & (rng.random(observed.shape) < rate)
+    masked = df.copy()
+    for i, column in enumerate(columns):
+        masked.loc[hidden[:, i], column] = np.nan
+    return masked, hidden
+
+
+def rmse(result, truth, hidden, columns):
+    """RMSE over the hidden values, each column scaled by its standard deviation"""
+    expected = truth[columns].to_numpy(dtype=float)
+    errors = (result[columns].to_numpy(dtype=float) - expected) / np.nanstd(expected, axis=0)
+    return float(np.sqrt(np.mean(errors[hidden] ** 2)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=float, default=3, help='Size of the synthetic surveys')
+    parser.add_argument('--block-rows', type=int, default=KNN_BLOCK_ROWS, help='Maximum rows per block')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--hide', type=float, default=0.1, help='Share of the observed values to hide')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    etl.DATA_RAW_PATH = os.path.join(SRC_PATH, '..', 'data', 'raw')
+    # The hidden values are taken from the encoded columns, which impute_knn would otherwise rebuild
+    truth = integrated_dataset(args.scale, args.seed)
+    truth = encode_answers(truth).drop(columns=['benefits', 'leave'])
+    columns = imputation_columns(truth)
+    masked, hidden = hide_values(truth, columns, args.hide, args.seed)
+    print(f"rows: {len(truth):,}, columns: {len(columns)}, hidden values: {hidden.sum():,}")
+    print(f"{'method':<22} {'seconds':>8} {'RMSE (sd)':>10}")
+
+    methods = [
+        ('exact KNN', dict(block_rows=len(truth), workers=1)),
+        (f'blocked ({args.block_rows} rows)', dict(block_rows=args.block_rows, workers=args.workers)),
+    ]
+    for name, kwargs in methods:
+        start = time.perf_counter()
+        result = impute_knn(masked, **kwargs)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {elapsed:8.3f} {rmse(result, truth, hidden, columns):10.4f}")
+
+    mean_fill = masked[columns].fillna(masked[columns].mean())
+    print(f"{'column mean':<22} {'':>8} {rmse(mean_fill, truth, hidden, columns):10.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: the eager pandas stages vs the lazy polars plan, from the raw files to the integrated rows.
+
+Usage (from etl-project/):
+    python benchmarks/bench_lazy_engine.py [--scale 100] [--repeat 3]
+
+Synthetic surveys (see synthetic.py) at --scale times the size of the real
+surveys are written as raw files of a temporary directory. The pandas engine
+loads, cleans, transforms, merges and final-cleans them stage by stage; the
+lazy engine collects the same chain as one polars plan (etl.run_lazy_plan).
+Both produce the same integrated CSV text (checked); times are the best of
+--repeat runs.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+import etl  # noqa: E402
+from synthetic import write_synthetic_surveys  # noqa: E402
+
+
+def pandas_engine(form_csv):
+    """Integrated rows of the eager stages"""
+    df_survey, df_2014, df_2016 = etl.load_datasets(etl.CsvFormSource(form_csv))
+    surveys = etl.transform_surveys(etl.clean_survey_2014(df_2014), etl.clean_survey_2016(df_2016),
+                                    etl.clean_survey_2025(df_survey))
+    return etl.clean_final_df(etl.merge_all_surveys(*surveys))
+
+
+def lazy_engine(form_csv):
+    """Integrated rows of the lazy plan"""
+    return etl.run_lazy_plan(etl.fetch_form_responses(etl.CsvFormSource(form_csv)))[0]
+
+
+def best_time(func, repeat):
+    """(best seconds, result) of func()"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=float, default=100, help='Size of the synthetic surveys (x real surveys)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per engine (the best one is kept)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    with tempfile.TemporaryDirectory() as tmp:
+        form_csv = write_synthetic_surveys(tmp, args.scale, args.seed)
+        etl.DATA_RAW_PATH = tmp
+        sizes = {name: os.path.getsize(os.path.join(tmp, name)) / 1e6 for name in sorted(os.listdir(tmp))}
+        print(f"raw files: {', '.join(f'{name} {size:.0f} MB' for name, size in sizes.items())}")
+
+        pandas_seconds, expected = best_time(lambda: pandas_engine(form_csv), args.repeat)
+        lazy_seconds, final_df = best_time(lambda: lazy_engine(form_csv), args.repeat)
+        assert final_df.to_csv(index=False) == expected.to_csv(index=False), 'the engines disagree'
+
+    print(f"integrated rows: {len(final_df):,} x {len(final_df.columns)} columns")
+    print(f"{'engine':<8} {'seconds':>8} {'speedup':>8}")
+    print(f"{'pandas':<8} {pandas_seconds:8.2f} {1:7.1f}x")
+    print(f"{'polars':<8} {lazy_seconds:8.2f} {pandas_seconds / lazy_seconds:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: time and peak memory of merge_all_surveys vs the previous
+column-by-column NaN expansion.
+
+Usage (from etl-project/):
+    python benchmarks/bench_merge.py [--rows 200000] [--extra-columns 60]
+
+Three synthetic surveys share 26 answer columns; the 2016-like one has
+`extra-columns` more (the real 2016 survey has about 60 the others lack).
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+from etl import merge_all_surveys  # noqa: E402
+
+ANSWERS = np.array(['Yes', 'No', "Don't know", 'Maybe', 'Some of them', 'Not sure'], dtype=object)
+
+
+# Previous implementation, kept for comparison
+def legacy_merge_all_surveys(df_2014, df_2016, df_2025):
+    df_2014['survey_year'] = 2014
+    df_2016['survey_year'] = 2016
+    df_2025['survey_year'] = 2025
+    all_columns = set(df_2014.columns) | set(df_2016.columns) | set(df_2025.columns)
+
+    def expand_df(df, all_cols):
+        missing_cols = [col for col in all_cols if col not in df.columns]
+        for col in missing_cols:
+            df[col] = np.nan
+        return df
+
+    return pd.concat([expand_df(df_2014, all_columns), expand_df(df_2016, all_columns),
+                      expand_df(df_2025, all_columns)], axis=0, ignore_index=True)
+
+
+def synthetic_survey(rng, rows, columns):
+    data = {'age': rng.integers(18, 70, rows).astype(float)}
+    data.update({column: rng.choice(ANSWERS, rows) for column in columns})
+    return pd.DataFrame(data)
+
+
+def measure(func, surveys):
+    # Fresh copies: the legacy merge mutates its inputs
+    surveys = [df.copy() for df in surveys]
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always', pd.errors.PerformanceWarning)
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = func(*surveys)
+        elapsed = time.perf_counter() - start
+        # Still allocated after the call: the result plus any growth of the inputs
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    performance_warnings = sum(issubclass(w.category, pd.errors.PerformanceWarning) for w in caught)
+    return result, elapsed, peak, retained, performance_warnings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000, help='Rows per synthetic survey')
+    parser.add_argument('--extra-columns', type=int, default=60, help='Columns only the 2016-like survey has')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    shared = [f'answer_{i}' for i in range(26)]
+    surveys = [
+        synthetic_survey(rng, args.rows, shared + ['comments']),
+        synthetic_survey(rng, args.rows, shared + [f'q2016_{i}' for i in range(args.extra_columns)]),
+        synthetic_survey(rng, args.rows, shared + ['comments']),
+    ]
+    print(f"3 surveys x {args.rows:,} rows, {args.extra_columns} columns only in 2016")
+    print(f"{'implementation':<18} {'time s':>8} {'peak MB':>9} {'retained MB':>12} {'PerformanceWarnings':>20}")
+
+    results = {}
+    for name, func in [('legacy', legacy_merge_all_surveys), ('merge_all_surveys', merge_all_surveys)]:
+        results[name], elapsed, peak, retained, performance_warnings = measure(func, surveys)
+        print(f"{name:<18} {elapsed:8.3f} {peak / 1e6:9.1f} {retained / 1e6:12.1f} {performance_warnings:>20}")
+
+    legacy, current = results['legacy'], results['merge_all_surveys']
+    pd.testing.assert_frame_equal(legacy[current.columns], current)
+    print("outputs identical (up to column order)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: per-row .apply gender/age cleaning vs the shared normalize module.
+
+Usage (from etl-project/):
+    python benchmarks/bench_normalize.py [--scale 100]
+
+The raw 2014 and 2016 surveys are tiled `scale` times, then both
+implementations are run on the same data and checked for identical output.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+from normalize import SURVEY_GENDER_RULES, TRANSFORM_GENDER_RULES, normalize_gender, clean_age  # noqa: E402
+
+DATA_RAW_PATH = os.path.join(SRC_PATH, '..', 'data', 'raw')
+
+
+# Previous implementation (per-row Python calls), kept for comparison
+def legacy_survey_gender(gender):
+    gender = str(gender).strip().lower()
+    male_keywords = ['trans male', 'trans man', 'male', 'm', 'cis male', 'man', 'male (cis)', 'malr', 'cis man', 'make', 'mail']
+    female_keywords = ['trans woman', 'female (trans)', 'cis female', 'trans-female', 'female', 'f', 'woman', 'female (cis)', 'cis woman']
+    if any(keyword in gender for keyword in male_keywords):
+        return 'male'
+    elif any(keyword in gender for keyword in female_keywords):
+        return 'female'
+    return 'other'
+
+
+def legacy_transform_gender(gender):
+    if pd.isna(gender):
+        return 'Other'
+    gender = str(gender).strip().lower()
+    if any(x in gender for x in ['female', 'f', 'woman', 'fem', 'cis female', 'mtf', 'm2f']):
+        return 'Female'
+    elif any(x in gender for x in ['male', 'm', 'man', 'cis male', 'ftm', 'f2m']):
+        return 'Male'
+    return 'Other'
+
+
+def legacy_age(age):
+    age = pd.to_numeric(age, errors='coerce')
+    age = age.apply(lambda x: x if 18 <= x <= 100 else np.nan)
+    return age.fillna(age.median())
+
+
+def legacy(gender_2014, gender_2016, age_2014, age_2016):
+    g14 = gender_2014.apply(legacy_survey_gender).apply(legacy_transform_gender)
+    g16 = gender_2016.apply(legacy_transform_gender)
+    return g14, g16, legacy_age(age_2014), legacy_age(age_2016)
+
+
+def vectorized(gender_2014, gender_2016, age_2014, age_2016):
+    g14 = normalize_gender(gender_2014, SURVEY_GENDER_RULES, default='other')
+    g14 = normalize_gender(g14, TRANSFORM_GENDER_RULES, default='Other', na_label='Other')
+    g16 = normalize_gender(gender_2016, TRANSFORM_GENDER_RULES, default='Other', na_label='Other')
+    return g14, g16, clean_age(age_2014), clean_age(age_2016)
+
+
+def timed(func, *args, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=int, default=100, help='How many times to tile the raw surveys')
+    args = parser.parse_args()
+
+    df_2014 = pd.read_csv(os.path.join(DATA_RAW_PATH, 'survey_2014.csv'), usecols=['Age', 'Gender'])
+    df_2016 = pd.read_csv(os.path.join(DATA_RAW_PATH, 'survey_2016.csv'),
+                          usecols=['What is your age?', 'What is your gender?'])
+    inputs = (
+        pd.concat([df_2014['Gender']] * args.scale, ignore_index=True),
+        pd.concat([df_2016['What is your gender?']] * args.scale, ignore_index=True),
+        pd.concat([df_2014['Age']] * args.scale, ignore_index=True),
+        pd.concat([df_2016['What is your age?']] * args.scale, ignore_index=True),
+    )
+    rows = len(inputs[0]) + len(inputs[1])
+
+    legacy_time, expected = timed(legacy, *inputs)
+    vectorized_time, result = timed(vectorized, *inputs)
+    for exp, res in zip(expected, result):
+        pd.testing.assert_series_equal(exp, res, check_dtype=False, check_names=False)
+
+    print(f"rows: {rows:,} (scale x{args.scale})")
+    print(f"legacy .apply : {legacy_time:8.3f} s")
+    print(f"vectorized    : {vectorized_time:8.3f} s")
+    print(f"speedup       : {legacy_time / vectorized_time:8.1f}x (outputs identical)")
+
+
+if __name__ == '__main__':
+    main()
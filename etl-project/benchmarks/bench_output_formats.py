@@ -0,0 +1,58 @@
+"""
+Benchmark: file size and load time of the save_outputs backends.
+
+Usage (from etl-project/):
+    python benchmarks/bench_output_formats.py [--scale 100]
+
+The committed integrated dataset is tiled `scale` times, written with every
+backend in writers.OUTPUT_FORMATS and read back the way downstream code does.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+from writers import OUTPUT_FORMATS, write_output  # noqa: E402
+
+INTEGRATED_CSV = os.path.join(SRC_PATH, '..', 'data', 'outputs', 'final_integrated.csv')
+
+READERS = {
+    'csv': lambda path: pd.read_csv(path, low_memory=False),
+    'parquet': pd.read_parquet,
+    'feather': pd.read_feather,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=int, default=100, help='How many times to tile the integrated dataset')
+    args = parser.parse_args()
+
+    df = pd.read_csv(INTEGRATED_CSV, low_memory=False, parse_dates=['timestamp'])
+    df = pd.concat([df] * args.scale, ignore_index=True)
+    print(f"rows: {len(df):,} (scale x{args.scale})")
+    print(f"{'format':<8} {'write s':>8} {'read s':>8} {'size MB':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for output_format in OUTPUT_FORMATS:
+            start = time.perf_counter()
+            path = write_output(df, os.path.join(tmp, 'integrated'), output_format)
+            write_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            READERS[output_format](path)
+            read_time = time.perf_counter() - start
+
+            size = os.path.getsize(path) / 1e6
+            print(f"{output_format:<8} {write_time:8.3f} {read_time:8.3f} {size:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
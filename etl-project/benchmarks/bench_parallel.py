@@ -0,0 +1,70 @@
+"""
+Benchmark: serial vs process-pool cleaning/transformation of the surveys.
+
+Usage (from etl-project/):
+    python benchmarks/bench_parallel.py [--scale 50] [--workers 4] [--partition-rows 20000]
+
+The raw surveys (and the local 2025 form fixture) are tiled `scale` times
+into a temporary raw directory; each mode loads, cleans and transforms them.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import pandas as pd
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+import etl  # noqa: E402
+
+DATA_RAW_PATH = os.path.join(SRC_PATH, '..', 'data', 'raw')
+FORM_CSV = os.path.join(SRC_PATH, 'test', 'fixtures', 'survey_2025_form.csv')
+
+
+def serial(df_survey):
+    df_2014 = etl.clean_survey_2014(pd.read_csv(os.path.join(etl.DATA_RAW_PATH, 'survey_2014.csv')))
+    df_2016 = etl.clean_survey_2016(pd.read_csv(os.path.join(etl.DATA_RAW_PATH, 'survey_2016.csv')))
+    df_2025 = etl.clean_survey_2025(df_survey)
+    return etl.transform_surveys(df_2014, df_2016, df_2025)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=int, default=50, help='How many times to tile the raw surveys')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes')
+    parser.add_argument('--partition-rows', type=int, default=20000, help='Rows per partition task')
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    with tempfile.TemporaryDirectory() as raw_path:
+        for name in ('survey_2014.csv', 'survey_2016.csv'):
+            df = pd.read_csv(os.path.join(DATA_RAW_PATH, name))
+            pd.concat([df] * args.scale, ignore_index=True).to_csv(os.path.join(raw_path, name), index=False)
+        form = pd.read_csv(FORM_CSV)
+        df_survey = pd.concat([form] * args.scale * 50, ignore_index=True)
+        etl.DATA_RAW_PATH = raw_path
+
+        serial_time, expected = timed(serial, df_survey.copy())
+        print(f"scale x{args.scale}, {args.workers} workers")
+        print(f"{'serial':<36}: {serial_time:7.2f} s")
+        for partition_rows in (None, args.partition_rows):
+            parallel_time, result = timed(etl.process_surveys_parallel, df_survey, args.workers, partition_rows)
+            for survey, reference in zip(result, expected):
+                pd.testing.assert_frame_equal(survey, reference)
+            label = 'one task per survey' if partition_rows is None else f'partitions of {partition_rows} rows'
+            print(f"{'parallel, ' + label:<36}: {parallel_time:7.2f} s ({serial_time / parallel_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: parse time and peak memory of the 2016 survey with column pruning.
+
+Usage (from etl-project/):
+    python benchmarks/bench_pruning.py [--scale 20]
+
+The raw 2016 survey (63 columns, most of them dropped by clean_final_df) is
+tiled `scale` times into a temporary CSV and read in full and with the
+usecols computed by etl.surviving_columns.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import pandas as pd
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+import etl  # noqa: E402
+
+RAW_PATH = os.path.join(SRC_PATH, '..', 'data', 'raw')
+FORM_CSV = os.path.join(SRC_PATH, 'test', 'fixtures', 'survey_2025_form.csv')
+
+
+def measure(read):
+    """(seconds, peak traced MB, frame MB) of one read"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = read()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6, df.memory_usage(deep=True).sum() / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=int, default=20, help='How many times to tile the 2016 survey')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    etl.DATA_RAW_PATH = RAW_PATH
+    usecols = etl.surviving_columns(etl.raw_survey_headers(pd.read_csv(FORM_CSV, nrows=0).columns))[2016]
+
+    df = pd.read_csv(os.path.join(RAW_PATH, 'survey_2016.csv'))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'survey_2016.csv')
+        pd.concat([df] * args.scale, ignore_index=True).to_csv(path, index=False)
+        print(f"rows: {len(df) * args.scale:,} (scale x{args.scale}), columns: {len(df.columns)} -> {len(usecols)}")
+        print(f"{'read':<8} {'parse s':>8} {'peak MB':>8} {'frame MB':>9}")
+        for name, kwargs in [('full', {}), ('pruned', {'usecols': usecols})]:
+            elapsed, peak, size = measure(lambda: pd.read_csv(path, **kwargs))
+            print(f"{name:<8} {elapsed:8.3f} {peak:8.1f} {size:9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: ingest and merge time against the number of yearly survey files.
+
+Usage (from etl-project/):
+    python benchmarks/bench_registry.py [--years 1 3 7] [--scale 5] [--workers 2]
+
+The raw directory holds the synthetic 2014 and 2016 surveys plus `years`
+later OSMI surveys (survey_2017.csv, ..., with the 2016 schema, read by
+surveys.OSMI_ADAPTER). Each run discovers, cleans and transforms every file
+(etl.ingest_surveys) and merges them in one union-schema step
+(etl.merge_surveys); the time per row stays flat as files are added.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+import pandas as pd  # noqa: E402
+
+from etl import ingest_surveys, merge_surveys  # noqa: E402
+from synthetic import synthetic_survey, write_synthetic_surveys  # noqa: E402
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--years', type=int, nargs='+', default=[1, 3, 7], help='Numbers of later OSMI surveys')
+    parser.add_argument('--scale', type=float, default=5, help='Multiple of the real row counts of each survey')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs of each size (the best one is kept)')
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    print(f"{'files':>6} {'rows':>10} {'columns':>8} {'time s':>8} {'us/row':>8}")
+    with tempfile.TemporaryDirectory() as raw_path:
+        df_survey = pd.read_csv(write_synthetic_surveys(raw_path, args.scale))
+        written = 0
+        for years in sorted(args.years):
+            for survey_year in range(2017 + written, 2017 + years):
+                df = synthetic_survey(2016, args.scale, seed=survey_year)
+                df.to_csv(os.path.join(raw_path, f'survey_{survey_year}.csv'), index=False)
+            written = max(written, years)
+
+            seconds, merged = best_time(
+                lambda: merge_surveys(ingest_surveys(df_survey, args.workers, raw_path)), args.repeat)
+            print(f"{years + 3:>6} {len(merged):>10,} {merged.shape[1]:>8} {seconds:8.2f} "
+                  f"{seconds / len(merged) * 1e6:8.1f}")
+
+
+if __name__ == '__main__':
+    main()
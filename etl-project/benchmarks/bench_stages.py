@@ -0,0 +1,173 @@
+"""
+Benchmark: time and peak memory of every etl.py stage, with regression checks.
+
+Usage (from etl-project/):
+    python benchmarks/bench_stages.py --save-baseline      # on the reference commit
+    python benchmarks/bench_stages.py                      # fails on regressions
+    python benchmarks/bench_stages.py --scales 1 10 --output results.json
+
+Each stage (the three cleaners, transform_surveys, merge_all_surveys,
+clean_final_df, build_cube, join_oecd_features and save_outputs) runs on seeded synthetic
+surveys (see synthetic.py) at 1x, 10x and 100x the size of the real surveys;
+nothing is downloaded. The time is the best of --repeat runs, the peak memory
+is measured with tracemalloc in a separate run. Results are compared with the baseline JSON: a stage that is more than
+--time-threshold slower or --memory-threshold larger is reported and the
+script exits with status 1.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+import etl  # noqa: E402
+from synthetic import synthetic_surveys  # noqa: E402
+
+BASELINE_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stage_baseline.json')
+
+# Differences below these are treated as noise, whatever the ratio
+MIN_SECONDS = 0.01
+MIN_PEAK_MB = 1.0
+
+
+def pipeline_stages(raw, output_dir):
+    """
+    (stage name, function, argument factory) of each stage, in pipeline order.
+
+    The argument factories are called outside the measurement and return
+    fresh copies, since several stages modify their input in place. Each
+    factory reads the outputs of the previous stages from `results`.
+    """
+    results = {}
+    oecd_features = etl.transform_oecd(etl.clean_oecd(etl.load_oecd()))
+
+    def copies(*names):
+        return lambda: tuple(results[name].copy() for name in names)
+
+    def save(final_df, df_2025, df_2014, df_2016):
+        etl.save_outputs(final_df, df_2025, df_2014, df_2016, output_dir=output_dir, prefix='bench_')
+
+    stages = [
+        ('clean_survey_2014', etl.clean_survey_2014, lambda: (raw[2014].copy(),), 'clean_2014'),
+        ('clean_survey_2016', etl.clean_survey_2016, lambda: (raw[2016].copy(),), 'clean_2016'),
+        ('clean_survey_2025', etl.clean_survey_2025, lambda: (raw[2025].copy(),), 'clean_2025'),
+        ('transform_surveys', etl.transform_surveys, copies('clean_2014', 'clean_2016', 'clean_2025'), 'transformed'),
+        ('merge_all_surveys', etl.merge_all_surveys, lambda: results['transformed'], 'merged'),
+        ('clean_final_df', etl.clean_final_df, copies('merged'), 'final'),
+        ('build_cube', etl.build_cube, lambda: (results['final'],), None),
+        ('join_oecd_features', etl.join_oecd_features, lambda: (results['final'], oecd_features),
+         None),
+        ('save_outputs', save, lambda: (results['final'], results['transformed'][2], *results['transformed'][:2]),
+         None),
+    ]
+    return stages, results
+
+
+def measure(func, make_args, repeat):
+    """(best seconds, peak MB, result) of func(*make_args())"""
+    best = float('inf')
+    for _ in range(repeat):
+        args = make_args()
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+
+    args = make_args()
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1e6, result
+
+
+def run_benchmarks(scales, repeat, seed):
+    """stage[scale x] -> {'rows', 'seconds', 'peak_mb'}"""
+    measurements = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        etl.DATA_PROCESSED_PATH = etl.OUTPUTS_PATH = tmp
+        etl.DATA_RAW_PATH = os.path.join(SRC_PATH, '..', 'data', 'raw')
+        for scale in scales:
+            raw = synthetic_surveys(scale, seed)
+            rows = sum(len(df) for df in raw.values())
+            stages, results = pipeline_stages(raw, tmp)
+            for name, func, make_args, result_name in stages:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    seconds, peak_mb, result = measure(func, make_args, repeat)
+                if result_name:
+                    results[result_name] = result
+                key = f'{name}[{scale}x]'
+                measurements[key] = {'rows': rows, 'seconds': round(seconds, 5), 'peak_mb': round(peak_mb, 3)}
+                print(f"{key:<24} {rows:>9,} {seconds:9.4f} {peak_mb:9.1f}")
+    return measurements
+
+
+def regressions(measurements, baseline, time_threshold, memory_threshold):
+    """Descriptions of the measurements that exceed their baseline by more than the thresholds"""
+    found = []
+    for key, current in measurements.items():
+        if key not in baseline:
+            continue
+        reference = baseline[key]
+        checks = [
+            ('time', 'seconds', time_threshold, MIN_SECONDS, 's'),
+            ('peak memory', 'peak_mb', memory_threshold, MIN_PEAK_MB, ' MB'),
+        ]
+        for label, field, threshold, noise, unit in checks:
+            before, after = reference[field], current[field]
+            if after - before > noise and after > before * (1 + threshold):
+                found.append(f"{key}: {label} {before:.3f}{unit} -> {after:.3f}{unit} (+{after / before - 1:.0%})")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10, 100], help='Survey size multiples')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage (the best one is kept)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic surveys')
+    parser.add_argument('--baseline', default=BASELINE_JSON, help='Baseline measurements JSON')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the measurements as the baseline')
+    parser.add_argument('--time-threshold', type=float, default=0.3, help='Allowed relative slowdown')
+    parser.add_argument('--memory-threshold', type=float, default=0.2, help='Allowed relative peak memory growth')
+    parser.add_argument('--output', help='Also write the measurements to this JSON file')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    scales = [int(scale) if scale == int(scale) else scale for scale in args.scales]
+    print(f"{'stage':<24} {'rows':>9} {'seconds':>9} {'peak MB':>9}")
+    measurements = run_benchmarks(scales, args.repeat, args.seed)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(measurements, f, indent=4)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(measurements, f, indent=4)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --save-baseline first")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    found = regressions(measurements, baseline, args.time_threshold, args.memory_threshold)
+    for regression in found:
+        print(f"REGRESSION {regression}")
+    if not found:
+        print("No regression against the baseline")
+    return 1 if found else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Benchmark: overhead of the data quality validation on the integrated rows.
+
+Usage (from etl-project/):
+    python benchmarks/bench_validation.py [--scale 30] [--repeat 5]
+
+Synthetic surveys (see synthetic.py) of --scale times the real surveys are
+cleaned, transformed and merged; the time of those stages is compared with
+validation.validate_data on the integrated rows (one scan per ruled column),
+and with the same rules checked one by one (a null-rate, range or
+allowed-answer scan of the column per rule, the answers mapped row by row).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+import etl  # noqa: E402
+from synthetic import synthetic_surveys  # noqa: E402
+from validation import COLUMN_RULES, answer_label, validate_data  # noqa: E402
+
+
+def integrate(raw):
+    """Integrated rows of the raw surveys"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        surveys = etl.transform_surveys(etl.clean_survey_2014(raw[2014]), etl.clean_survey_2016(raw[2016]),
+                                        etl.clean_survey_2025(raw[2025]))
+        return etl.clean_final_df(etl.merge_all_surveys(*surveys))
+
+
+def validate_per_rule(df):
+    """The rules of COLUMN_RULES, each one a separate scan of its column"""
+    results = {}
+    for column, rules in COLUMN_RULES.items():
+        series = df[column]
+        for rule, expected in rules.items():
+            if rule == 'max_null_rate':
+                results[rule, column] = series.isna().mean() <= expected
+            elif rule == 'range':
+                numbers = pd.to_numeric(series, errors='coerce')
+                results[rule, column] = not (series.notna() & ~numbers.between(*expected)).any()
+            else:
+                labels = series.dropna().map(lambda value: answer_label(value, column))
+                results[rule, column] = labels.isin(expected).all()
+    return results
+
+
+def best_time(func, repeat):
+    """Best seconds of func()"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=float, default=30, help='Size of the surveys (x real surveys)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs of each validation (the best one is kept)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    etl.DATA_RAW_PATH = os.path.join(SRC_PATH, '..', 'data', 'raw')
+    raw = synthetic_surveys(args.scale, args.seed)
+    start = time.perf_counter()
+    df = integrate(raw)
+    pipeline_seconds = time.perf_counter() - start
+
+    results = validate_data(df)
+    single_seconds = best_time(lambda: validate_data(df), args.repeat)
+    per_rule_seconds = best_time(lambda: validate_per_rule(df), args.repeat)
+    print(f"rows: {len(df):,}, rules: {len(results['rules'])} ({sum(not rule['passed'] for rule in results['rules'])} "
+          f"failed on the synthetic data)")
+    print(f"clean -> transform -> merge -> final clean: {pipeline_seconds:.2f}s")
+    print(f"validate_data (one pass):  {single_seconds * 1000:8.1f} ms "
+          f"({single_seconds / pipeline_seconds:.1%} of the pipeline)")
+    print(f"rules checked one by one:  {per_rule_seconds * 1000:8.1f} ms "
+          f"({per_rule_seconds / pipeline_seconds:.1%} of the pipeline, "
+          f"{per_rule_seconds / single_seconds:.1f}x slower)")
+
+
+if __name__ == '__main__':
+    main()
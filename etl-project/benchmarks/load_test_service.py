@@ -0,0 +1,131 @@
+"""
+Load test: latency and throughput of the query service on localhost.
+
+Usage (from etl-project/):
+    python benchmarks/load_test_service.py [--scale 100] [--requests 2000] [--concurrency 8]
+    python benchmarks/load_test_service.py --url http://127.0.0.1:8050   # a running service
+
+Without --url, synthetic surveys (see synthetic.py) are run through the
+pipeline at --scale times the size of the real surveys, written as the
+integrated output of a temporary directory and served by an in-process
+service on a free port. Requests are dashboard filter combinations (gender,
+country, age limit, chart group-by) drawn from a pool of --distinct queries:
+the cold pass sends each of them once (cache misses), the warm pass sends
+--requests of them from --concurrency threads (mostly cache hits).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import numpy as np
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+import etl  # noqa: E402
+from service import QueryService, make_server  # noqa: E402
+from synthetic import synthetic_surveys  # noqa: E402
+
+GROUP_BYS = ['gender', 'country', 'treatment', 'family_history,treatment', 'remote_work,treatment', 'benefits',
+             'leave', 'coworkers', 'mental_vs_physical']
+GENDERS = [None, 'Male', 'Female', 'Other']
+COUNTRIES = [None, 'USA', 'UK', 'Canada', 'Germany', 'Netherlands', 'India']
+
+
+def write_integrated(scale, seed, output_dir):
+    """Write the integrated output of synthetic surveys to output_dir and return its row count"""
+    raw = synthetic_surveys(scale, seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        surveys = etl.transform_surveys(etl.clean_survey_2014(raw[2014]), etl.clean_survey_2016(raw[2016]),
+                                        etl.clean_survey_2025(raw[2025]))
+        final_df = etl.clean_final_df(etl.merge_all_surveys(*surveys))
+    final_df.to_csv(os.path.join(output_dir, 'final_integrated.csv'), index=False)
+    return len(final_df)
+
+
+def query_pool(distinct, seed):
+    """distinct query strings of dashboard filter combinations"""
+    rng = np.random.default_rng(seed)
+    pool = set()
+    while len(pool) < distinct:
+        params = {'group_by': GROUP_BYS[rng.integers(len(GROUP_BYS))], 'max_age': int(rng.integers(20, 80))}
+        gender, country = GENDERS[rng.integers(len(GENDERS))], COUNTRIES[rng.integers(len(COUNTRIES))]
+        if gender:
+            params['gender'] = gender
+        if country:
+            params['country'] = country
+        pool.add(urlencode(params))
+    return sorted(pool)
+
+
+def fetch(url):
+    """Seconds taken by one GET of url"""
+    start = time.perf_counter()
+    with urllib.request.urlopen(url) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def run_pass(base_url, queries, concurrency):
+    """(latencies in seconds, wall seconds) of GET /query for each query"""
+    urls = [f'{base_url}/query?{query}' for query in queries]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(fetch, urls))
+    return np.array(latencies), time.perf_counter() - start
+
+
+def report(name, latencies, seconds):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    print(f"{name:<6} {len(latencies):>8,} {p50:9.2f} {p95:9.2f} {p99:9.2f} {len(latencies) / seconds:11,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help='Base URL of a running service (default: start one in-process)')
+    parser.add_argument('--scale', type=float, default=100, help='Size of the synthetic surveys')
+    parser.add_argument('--requests', type=int, default=2000, help='Requests of the warm pass')
+    parser.add_argument('--distinct', type=int, default=200, help='Distinct queries')
+    parser.add_argument('--concurrency', type=int, default=8, help='Client threads')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    with tempfile.TemporaryDirectory() as tmp, contextlib.ExitStack() as stack:
+        base_url = args.url
+        if base_url is None:
+            etl.DATA_RAW_PATH = os.path.join(SRC_PATH, '..', 'data', 'raw')
+            rows = write_integrated(args.scale, args.seed, tmp)
+            start = time.perf_counter()
+            service = QueryService(tmp)
+            print(f"rows: {rows:,}, store loaded in {time.perf_counter() - start:.2f}s")
+            server = make_server(service, port=0)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            stack.callback(server.server_close)
+            stack.callback(server.shutdown)
+            base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+        queries = query_pool(args.distinct, args.seed)
+        rng = np.random.default_rng(args.seed)
+        warm = [queries[i] for i in rng.integers(len(queries), size=args.requests)]
+
+        print(f"{'pass':<6} {'requests':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'requests/s':>11}")
+        report('cold', *run_pass(base_url, queries, 1))
+        report('warm', *run_pass(base_url, warm, args.concurrency))
+        with urllib.request.urlopen(f'{base_url}/stats') as response:
+            print(f"service stats: {json.load(response)}")
+
+
+if __name__ == '__main__':
+    main()
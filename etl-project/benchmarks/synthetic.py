@@ -0,0 +1,121 @@
+"""
+Seeded synthetic raw surveys for the benchmarks.
+
+Each generator keeps the raw header of its survey (data/raw for 2014/2016,
+the local form fixture for 2025, so nothing is downloaded) and draws every
+column from the distribution of the real answers, missing values included.
+The columns the cleaning steps work hardest on get extra messy values:
+free-text genders, out-of-range or non-numeric ages, country spellings and,
+for the form, day-first timestamps with some unparseable entries.
+
+    >>> surveys = synthetic_surveys(scale=10, seed=0)
+    >>> df_survey, df_2014, df_2016 = surveys[2025], surveys[2014], surveys[2016]
+"""
+
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+DATA_RAW_PATH = os.path.join(SRC_PATH, '..', 'data', 'raw')
+FORM_CSV = os.path.join(SRC_PATH, 'test', 'fixtures', 'survey_2025_form.csv')
+
+# Rows of each survey at scale 1 (the 2025 form keeps growing, so it gets a
+# realistic size rather than the size of the fixture)
+BASE_ROWS = {2014: 1259, 2016: 1433, 2025: 1000}
+
+# Raw (age, gender, country) column names of each survey
+MESSY_COLUMNS = {
+    2014: ('Age', 'Gender', 'Country'),
+    2016: ('What is your age?', 'What is your gender?', 'What country do you live in?'),
+    2025: ('Age', 'Gender', 'Country'),
+}
+FORM_TIMESTAMP_COLUMN = 'Horodateur'
+
+GENDERS = ['Male', 'male', 'M', 'm', 'Man', 'Cis Male', 'Male (CIS)', 'Malr', 'Mail', 'Female', 'female', 'F',
+           'f', 'Woman', 'Cis Female', 'Female (trans)', 'Trans woman', 'MtF', 'Non-binary', 'Genderqueer',
+           'Agender', 'fluid', 'Androgyne', 'Nah', 'A little about you', 'p', ' Male ', 'FEMALE', None]
+AGES = [-1, 0, 5, 11, 17, 18, 150, 329, 99999999999, 'abc', '', None]
+COUNTRIES = ['United States of America', 'United States', 'USA', 'United Kingdom', 'UK', 'Canada', 'Germany',
+             'Netherlands', 'France', 'Tunisia', 'India', 'Australia', 'Ireland', 'Brazil', 'Other', None]
+
+# Share of rows replaced by a messy value in the columns above
+MESSY_RATE = 0.1
+
+
+def raw_survey(survey_year):
+    """Real raw answers the generator samples from"""
+    if survey_year == 2025:
+        return pd.read_csv(FORM_CSV)
+    return pd.read_csv(os.path.join(DATA_RAW_PATH, f'survey_{survey_year}.csv'))
+
+
+def sample_column(values, rows, rng):
+    """Draw rows values with the empirical distribution of values (missing values included)"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    frequencies = np.bincount(codes) / len(codes)
+    return np.asarray(uniques, dtype=object)[rng.choice(len(uniques), size=rows, p=frequencies)]
+
+
+def messy(column, pool, rng):
+    """Replace a MESSY_RATE share of column with values drawn from pool"""
+    mask = rng.random(len(column)) < MESSY_RATE
+    column[mask] = np.asarray(pool, dtype=object)[rng.integers(len(pool), size=mask.sum())]
+    return column
+
+
+def form_timestamps(rows, rng):
+    """Day-first form timestamps, about 1% of them unparseable"""
+    start = pd.Timestamp('2025-05-01').value // 10**9
+    seconds = np.sort(rng.integers(start, start + 90 * 24 * 3600, size=rows))
+    stamps = pd.to_datetime(seconds, unit='s').strftime('%d/%m/%Y %H:%M:%S').to_numpy(dtype=object)
+    stamps[rng.random(rows) < 0.01] = 'not a date'
+    return stamps
+
+
+def synthetic_survey(survey_year, scale=1, seed=0):
+    """
+    Synthetic raw survey with the schema of survey_year.
+
+    Args:
+        survey_year (int): 2014, 2016 or 2025.
+        scale (float): Multiple of BASE_ROWS[survey_year] rows to generate.
+        seed (int): Random seed; the same (survey_year, scale, seed) always
+            gives the same frame.
+
+    Returns:
+        pd.DataFrame: Raw survey, as read by pd.read_csv.
+    """
+    rng = np.random.default_rng([seed, survey_year])
+    real = raw_survey(survey_year)
+    rows = max(int(BASE_ROWS[survey_year] * scale), 1)
+
+    columns = {column: sample_column(real[column], rows, rng) for column in real.columns}
+    age, gender, country = MESSY_COLUMNS[survey_year]
+    columns[age] = messy(columns[age], AGES, rng)
+    columns[gender] = messy(columns[gender], GENDERS, rng)
+    columns[country] = messy(columns[country], COUNTRIES, rng)
+    if survey_year == 2025:
+        columns[FORM_TIMESTAMP_COLUMN] = form_timestamps(rows, rng)
+
+    # Round-trip through CSV text so the dtypes are the ones the loaders produce
+    return pd.read_csv(io.StringIO(pd.DataFrame(columns).to_csv(index=False)), low_memory=False)
+
+
+def synthetic_surveys(scale=1, seed=0):
+    """survey_year -> synthetic raw survey, for the three surveys"""
+    return {survey_year: synthetic_survey(survey_year, scale, seed) for survey_year in BASE_ROWS}
+
+
+def write_synthetic_surveys(directory, scale=1, seed=0):
+    """
+    Write the synthetic surveys as raw files of directory (survey_2014.csv,
+    survey_2016.csv and the form export survey_2025_form.csv), for the
+    pipeline stages that read files rather than frames. Returns the form path.
+    """
+    for survey_year, df in synthetic_surveys(scale, seed).items():
+        name = 'survey_2025_form.csv' if survey_year == 2025 else f'survey_{survey_year}.csv'
+        df.to_csv(os.path.join(directory, name), index=False)
+    return os.path.join(directory, 'survey_2025_form.csv')
@@ -0,0 +1,11 @@
+"""python -m src (from etl-project/): run the pipeline from the command line (see cli.py)"""
+
+import os
+import sys
+
+# Modules in src/ import each other by plain name
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main  # noqa: E402
+
+main(prog='python -m src')
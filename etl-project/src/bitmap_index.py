@@ -0,0 +1,178 @@
+"""
+Bitmap index over the categorical answer columns of the integrated dataset.
+
+Every (column, value) pair of the low-cardinality columns gets a bitmap
+with one bit per row, packed into 64-bit words. A conjunction such as
+country == 'UK' & gender == 'Female' & survey_year == 2016 is the AND of
+a few bitmaps (the OR of several accepted values of one column), and its
+count is a popcount, so a query touches rows / 64 words per bitmap instead
+of comparing every row. The index is saved zlib-compressed (.npz): the
+bitmaps of rare answers are mostly zero words.
+
+Values are matched by their text, as in the CSV output (survey_year 2016 or
+'2016', tech_company '1.0'); None selects the missing values.
+
+An index saved with the content hash of the dataset file it was built from
+refuses to load against a changed file (see BitmapIndex.load): its bits
+would select the wrong rows.
+"""
+
+import json
+
+import numpy as np
+
+from cache import file_digest
+from config import BITMAP_MAX_VALUES
+from cube import column_codes, text_label
+
+# Columns never indexed (continuous or free text)
+UNINDEXED_COLUMNS = ['timestamp', 'age', 'mh_impact_score', 'comments']
+
+if hasattr(np, 'bitwise_count'):
+    def popcount(words):
+        """Number of set bits of a word array"""
+        return int(np.bitwise_count(words).sum())
+else:  # numpy < 2.0
+    BYTE_BITS = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+    def popcount(words):
+        """Number of set bits of a word array"""
+        return int(BYTE_BITS[words.view(np.uint8)].sum())
+
+
+def pack_rows(mask):
+    """Bitmap words of a boolean row mask"""
+    bits = np.packbits(mask, bitorder='little')
+    padded = np.zeros(-(-len(bits) // 8) * 8, dtype=np.uint8)
+    padded[:len(bits)] = bits
+    return padded.view(np.uint64)
+
+
+def label_key(value):
+    """Lookup key of a filter value (its text, None for missing values)"""
+    return None if value is None else str(value)
+
+
+class BitmapIndex:
+    """
+    Bitmaps of the (column, value) pairs of a dataset.
+
+    Args:
+        rows (int): Number of indexed rows.
+        bitmaps (dict): column -> {value text (None: missing) -> uint64 words}.
+        digest (str): Content hash of the dataset file of the rows (see
+            cache.file_digest), None if unknown.
+    """
+
+    def __init__(self, rows, bitmaps, digest=None):
+        self.rows = rows
+        self.bitmaps = bitmaps
+        self.digest = digest
+
+    @classmethod
+    def build(cls, df, max_values=BITMAP_MAX_VALUES, digest=None):
+        """
+        Index the columns of df with at most max_values distinct values.
+
+        Args:
+            df (pd.DataFrame): Integrated dataset (output of clean_final_df).
+            max_values (int): Columns with more distinct values are not indexed.
+            digest (str): Content hash of the file df was written to, checked on load.
+        """
+        bitmaps = {}
+        for column in df.columns:
+            if column in UNINDEXED_COLUMNS:
+                continue
+            codes, labels = column_codes(df[column], text_label)
+            if len(labels) > max_values:
+                continue
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+            bitmaps[column] = {}
+            for code, label in enumerate(labels):
+                mask = np.zeros(len(df), dtype=bool)
+                mask[order[bounds[code]:bounds[code + 1]]] = True
+                bitmaps[column][label] = pack_rows(mask)
+        return cls(len(df), bitmaps, digest)
+
+    def values(self, column):
+        """Indexed values of a column"""
+        return list(self.bitmaps[column])
+
+    def column_bitmap(self, column, accepted):
+        """Words of the rows whose column value is one of accepted"""
+        if column not in self.bitmaps:
+            raise KeyError(f"Column {column!r} is not indexed")
+        words = np.zeros(-(-self.rows // 64), dtype=np.uint64)
+        for value in accepted:
+            bitmap = self.bitmaps[column].get(label_key(value))
+            if bitmap is not None:
+                words |= bitmap
+        return words
+
+    def bitmap(self, filters):
+        """
+        Words of the rows matching every filter.
+
+        Args:
+            filters (dict): column -> accepted value, or list/tuple/set of accepted values.
+        """
+        result = None
+        for column, wanted in filters.items():
+            accepted = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            if len(accepted) == 1 and column in self.bitmaps:
+                # A single value: intersect its bitmap directly, without a copy
+                words = self.bitmaps[column].get(label_key(next(iter(accepted))))
+                if words is None:
+                    words = np.zeros(-(-self.rows // 64), dtype=np.uint64)
+            else:
+                words = self.column_bitmap(column, accepted)
+            result = words.copy() if result is None else np.bitwise_and(result, words, out=result)
+        if result is None:
+            result = pack_rows(np.ones(self.rows, dtype=bool))
+        return result
+
+    def count(self, **filters):
+        """Number of rows matching the filters (column=value or column=[values], all ANDed)"""
+        return popcount(self.bitmap(filters))
+
+    def row_ids(self, **filters):
+        """Positions of the rows matching the filters, in increasing order"""
+        bits = np.unpackbits(self.bitmap(filters).view(np.uint8), count=self.rows, bitorder='little')
+        return np.flatnonzero(bits)
+
+    def save(self, path):
+        """Write the index to path (.npz, compressed)"""
+        manifest = [[column, list(values)] for column, values in self.bitmaps.items()]
+        arrays = {
+            f'b{i}': words
+            for i, words in enumerate(words for values in self.bitmaps.values() for words in values.values())
+        }
+        manifest = {'rows': self.rows, 'digest': self.digest, 'columns': manifest}
+        np.savez_compressed(path, manifest=np.array(json.dumps(manifest)), **arrays)
+
+    @classmethod
+    def load(cls, path, dataset=None):
+        """
+        Read an index written by save.
+
+        Args:
+            path (str): Path of the .npz file.
+            dataset (str): Path of the indexed dataset file; if given, the index
+                must have been built from its current content.
+
+        Raises:
+            ValueError: The dataset changed since the index was built (or the
+            index does not record which content it was built from).
+        """
+        with np.load(path) as saved:
+            manifest = json.loads(str(saved['manifest']))
+            if dataset is not None and manifest.get('digest') != file_digest(dataset):
+                raise ValueError(f"The bitmap index {path} is stale: {dataset} changed since it was built")
+            bitmaps, i = {}, 0
+            for column, values in manifest['columns']:
+                bitmaps[column] = {}
+                for value in values:
+                    bitmaps[column][value] = saved[f'b{i}']
+                    i += 1
+        return cls(manifest['rows'], bitmaps, manifest.get('digest'))
@@ -0,0 +1,84 @@
+"""
+Content-addressed cache for pipeline stage outputs.
+
+A stage result is stored under a key derived from the content hash of its
+input (a raw file, a downloaded frame or the key of the upstream stage) and
+a hash of the source code that computes it. Unchanged inputs and code reuse
+the stored frame; only the latest entry of each stage is kept.
+"""
+
+import glob
+import hashlib
+import inspect
+import os
+
+import pandas as pd
+
+
+def _sha256(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def file_digest(path, block_size=1 << 20):
+    """Content hash of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def frame_digest(df):
+    """Content hash of a DataFrame (values and column names)"""
+    values = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return _sha256(list(df.columns), values.tobytes())
+
+
+def source_digest(*objects):
+    """Hash of the source code of functions/modules, used as a stage code version"""
+    return _sha256(*(inspect.getsource(obj) for obj in objects))
+
+
+class StageCache:
+    """
+    Pickle-backed stage cache.
+
+    Args:
+        cache_dir (str): Directory holding the entries ({stage}-{key}.pkl).
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.stats = {}
+
+    @staticmethod
+    def key(*parts):
+        """Combine input hashes and code versions into a stage key"""
+        return _sha256(*parts)
+
+    def _path(self, stage, key):
+        return os.path.join(self.cache_dir, f'{stage}-{key}.pkl')
+
+    def get(self, stage, key, compute):
+        """
+        Return the cached result of stage for key, or compute and store it.
+
+        Storing a new entry evicts the older entries of the same stage. Every
+        lookup is recorded in self.stats as 'hit' or 'miss'.
+        """
+        path = self._path(stage, key)
+        if os.path.exists(path):
+            self.stats[stage] = 'hit'
+            return pd.read_pickle(path)
+
+        self.stats[stage] = 'miss'
+        result = compute()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for stale in glob.glob(os.path.join(glob.escape(self.cache_dir), f'{glob.escape(stage)}-*.pkl')):
+            os.remove(stale)
+        pd.to_pickle(result, path)
+        return result
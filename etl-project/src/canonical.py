@@ -0,0 +1,203 @@
+"""
+Canonical spellings of the country and answer values shared by all surveys.
+
+Every column has a vocabulary: the canonical values and the spellings that
+resolve to them. A raw value is looked up once per distinct value, first in
+the mappings learned on previous runs, then by its normalized spelling
+(case, surrounding/duplicate whitespace and typographic apostrophes are
+ignored). Resolved spellings are learned and persisted with save(), so a
+known spelling costs a single hash lookup. Values outside the vocabulary are
+kept as they are and reported by unseen_values.
+
+Countries also carry their ISO 3166 alpha-3 code, which is the LOCATION code
+of the OECD data.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from normalize import map_distinct
+
+# (canonical label, ISO alpha-3 code, other spellings). The labels are the
+# spellings used in the integrated dataset.
+COUNTRIES = [
+    ('USA', 'USA', ['United States', 'United States of America', 'US', 'U.S.', 'U.S.A.', 'America']),
+    ('UK', 'GBR', ['United Kingdom', 'Great Britain', 'England', 'Scotland', 'Wales', 'Northern Ireland']),
+    ('Canada', 'CAN', ['CA']),
+    ('Germany', 'DEU', ['DE', 'Deutschland']),
+    ('Afghanistan', 'AFG', []),
+    ('Algeria', 'DZA', ['Algérie']),
+    ('Argentina', 'ARG', []),
+    ('Australia', 'AUS', []),
+    ('Austria', 'AUT', []),
+    ('Bahamas, The', 'BHS', ['Bahamas', 'The Bahamas']),
+    ('Bangladesh', 'BGD', []),
+    ('Belgium', 'BEL', ['Belgique']),
+    ('Bosnia and Herzegovina', 'BIH', []),
+    ('Brazil', 'BRA', ['Brasil']),
+    ('Brunei', 'BRN', []),
+    ('Bulgaria', 'BGR', []),
+    ('Chile', 'CHL', []),
+    ('China', 'CHN', []),
+    ('Colombia', 'COL', []),
+    ('Costa Rica', 'CRI', []),
+    ('Croatia', 'HRV', []),
+    ('Czech Republic', 'CZE', ['Czechia']),
+    ('Denmark', 'DNK', []),
+    ('Ecuador', 'ECU', []),
+    ('Egypt', 'EGY', []),
+    ('Estonia', 'EST', []),
+    ('Finland', 'FIN', []),
+    ('France', 'FRA', []),
+    ('Georgia', 'GEO', []),
+    ('Greece', 'GRC', []),
+    ('Guatemala', 'GTM', []),
+    ('Hungary', 'HUN', []),
+    ('Iceland', 'ISL', []),
+    ('India', 'IND', []),
+    ('Iran', 'IRN', []),
+    ('Ireland', 'IRL', []),
+    ('Israel', 'ISR', []),
+    ('Italy', 'ITA', []),
+    ('Japan', 'JPN', []),
+    ('Latvia', 'LVA', []),
+    ('Lithuania', 'LTU', []),
+    ('Luxembourg', 'LUX', []),
+    ('Mexico', 'MEX', []),
+    ('Moldova', 'MDA', []),
+    ('Morocco', 'MAR', ['Maroc']),
+    ('Netherlands', 'NLD', ['The Netherlands', 'Holland']),
+    ('New Zealand', 'NZL', []),
+    ('Nigeria', 'NGA', []),
+    ('Norway', 'NOR', []),
+    ('Pakistan', 'PAK', []),
+    ('Philippines', 'PHL', []),
+    ('Poland', 'POL', []),
+    ('Portugal', 'PRT', []),
+    ('Romania', 'ROU', []),
+    ('Russia', 'RUS', ['Russian Federation']),
+    ('Serbia', 'SRB', []),
+    ('Singapore', 'SGP', []),
+    ('Slovakia', 'SVK', ['Slovak Republic']),
+    ('Slovenia', 'SVN', []),
+    ('South Africa', 'ZAF', []),
+    ('South Korea', 'KOR', ['Korea', 'Republic of Korea']),
+    ('Spain', 'ESP', ['España']),
+    ('Sweden', 'SWE', []),
+    ('Switzerland', 'CHE', ['Suisse']),
+    ('Taiwan', 'TWN', []),
+    ('Thailand', 'THA', []),
+    ('Tunisia', 'TUN', ['Tunisie']),
+    ('Turkey', 'TUR', ['Türkiye']),
+    ('United Arab Emirates', 'ARE', ['UAE']),
+    ('Uruguay', 'URY', []),
+    ('Venezuela', 'VEN', []),
+    ('Vietnam', 'VNM', ['Viet Nam']),
+    ('Zimbabwe', 'ZWE', []),
+    ('Other', None, []),
+]
+
+COUNTRY_ISO_CODES = {label: code for label, code, _ in COUNTRIES if code is not None}
+
+# Numeric encodings of the canonical answers (used by transform_survey)
+INTERFERE_SCORES = {
+    'Never': 0,
+    'Rarely': 1,
+    'Sometimes': 2,
+    'Often': 3,
+    'Unknown': 1
+}
+BENEFITS_2016_SCORES = {
+    'Yes': 1,
+    'No': 0,
+    'I don\'t know': 0,
+    'Not eligible for coverage / N/A': 0
+}
+
+# column -> {canonical value: other spellings}
+VOCABULARIES = {
+    'country': {label: [code, *aliases] if code else aliases for label, code, aliases in COUNTRIES},
+    'work_interfere': {**dict.fromkeys(INTERFERE_SCORES, []), 'Not applicable': ['N/A']},
+    'benefits': {**dict.fromkeys(BENEFITS_2016_SCORES, []), 'Don\'t know': []},
+}
+
+
+def canonical_key(value):
+    """Spelling-insensitive lookup key of a raw value"""
+    text = str(value).replace('’', "'").replace('‘', "'")
+    return ' '.join(text.split()).casefold()
+
+
+def vocabulary_digest():
+    """Hash of VOCABULARIES; learned mappings saved under another digest are discarded"""
+    return hashlib.sha256(json.dumps(VOCABULARIES, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class CanonicalIndex:
+    """
+    Raw spelling -> canonical value index of each column in VOCABULARIES.
+
+    Args:
+        learned (dict): column -> {raw value: canonical value} from a previous run.
+    """
+
+    def __init__(self, learned=None):
+        self.learned = {column: dict((learned or {}).get(column, {})) for column in VOCABULARIES}
+        self.spellings = {
+            column: {
+                canonical_key(spelling): canonical
+                for canonical, aliases in vocabulary.items() for spelling in [canonical, *aliases]
+            }
+            for column, vocabulary in VOCABULARIES.items()
+        }
+
+    @classmethod
+    def load(cls, path):
+        """Index with the mappings saved at path (a fresh index if missing or built from another vocabulary)"""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        return cls(state['learned'] if state.get('vocabulary') == vocabulary_digest() else None)
+
+    def save(self, path):
+        state = {'vocabulary': vocabulary_digest(), 'learned': self.learned}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=4, ensure_ascii=False, sort_keys=True)
+
+    def resolve(self, column, value):
+        """Canonical value of one raw value, or the value itself if it is outside the vocabulary"""
+        learned = self.learned[column]
+        if value in learned:
+            return learned[value]
+        canonical = self.spellings[column].get(canonical_key(value))
+        if canonical is None:
+            return value
+        # Only text spellings are learned (JSON keys are strings)
+        if isinstance(value, str):
+            learned[value] = canonical
+        return canonical
+
+    def canonicalize(self, series, column):
+        """Map each distinct value of series to its canonical value; missing values are kept"""
+        def resolve_uniques(uniques):
+            return [value if pd.isna(value) else self.resolve(column, value) for value in uniques]
+        return map_distinct(series, resolve_uniques)
+
+
+def unseen_values(df):
+    """
+    column -> sorted distinct text values of df outside the vocabulary of that column.
+
+    Non-text values (e.g. the 2016 benefits once encoded as 0/1) are not spellings and are ignored.
+    """
+    unseen = {}
+    for column, vocabulary in VOCABULARIES.items():
+        if column in df.columns:
+            outside = {value for value in df[column].unique() if isinstance(value, str) and value not in vocabulary}
+            if outside:
+                unseen[column] = sorted(outside)
+    return unseen
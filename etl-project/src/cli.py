@@ -0,0 +1,76 @@
+"""
+Command line entry point of the pipeline.
+
+Usage (from etl-project/, or `python cli.py ...` from src/):
+    python -m src [--form responses.csv] [--outputs-dir DIR] [--chunksize 500] [--engine polars] ...
+
+The data directories default to those of config.py, which do not depend on
+the current directory. The pipeline (pandas, and sklearn in the stages that
+use it) is only imported once the arguments are parsed, so --help and
+argument errors answer at once.
+"""
+
+import argparse
+
+import config
+
+# writers.OUTPUT_FORMATS and etl.ENGINES, spelled out so that --help does not import pandas
+OUTPUT_FORMATS = ('csv', 'parquet', 'feather')
+ENGINES = ('pandas', 'polars')
+
+
+def build_parser(prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.strip().splitlines()[0])
+    paths = parser.add_argument_group('paths')
+    paths.add_argument('--raw-dir', default=config.DATA_RAW_PATH, help='Raw surveys and OECD data')
+    paths.add_argument('--processed-dir', default=config.DATA_PROCESSED_PATH, help='Cleaned per-survey datasets')
+    paths.add_argument('--outputs-dir', default=config.OUTPUTS_PATH, help='Integrated datasets and metadata')
+    paths.add_argument('--cache-dir', default=config.CACHE_PATH, help='Stage cache entries (with --use-cache)')
+    paths.add_argument('--form', help='Local CSV export of the form responses (default: the published Google Sheet)')
+
+    run = parser.add_argument_group('run options (see etl.run_etl)')
+    run.add_argument('--chunksize', type=int, help='Stream the surveys in chunks of this many rows')
+    run.add_argument('--output-format', default='csv', choices=OUTPUT_FORMATS, help='Format of the saved datasets')
+    run.add_argument('--engine', default='pandas', choices=ENGINES, help='Engine of the cleaning chain')
+    run.add_argument('--workers', type=int, help='Clean and transform the surveys in this many processes')
+    run.add_argument('--discover-surveys', action='store_true',
+                     help='Also ingest the other survey_<year>.csv files of --raw-dir with a registered adapter')
+    run.add_argument('--partition-rows', type=int, help='With --workers, split larger surveys across the workers')
+    run.add_argument('--use-cache', action='store_true', help='Reuse the unchanged cleaned/transformed surveys')
+    run.add_argument('--incremental', action='store_true', help='Only append the new form responses')
+    run.add_argument('--prune-columns', action='store_true', help='Only parse the raw columns that are kept')
+    run.add_argument('--compact-dtypes', action='store_true', help='Convert the integrated dataset to compact dtypes')
+    run.add_argument('--impute', action='store_true', help='KNN-impute the OECD-integrated dataset')
+    run.add_argument('--trace-memory', action='store_true', help='Record the tracemalloc peak of each stage')
+    run.add_argument('--profile-stage', help='Run this stage under cProfile')
+    return parser
+
+
+def main(argv=None, prog=None):
+    args = build_parser(prog).parse_args(argv)
+
+    import etl
+    etl.DATA_RAW_PATH = args.raw_dir
+    etl.DATA_PROCESSED_PATH = args.processed_dir
+    etl.OUTPUTS_PATH = args.outputs_dir
+    etl.CACHE_PATH = args.cache_dir
+    return etl.run_etl(
+        chunksize=args.chunksize,
+        output_format=args.output_format,
+        use_cache=args.use_cache,
+        form_source=etl.CsvFormSource(args.form) if args.form else None,
+        incremental=args.incremental,
+        workers=args.workers,
+        partition_rows=args.partition_rows,
+        prune_columns=args.prune_columns,
+        trace_memory=args.trace_memory,
+        profile_stage=args.profile_stage,
+        impute=args.impute,
+        compact_dtypes=args.compact_dtypes,
+        engine=args.engine,
+        discover_surveys=args.discover_surveys,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Memory-mappable columnar copy of the integrated dataset.
+
+Every column is one fixed-width .npy file of a generation subdirectory,
+described by the columns.json sidecar of the directory:
+
+- text and categorical columns are stored as their integer codes, the
+  categories (the CSV text of the values, as in writers.typed_frame) being
+  the dictionary of the sidecar;
+- numbers, the survey year and the timestamp keep their typed_frame dtype;
+- nullable integer/boolean columns are stored as their values plus a mask.
+
+load_columnar maps the files instead of reading them: the frame is built on
+the mapped arrays without a copy, so opening it is almost instant and the
+processes of one machine share the pages of the OS page cache rather than
+each parsing the CSV into a private copy. The mapping is copy-on-write, so a
+process modifying its frame never changes the files.
+
+A rewrite goes to a new generation subdirectory, published by replacing the
+sidecar: readers see the previous generation or all of the new one, never a
+mix. The older generations (with the columns the new one dropped) are then
+deleted; processes that already mapped them keep reading their pages.
+
+    >>> df = load_columnar('data/outputs/final_integrated_columns')
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from writers import typed_frame
+
+SIDECAR = 'columns.json'
+# Attempts of load_columnar to open the generation of the sidecar (it may be replaced meanwhile)
+LOAD_ATTEMPTS = 3
+# Nullable columns (dtype kind -> array type), stored as values + mask
+MASKED_ARRAYS = {'b': pd.arrays.BooleanArray, 'i': pd.arrays.IntegerArray, 'u': pd.arrays.IntegerArray,
+                 'f': pd.arrays.FloatingArray}
+
+
+def column_arrays(values):
+    """(kind, {array name: numpy array}, categories) of one typed column"""
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return 'categorical', {'codes': values.cat.codes.to_numpy()}, [str(value) for value in dtype.categories]
+    if isinstance(values.array, pd.api.extensions.ExtensionArray) and hasattr(dtype, 'numpy_dtype'):
+        data = values.to_numpy(dtype=dtype.numpy_dtype, na_value=0)
+        return 'masked', {'values': data, 'mask': values.isna().to_numpy()}, None
+    if dtype == object:
+        text = values.where(values.isna(), values.astype(str)).astype('category')
+        return column_arrays(text)
+    return 'values', {'values': values.to_numpy()}, None
+
+
+def read_sidecar(directory):
+    with open(os.path.join(directory, SIDECAR)) as f:
+        return json.load(f)
+
+
+def write_columnar(df, directory):
+    """
+    Write df as memory-mappable columns, as a new generation of directory.
+
+    Args:
+        df (pd.DataFrame): Integrated dataset (object or compact dtypes).
+        directory (str): Output directory, created if needed.
+
+    Returns:
+        str: The directory.
+    """
+    os.makedirs(directory, exist_ok=True)
+    sidecar_path = os.path.join(directory, SIDECAR)
+    generation = read_sidecar(directory).get('generation', 0) + 1 if os.path.exists(sidecar_path) else 1
+    generation_dir = f'g{generation:06d}'
+    # A generation left over by an interrupted write is never published
+    shutil.rmtree(os.path.join(directory, generation_dir), ignore_errors=True)
+    os.makedirs(os.path.join(directory, generation_dir))
+
+    typed = typed_frame(df)
+    columns = []
+    for position, column in enumerate(typed.columns):
+        kind, arrays, categories = column_arrays(typed[column])
+        files = {}
+        for name, array in arrays.items():
+            files[name] = os.path.join(generation_dir, f'{position:03d}_{name}.npy')
+            np.save(os.path.join(directory, files[name]), np.ascontiguousarray(array), allow_pickle=False)
+        columns.append({'name': column, 'kind': kind, 'dtype': str(typed[column].dtype), 'files': files,
+                        'categories': categories})
+    # One rename publishes the generation: readers see the previous columns or all of the new ones
+    with open(f'{sidecar_path}.tmp', 'w') as f:
+        json.dump({'generation': generation, 'rows': len(typed), 'columns': columns}, f)
+    os.replace(f'{sidecar_path}.tmp', sidecar_path)
+
+    # Everything else (older generations, files of the layout without generations) is unpublished
+    for entry in os.listdir(directory):
+        if entry not in (SIDECAR, generation_dir):
+            path = os.path.join(directory, entry)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+    return directory
+
+
+def load_columnar(directory, columns=None):
+    """
+    Open a dataset written by write_columnar without copying it.
+
+    Args:
+        directory (str): Directory of write_columnar.
+        columns (list): Columns to open (default: all of them, in order).
+
+    Returns:
+        pd.DataFrame: Frame whose columns are views of the mapped files
+        (copy-on-write: changes stay private to the process).
+    """
+    for attempt in range(LOAD_ATTEMPTS):
+        try:
+            return open_generation(directory, read_sidecar(directory), columns)
+        except FileNotFoundError:
+            # A writer published a new generation and deleted this one: open the new one
+            if attempt == LOAD_ATTEMPTS - 1:
+                raise
+
+
+def open_generation(directory, sidecar, columns=None):
+    """Frame of the columns of the generation a sidecar describes (see load_columnar)"""
+    selected = sidecar['columns'] if columns is None else [
+        column for name in columns for column in sidecar['columns'] if column['name'] == name]
+    if columns is not None and len(selected) != len(columns):
+        missing = set(columns) - {column['name'] for column in selected}
+        raise KeyError(f"Columns not in {directory}: {sorted(missing)}")
+
+    frame = {}
+    for column in selected:
+        arrays = {name: np.load(os.path.join(directory, file), mmap_mode='c') for name, file in column['files'].items()}
+        if column['kind'] == 'categorical':
+            frame[column['name']] = pd.Categorical.from_codes(arrays['codes'], categories=column['categories'])
+        elif column['kind'] == 'masked':
+            array_type = MASKED_ARRAYS[pd.api.types.pandas_dtype(column['dtype']).kind]
+            frame[column['name']] = array_type(arrays['values'], arrays['mask'])
+        else:
+            frame[column['name']] = arrays['values']
+    # copy=False keeps one block per column, each on its mapped file
+    return pd.DataFrame(frame, index=pd.RangeIndex(sidecar['rows']), copy=False)
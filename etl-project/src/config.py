@@ -1,8 +1,25 @@
-# Path configuration
-DATA_RAW_PATH = 'data/raw'
-DATA_PROCESSED_PATH = 'data/processed'
-OUTPUTS_PATH = 'data/outputs'
-
-# Data cleaning parameters
-AGE_RANGE = (18, 100)
-KNN_NEIGHBORS = 3
\ No newline at end of file
+import os
+
+# Path configuration, relative to the project directory (not to the current directory)
+PROJECT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_RAW_PATH = os.path.join(PROJECT_PATH, 'data', 'raw')
+DATA_PROCESSED_PATH = os.path.join(PROJECT_PATH, 'data', 'processed')
+OUTPUTS_PATH = os.path.join(PROJECT_PATH, 'data', 'outputs')
+CACHE_PATH = os.path.join(PROJECT_PATH, 'data', 'cache')
+
+# Data cleaning parameters
+AGE_RANGE = (18, 100)
+KNN_NEIGHBORS = 3
+# Maximum rows per block of the KNN imputation (see impute.impute_knn)
+KNN_BLOCK_ROWS = 2000
+# Format of the day-first 'Horodateur' timestamps of the form responses
+FORM_TIMESTAMP_FORMAT = '%d/%m/%Y %H:%M:%S'
+# Columns with a higher share of missing values get a "Not specified" category
+MISSING_CATEGORY_THRESHOLD = 0.3
+# Width of the age bands of the dashboard cube (see cube.build_cube)
+CUBE_AGE_BAND_YEARS = 5
+# Local query service of the dashboard (see service.py)
+SERVICE_PORT = 8050
+SERVICE_CACHE_SIZE = 256
+# Columns with more distinct values are not bitmap-indexed (see bitmap_index.BitmapIndex)
+BITMAP_MAX_VALUES = 100
@@ -0,0 +1,265 @@
+"""
+Aggregate cube of the integrated survey rows for the dashboard.
+
+The dashboard charts only show counts and rates of a few answer columns,
+filtered by survey year, gender, age, country, remote work and tech company.
+build_cube groups the rows by these filter dimensions (ages in bands of
+CUBE_AGE_BAND_YEARS years) and, for each chart measure, by the measure
+columns, so the dashboard loads and filters a number of cells bounded by
+the distinct answers, whatever the number of responses.
+
+Only counts are stored: they add up, so the cubes of separate chunks (or of
+the rows appended by an incremental run, see load_cube) are combined with
+merge_cubes and any filtered slice is a sum of cells. Rates (e.g. the
+treatment rate of a slice) are ratios of those sums.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from config import CUBE_AGE_BAND_YEARS
+
+# Dashboard filters; survey_year and age_band are integers, the others text
+DIMENSIONS = ['survey_year', 'gender', 'age_band', 'country', 'remote_work', 'tech_company']
+
+# measure -> answer columns counted under the dimensions (by chart page)
+MEASURES = {
+    # index: respondents by gender/country/age, treatment and work interference rates
+    'respondents': [],
+    'treatment': ['treatment'],
+    'work_interfere': ['work_interfere'],
+    # factors: treatment rate by factor (remote_work and tech_company are dimensions)
+    'family_history_treatment': ['family_history', 'treatment'],
+    'self_employed_treatment': ['self_employed', 'treatment'],
+    'no_employees_treatment': ['no_employees', 'treatment'],
+    # support
+    'benefits': ['benefits'],
+    'care_options': ['care_options'],
+    'wellness_program': ['wellness_program'],
+    'seek_help': ['seek_help'],
+    'anonymity': ['anonymity'],
+    'leave': ['leave'],
+    # physical vs mental health
+    'mental_health_consequence': ['mental_health_consequence'],
+    'phys_health_consequence': ['phys_health_consequence'],
+    'mental_health_interview': ['mental_health_interview'],
+    'phys_health_interview': ['phys_health_interview'],
+    'coworkers': ['coworkers'],
+    'mental_vs_physical': ['mental_vs_physical'],
+}
+
+
+def text_label(value):
+    """A value as the string of the CSV output"""
+    return str(value)
+
+
+def band_label(age):
+    """Lower bound of the age band of an age"""
+    return int(age // CUBE_AGE_BAND_YEARS * CUBE_AGE_BAND_YEARS)
+
+
+def column_codes(series, label):
+    """
+    Dictionary-encode a column under a labelling of its values.
+
+    The raw values are factorized once and label is applied to each distinct
+    value, so e.g. 1 and '1' share one code.
+
+    Returns:
+        tuple: (int64 code of each row, labels by code; None for missing values)
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    label_codes, labels = pd.factorize(np.array([None if pd.isna(v) else label(v) for v in uniques], dtype=object),
+                                       use_na_sentinel=False)
+    return label_codes[codes].astype(np.int64), [None if pd.isna(value) else value for value in labels]
+
+
+def cube_columns(df):
+    """column -> (codes, labels) of the dimension and measure columns of df (absent columns are all missing)"""
+    sources = {
+        'age_band': (pd.to_numeric(df['age'], errors='coerce') if 'age' in df.columns else None, band_label),
+        'survey_year': (df['survey_year'] if 'survey_year' in df.columns else None, int),
+    }
+    columns = {}
+    for column in dict.fromkeys(DIMENSIONS + [c for columns in MEASURES.values() for c in columns]):
+        values, label = sources.get(column, (df[column] if column in df.columns else None, text_label))
+        if values is None:
+            columns[column] = (np.zeros(len(df), dtype=np.int64), [None])
+        else:
+            columns[column] = column_codes(values, label)
+    return columns
+
+
+def combine_codes(key, codes, size):
+    """Mixed-radix key of the code tuples (key, codes)"""
+    return key * size + codes
+
+
+def build_cube(df):
+    """
+    Count the rows of df by the dimensions and the columns of each measure.
+
+    Rows are grouped on integer keys combining the codes of their columns,
+    never on the raw values.
+
+    Args:
+        df (pd.DataFrame): Integrated dataset (output of clean_final_df).
+
+    Returns:
+        dict: measure -> DataFrame of the group columns and their 'count',
+        one row per non-empty cell.
+    """
+    columns = cube_columns(df)
+    dimension_key = np.zeros(len(df), dtype=np.int64)
+    for dimension in DIMENSIONS:
+        codes, labels = columns[dimension]
+        dimension_key = combine_codes(dimension_key, codes, len(labels))
+    # Densify the dimension key so measure keys stay small
+    dimension_cell, dimension_keys = pd.factorize(dimension_key)
+    dimension_sizes = [len(columns[dimension][1]) for dimension in DIMENSIONS]
+
+    cube = {}
+    for measure, measure_columns in MEASURES.items():
+        key = dimension_cell.astype(np.int64)
+        sizes = [len(columns[column][1]) for column in measure_columns]
+        for column, size in zip(measure_columns, sizes):
+            key = combine_codes(key, columns[column][0], size)
+        cells, counts = np.unique(key, return_counts=True)
+
+        cell_codes = np.unravel_index(cells, [max(len(dimension_keys), 1)] + sizes)
+        dimension_codes = np.unravel_index(dimension_keys[cell_codes[0]], dimension_sizes)
+        group_codes = list(zip(DIMENSIONS + measure_columns, [*dimension_codes, *cell_codes[1:]]))
+        cube[measure] = pd.DataFrame({
+            **{column: pd.Series(columns[column][1], dtype=object).take(codes).to_numpy()
+               for column, codes in group_codes},
+            'count': counts,
+        })
+    return cube
+
+
+def merge_cubes(left, right):
+    """Cube of the rows of both cubes (cell counts are added)"""
+    merged = {}
+    for measure, columns in MEASURES.items():
+        keys = DIMENSIONS + columns
+        counts = {}
+        for cells in (left[measure], right[measure]):
+            for *group, count in cells[keys + ['count']].itertuples(index=False):
+                counts[tuple(group)] = counts.get(tuple(group), 0) + count
+        merged[measure] = pd.DataFrame([[*group, count] for group, count in counts.items()],
+                                       columns=keys + ['count'], dtype=object).astype({'count': np.int64})
+    return merged
+
+
+def sort_labels(values):
+    """Distinct values sorted, missing value last"""
+    present = {value for value in values if value is not None}
+    return sorted(present) + ([None] if None in values else [])
+
+
+def encode_cube(cube):
+    """
+    Compact JSON form of a cube.
+
+    Each column's distinct values are listed once under 'values' (null for a
+    missing value); a cell is the list of its value positions, in the order of
+    'dimensions' then of the measure 'columns', followed by its count.
+    """
+    values = {}
+    for measure, columns in MEASURES.items():
+        for column in DIMENSIONS + columns:
+            values.setdefault(column, set()).update(cube[measure][column])
+    values = {column: sort_labels(labels) for column, labels in values.items()}
+
+    measures = {}
+    for measure, columns in MEASURES.items():
+        cells = cube[measure]
+        positions = [{label: i for i, label in enumerate(values[column])} for column in DIMENSIONS + columns]
+        rows = cells[DIMENSIONS + columns + ['count']].itertuples(index=False)
+        measures[measure] = {
+            'columns': columns,
+            'cells': sorted([lookup[label] for lookup, label in zip(positions, row)] + [int(row[-1])] for row in rows),
+        }
+
+    return {
+        'rows': int(cube['respondents']['count'].sum()),
+        'age_band_years': CUBE_AGE_BAND_YEARS,
+        'dimensions': DIMENSIONS,
+        'values': {column: [to_json(value) for value in labels] for column, labels in values.items()},
+        'measures': measures,
+    }
+
+
+def to_json(value):
+    """JSON-serializable form of a label (numpy/pandas integers become int)"""
+    return int(value) if isinstance(value, (int, np.integer)) else value
+
+
+def save_cube(cube, path):
+    """Write the compact JSON form of cube to path"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(encode_cube(cube), f, separators=(',', ':'), ensure_ascii=False)
+
+
+def decode_cube(encoded):
+    """Cube of its compact JSON form (inverse of encode_cube)"""
+    if encoded['age_band_years'] != CUBE_AGE_BAND_YEARS:
+        raise ValueError(f"The cube has {encoded['age_band_years']}-year age bands, "
+                         f"CUBE_AGE_BAND_YEARS is {CUBE_AGE_BAND_YEARS}")
+    values = encoded['values']
+    cube = {}
+    for measure, columns in MEASURES.items():
+        keys = DIMENSIONS + columns
+        cells = np.array(encoded['measures'][measure]['cells'], dtype=np.int64).reshape(-1, len(keys) + 1)
+        cube[measure] = pd.DataFrame({
+            **{column: pd.Series(values[column], dtype=object).take(cells[:, i]).to_numpy()
+               for i, column in enumerate(keys)},
+            'count': cells[:, -1],
+        })
+    return cube
+
+
+def load_cube(path):
+    """Cube written by save_cube to path"""
+    with open(path, encoding='utf-8') as f:
+        return decode_cube(json.load(f))
+
+
+def cube_counts(encoded, measure, max_age=None, **filters):
+    """
+    Counts of a measure's answers over the cells of an encoded cube matching filters.
+
+    Args:
+        encoded (dict): Output of encode_cube.
+        measure (str): Name of the measure (see MEASURES).
+        max_age (int): Keep the age bands entirely at or below this age.
+        **filters: dimension -> value or list of accepted values.
+
+    Returns:
+        dict: tuple of the measure column values -> count.
+    """
+    values = encoded['values']
+    positions = {dimension: encoded['dimensions'].index(dimension) for dimension in filters}
+    accepted = {
+        dimension: {values[dimension].index(value) for value in (wanted if isinstance(wanted, list) else [wanted])
+                    if value in values[dimension]}
+        for dimension, wanted in filters.items()
+    }
+    age_position = encoded['dimensions'].index('age_band')
+    width = len(encoded['dimensions'])
+    columns = encoded['measures'][measure]['columns']
+
+    counts = {}
+    for cell in encoded['measures'][measure]['cells']:
+        if any(cell[positions[dimension]] not in codes for dimension, codes in accepted.items()):
+            continue
+        if max_age is not None:
+            band = values['age_band'][cell[age_position]]
+            if band is None or band + encoded['age_band_years'] - 1 > max_age:
+                continue
+        key = tuple(values[column][code] for column, code in zip(columns, cell[width:-1]))
+        counts[key] = counts.get(key, 0) + cell[-1]
+    return counts
@@ -1,538 +1,1372 @@
-"""
-ETL Pipeline for Mental Health and OECD Data Integration
-
-This script performs:
-1. Data loading from multiple sources
-2. Data cleaning and standardization
-3. Data transformation and feature engineering
-4. Data integration
-5. Data quality validation
-6. Saving processed data
-"""
-
-# Step 0: Install & Import
-import os
-import pandas as pd
-import numpy as np
-from sklearn.impute import KNNImputer
-from sklearn.preprocessing import StandardScaler
-import json
-
-# Configuration
-DATA_RAW_PATH = os.path.join('..', 'data', 'raw')
-DATA_PROCESSED_PATH = os.path.join('..', 'data', 'processed')
-OUTPUTS_PATH = os.path.join('..', 'data', 'outputs')
-
-
-def load_google_form_survey():
-    csv_url = "https://docs.google.com/spreadsheets/d/e/2PACX-1vR3vkqIO5V9IO3ap6X7RSPVScbBp8J02ZnOKRu3vnrvQOha_9pKEJ7_bUilHiB3hgrJ1UWUZGZNR_CS/pub?gid=1966309919&single=true&output=csv"
-    print("Loading survey responses from Google Sheets CSV URL...")
-    df_survey = pd.read_csv(csv_url)
-    return df_survey
-
-# Step 1: Data Loading Functions
-def load_datasets():
-    """Load raw datasets from data/raw directory"""
-    df_survey=load_google_form_survey()
-    df_2014 = pd.read_csv(os.path.join(DATA_RAW_PATH, 'survey_2014.csv'))
-    df_2016 = pd.read_csv(os.path.join(DATA_RAW_PATH, 'survey_2016.csv'))
-    return df_survey, df_2014, df_2016
-
-# Step 2: Data Cleaning Functions
-
-def clean_survey_2014(df_2014):
-    """Clean 2014 mental health survey data"""
-    
-    # Standardize column names
-    df_2014.columns = df_2014.columns.str.lower()
-
-    # Handle missing values
-    df_2014['state'].fillna('Unknown', inplace=True)
-    df_2014['self_employed'].fillna('Unknown', inplace=True)
-    df_2014['work_interfere'].fillna('Unknown', inplace=True)
-    df_2014['comments'].fillna('No comments', inplace=True)
-
-    # Convert timestamp to datetime
-    df_2014['timestamp'] = pd.to_datetime(df_2014['timestamp'])
-
-    # Clean age column (filter outliers and replace with median)
-    df_2014['age'] = df_2014['age'].apply(lambda x: x if 18 <= x <= 100 else np.nan)
-    df_2014['age'].fillna(df_2014['age'].median(), inplace=True)
-
-    # Clean gender column with internal function
-    def clean_gender(gender):
-        gender = str(gender).strip().lower()
-
-        male_keywords = ['trans male', 'trans man', 'male', 'm', 'cis male', 'man', 'male (cis)', 'malr', 'cis man', 'make', 'mail']
-        female_keywords = ['trans woman', 'female (trans)', 'cis female', 'trans-female', 'female', 'f', 'woman', 'female (cis)', 'cis woman']
-
-        if any(keyword in gender for keyword in male_keywords):
-            return 'male'
-        elif any(keyword in gender for keyword in female_keywords):
-            return 'female'
-        else:
-            return 'other'
-
-    df_2014['gender'] = df_2014['gender'].apply(clean_gender)
-
-    return df_2014
-
-def clean_survey_2016(df_2016):
-    # Standardize column names
-    df_2016.columns = df_2016.columns.str.lower().str.replace(' ', '_').str.replace('?', '', regex=False).str.replace('/', '_')
-
-    # Handle missing values for key columns
-    df_2016['how_many_employees_does_your_company_or_organization_have'].fillna('Unknown', inplace=True)
-    df_2016['is_your_employer_primarily_a_tech_company_organization'].fillna('Unknown', inplace=True)
-
-    # For columns with many missing values, consider creating a "missing" category
-    cols_with_many_nulls = [col for col in df_2016.columns if df_2016[col].isnull().mean() > 0.3]
-    for col in cols_with_many_nulls:
-        df_2016[col].fillna('Not specified', inplace=True)
-
-    # Clean age column
-    df_2016['what_is_your_age'] = pd.to_numeric(df_2016['what_is_your_age'], errors='coerce')
-    df_2016['what_is_your_age'] = df_2016['what_is_your_age'].apply(lambda x: x if 18 <= x <= 100 else np.nan)
-    df_2016['what_is_your_age'].fillna(df_2016['what_is_your_age'].median(), inplace=True)
-
-    # Apply the column name mapping
-    column_mapping = {
-        'Are you self-employed?': 'self_employed',
-        'How many employees does your company or organization have?': 'no_employees',
-        'Is your employer primarily a tech company/organization?': 'tech_company',
-        'Is your primary role within your company related to tech/IT?': 'tech_role',
-        'Does your employer provide mental health benefits as part of healthcare coverage?': 'benefits',
-        'Do you know the options for mental health care available under your employer-provided coverage?': 'care_options',
-        'Has your employer ever formally discussed mental health (for example, as part of a wellness campaign or other official communication)?': 'wellness_program',
-        'Does your employer offer resources to learn more about mental health concerns and options for seeking help?': 'seek_help',
-        'Is your anonymity protected if you choose to take advantage of mental health or substance abuse treatment resources provided by your employer?': 'anonymity',
-        'If a mental health issue prompted you to request a medical leave from work, asking for that leave would be:': 'leave',
-        'Do you think that discussing a mental health disorder with your employer would have negative consequences?': 'mental_health_consequence',
-        'Do you think that discussing a physical health issue with your employer would have negative consequences?': 'phys_health_consequence',
-        'Would you feel comfortable discussing a mental health disorder with your coworkers?': 'coworkers',
-        'Would you feel comfortable discussing a mental health disorder with your direct supervisor(s)?': 'supervisor',
-        'Do you feel that your employer takes mental health as seriously as physical health?': 'mental_vs_physical',
-        'Have you heard of or observed negative consequences for co-workers who have been open about mental health issues in your workplace?': 'obs_consequence',
-        'Do you have medical coverage (private insurance or state-provided) which includes treatment of mental health issues?': 'medical_coverage',
-        'Do you know local or online resources to seek help for a mental health disorder?': 'know_resources',
-        'If you have been diagnosed or treated for a mental health disorder, do you ever reveal this to clients or business contacts?': 'reveal_to_clients',
-        'If you have revealed a mental health issue to a client or business contact, do you believe this has impacted you negatively?': 'client_impact',
-        'If you have been diagnosed or treated for a mental health disorder, do you ever reveal this to coworkers or employees?': 'reveal_to_coworkers',
-        'If you have revealed a mental health issue to a coworker or employee, do you believe this has impacted you negatively?': 'coworker_impact',
-        'Do you believe your productivity is ever affected by a mental health issue?': 'productivity_affected',
-        'If yes, what percentage of your work time (time performing primary or secondary job functions) is affected by a mental health issue?': 'productivity_percentage',
-        'Do you have previous employers?': 'previous_employers',
-        'Have your previous employers provided mental health benefits?': 'prev_benefits',
-        'Were you aware of the options for mental health care provided by your previous employers?': 'prev_care_options',
-        'Did your previous employers ever formally discuss mental health (as part of a wellness campaign or other official communication)?': 'prev_wellness_program',
-        'Did your previous employers provide resources to learn more about mental health issues and how to seek help?': 'prev_seek_help',
-        'Was your anonymity protected if you chose to take advantage of mental health or substance abuse treatment resources with previous employers?': 'prev_anonymity',
-        'Do you think that discussing a mental health disorder with previous employers would have negative consequences?': 'prev_mental_health_consequence',
-        'Do you think that discussing a physical health issue with previous employers would have negative consequences?': 'prev_phys_health_consequence',
-        'Would you have been willing to discuss a mental health issue with your previous co-workers?': 'prev_coworkers',
-        'Would you have been willing to discuss a mental health issue with your direct supervisor(s)?': 'prev_supervisor',
-        'Did you feel that your previous employers took mental health as seriously as physical health?': 'prev_mental_vs_physical',
-        'Did you hear of or observe negative consequences for co-workers with mental health issues in your previous workplaces?': 'prev_obs_consequence',
-        'Would you be willing to bring up a physical health issue with a potential employer in an interview?': 'phys_health_interview',
-        'Why or why not?': 'phys_health_interview_why',
-        'Would you bring up a mental health issue with a potential employer in an interview?': 'mental_health_interview',
-        'Why or why not?': 'mental_health_interview_why',
-        'Do you feel that being identified as a person with a mental health issue would hurt your career?': 'career_impact',
-        'Do you think that team members/co-workers would view you more negatively if they knew you suffered from a mental health issue?': 'coworker_perception',
-        'How willing would you be to share with friends and family that you have a mental illness?': 'share_with_family',
-        'Have you observed or experienced an unsupportive or badly handled response to a mental health issue in your current or previous workplace?': 'bad_response_experience',
-        'Have your observations of how another individual who discussed a mental health disorder made you less likely to reveal a mental health issue yourself in your current workplace?': 'observation_impact',
-        'Do you have a family history of mental illness?': 'family_history',
-        'Have you had a mental health disorder in the past?': 'past_disorder',
-        'Do you currently have a mental health disorder?': 'current_disorder',
-        'If yes, what condition(s) have you been diagnosed with?': 'diagnosed_condition',
-        'If maybe, what condition(s) do you believe you have?': 'suspected_condition',
-        'Have you been diagnosed with a mental health condition by a medical professional?': 'professional_diagnosis',
-        'If so, what condition(s) were you diagnosed with?': 'professional_diagnosis_details',
-        'Have you ever sought treatment for a mental health issue from a mental health professional?': 'treatment',
-        'If you have a mental health issue, do you feel that it interferes with your work when being treated effectively?': 'treated_interference',
-        'If you have a mental health issue, do you feel that it interferes with your work when NOT being treated effectively?': 'untreated_interference',
-        'What is your age?': 'age',
-        'What is your gender?': 'gender',
-        'What country do you live in?': 'country',
-        'What US state or territory do you live in?': 'state',
-        'What country do you work in?': 'work_country',
-        'What US state or territory do you work in?': 'work_state',
-        'Which of the following best describes your work position?': 'position',
-        'Do you work remotely?': 'remote_work'
-    }
-
-    # Apply the column name normalization
-    df_2016 = df_2016.rename(columns={k.lower().replace(' ', '_').replace('?', '').replace('/', '_'): v for k, v in column_mapping.items()})
-
-
-    return df_2016
-
-def clean_survey_2025(df_survey):
-    """Clean 2025 mental health survey data to align with 2014 schema"""
-    
-    # Create copy to avoid SettingWithCopyWarning
-    df_2025 = df_survey.copy()
-
-    # First normalize all column names to lowercase for consistent handling
-    df_2025.columns = [col.strip().lower() for col in df_2025.columns]
-    
-    # Rename mapping with lowercase keys to match normalized columns
-    rename_map = {
-        'horodateur': 'timestamp',
-        'age': 'age',
-        'gender': 'gender',
-        'country': 'country',
-        'are you self-employed?': 'self_employed',
-        'do you have a family history of mental illness?': 'family_history',
-        'have you sought treatment for a mental health condition?': 'treatment',
-        'if you have a mental health condition, do you feel that it interferes with your work?': 'work_interfere',
-        'do you work remotely (outside of an office) at least 50% of the time?': 'remote_work',
-        'is your employer primarily a tech company/organization?': 'tech_company',
-        'does your employer provide mental health benefits?': 'benefits',
-        'do you know the options for mental health care your employer provides?': 'care_options',
-        'has your employer ever discussed mental health as part of an employee wellness program?': 'wellness_program',
-        'does your employer provide resources to learn more about mental health issues and how to seek help?': 'seek_help',
-        'is your anonymity protected if you choose to take advantage of mental health or substance abuse treatment resources?': 'anonymity',
-        'how easy is it for you to take medical leave for a mental health condition?': 'leave',
-        'do you think that discussing a mental health issue with your employer would have negative consequences?': 'mental_health_consequence',
-        'do you think that discussing a physical health issue with your employer would have negative consequences?': 'phys_health_consequence',
-        'would you be willing to discuss a mental health issue with your coworkers?': 'coworkers',
-        'would you be willing to discuss a mental health issue with your supervisors?': 'supervisor',
-        'would you bring up a mental health issue with a potential employer in an interview?': 'mental_health_interview',
-        'would you bring up a physical health issue with a potential employer in an interview?': 'phys_health_interview',
-        'do you feel that your employer takes mental health as seriously as physical health?': 'mental_vs_physical',
-        'have you heard of or observed negative consequences for coworkers with mental health conditions in your workplace?': 'obs_consequence',
-        'any additional notes or comments?': 'comments'
-    }
-
-    # Apply renaming
-    df_2025 = df_2025.rename(columns=rename_map)
-
-    # Convert timestamp
-    if 'timestamp' in df_2025.columns:
-        df_2025['timestamp'] = pd.to_datetime(df_2025['timestamp'], errors='coerce', dayfirst=True)
-
-    # Clean age
-    if 'age' in df_2025.columns:
-        df_2025['age'] = pd.to_numeric(df_2025['age'], errors='coerce')
-        df_2025['age'] = df_2025['age'].apply(lambda x: x if 18 <= x <= 100 else np.nan)
-        df_2025['age'] = df_2025['age'].fillna(df_2025['age'].median())
-    
-    # Clean gender
-    if 'gender' in df_2025.columns:
-        def clean_gender(g):
-            if pd.isna(g):
-                return 'other'
-                
-            g = str(g).strip().lower()
-            male_keywords = ['male', 'm', 'man', 'cis male', 'trans male', 
-                            'trans man', 'male (cis)', 'cis man', 'make', 'mail', 'malr']
-            female_keywords = ['female', 'f', 'woman', 'cis female', 'trans female', 
-                             'trans woman', 'female (cis)', 'cis woman', 'female (trans)']
-
-            if any(k in g for k in male_keywords):
-                return 'male'
-            elif any(k in g for k in female_keywords):
-                return 'female'
-            return 'other'
-
-        df_2025['gender'] = df_2025['gender'].apply(clean_gender)
-    else:
-        print("Warning: No gender column found after normalization and renaming")
-        print("Available columns:", df_2025.columns.tolist())
-
-    return df_2025
-
-# Step 3: Data Transformation Functions
-def transform_surveys(df_2014, df_2016, df_2025):
-    """Transform and align survey data from 2014, 2016, and 2025"""
-
-    # --- Standardize Country Names ---
-    country_mapping = {
-        'United States': 'USA',
-        'United States of America': 'USA',
-        'US': 'USA',
-        'UK': 'UK',
-        'United Kingdom': 'UK',
-        'CA': 'Canada',
-        'DE': 'Germany'
-    }
-
-    df_2014['country'] = df_2014['country'].replace(country_mapping)
-    df_2016['country'] = df_2016['country'].replace(country_mapping)
-    df_2025['country'] = df_2025['country'].replace(country_mapping)
-
-    # --- Standardize Gender Columns ---
-    def clean_gender(gender):
-        if pd.isna(gender):
-            return 'Other'
-            
-        gender = str(gender).strip().lower()
-        
-        # Female variations
-        if any(x in gender for x in ['female', 'f', 'woman', 'fem', 'cis female', 'mtf', 'm2f']):
-            return 'Female'
-            
-        # Male variations
-        elif any(x in gender for x in ['male', 'm', 'man', 'cis male', 'ftm', 'f2m']):
-            return 'Male'
-            
-        # Non-binary/other
-        else:
-            return 'Other'
-
-    df_2014['gender'] = df_2014['gender'].apply(clean_gender)
-    df_2016['gender'] = df_2016['gender'].apply(clean_gender)
-    df_2025['gender'] = df_2025['gender'].apply(clean_gender)
-
-    # --- Map work_interfere to numeric scale (2014 and 2025 only) ---
-    interfere_map = {
-        'Never': 0,
-        'Rarely': 1,
-        'Sometimes': 2,
-        'Often': 3,
-        'Unknown': 1
-    }
-
-    df_2014['mh_impact_score'] = df_2014['work_interfere'].map(interfere_map)
-    df_2025['mh_impact_score'] = df_2025['work_interfere'].map(interfere_map)
-
-    # --- Create has_benefits flag for 2016 survey ---
-    benefits_map = {
-        'Yes': 1,
-        'No': 0,
-        'I don\'t know': 0,
-        'Not eligible for coverage / N/A': 0
-    }
-    
-    if 'benefits' in df_2016.columns:
-        df_2016['benefits'] = df_2016['benefits'].map(benefits_map).fillna(0)
-
-    return df_2014, df_2016, df_2025
-# Step 4: Data Integration Function
-def merge_all_surveys(df_2014, df_2016, df_2025):
-    """
-    Merge all three survey datasets while keeping all columns from each survey.
-    Non-matching columns will be filled with NaN values.
-    
-    Args:
-        df_2014: 2014 survey DataFrame (reference schema)
-        df_2016: 2016 survey DataFrame
-        df_2025: 2025 survey DataFrame
-        
-    Returns:
-        Merged DataFrame with all columns preserved
-    """
-
-    # Add year identifiers
-    df_2014['survey_year'] = 2014
-    df_2016['survey_year'] = 2016
-    df_2025['survey_year'] = 2025
-
-    # Get all unique columns from all surveys
-    all_columns = set(df_2014.columns) | set(df_2016.columns) | set(df_2025.columns)
-    
-    # Create DataFrames with all possible columns for each survey
-    def expand_df(df, all_cols):
-        missing_cols = [col for col in all_cols if col not in df.columns]
-        for col in missing_cols:
-            df[col] = np.nan
-        return df
-
-    # Expand each DataFrame to include all columns
-    df_2014_expanded = expand_df(df_2014, all_columns)
-    df_2016_expanded = expand_df(df_2016, all_columns)
-    df_2025_expanded = expand_df(df_2025, all_columns)
-
-    # Concatenate all surveys
-    merged_df = pd.concat(
-        [df_2014_expanded, df_2016_expanded, df_2025_expanded],
-        axis=0,
-        ignore_index=True
-    )
-
-    return merged_df   
-
-'''# Step 5: Data Quality Validation
-def validate_data(df):
-    """Validate data quality"""
-    results = {}
-
-    # Check for missing values
-    results['missing_values'] = df.isnull().sum()[df.isnull().sum() > 0].to_dict()
-
-    # Check age ranges
-    results['invalid_ages'] = {
-        '2014': df[~df['2014_age'].between(18, 70)].shape[0],
-        '2016': df[~df['2016_age'].between(18, 70)].shape[0]
-    }
-
-    # Check benefit coverage rates
-    results['invalid_benefit_rates'] = df[
-        ~df['2016_has_benefits'].between(0, 1, inclusive='both')
-    ].shape[0]
-
-    return results
-'''
-
-
-def clean_final_df(final_df):
-    fill_values = {
-        'gender': 'other',  # GENDER_CLEANED
-        'self_employed': 'Unknown',
-        'family_history': 'No',
-        'treatment': 0,
-        'work_interfere': 'Unknown',
-        'no_employees': '1-5',
-        'remote_work': 'No',
-        'tech_company': 'No',
-        'benefits': "Don't know",
-        'care_options': 'Not sure',
-        'wellness_program': "Don't know",
-        'seek_help': "Don't know",
-        'anonymity': "Don't know",
-        'leave': "Don't know",
-        'state':'unknown',
-        'mental_health_consequence': 'Maybe',
-        'phys_health_consequence': 'Maybe',
-        'coworkers': 'Some of them',
-        'supervisor': 'Some of them',
-        'mental_health_interview': 'Maybe',
-        'phys_health_interview': 'Maybe',
-        'mental_vs_physical': "Don't know",
-        'obs_consequence': 'No'
-    }
-    
-    for column, value in fill_values.items():
-        if column in final_df.columns:
-            final_df[column].fillna(value, inplace=True)
-    columns_to_drop = [
-      'share_with_family', 'diagnosed_condition', 'client_impact', 'prev_wellness_program',
-      'coworker_perception', 'mental_health_interview_why', 'professional_diagnosis_details',
-      'suspected_condition', 'work_country',
-      'prev_phys_health_consequence', 'do you work remotely (outside of an office) at least 50% ?',
-      'professional_diagnosis', 'bad_response_experience', 'past_disorder',
-      'do_you_have_medical_coverage_(private_insurance_or_state-provided)_which_includes_treatment_of_ mental_health_issues',
-      'tech_role', 'observation_impact', 'productivity_percentage', 'prev_supervisor',
-      'previous_employers', 'prev_seek_help', 'work_state', 'prev_care_options',
-      'coworker_impact', 'prev_coworkers', 'productivity_affected', 'untreated_interference',
-      'current_disorder', 'prev_benefits', 'prev_mental_health_consequence', 'know_resources',
-      'prev_mental_vs_physical', 'treated_interference', 'reveal_to_coworkers', 'reveal_to_clients',
-      'position', 'prev_anonymity', 'prev_obs_consequence', 'why_or_why_not.1', 'career_impact','do_you_have_medical_coverage_(private_insurance_or_state-provided)_which_includes_treatment_of_ mental_health_issues'
-       ]
-
-    final_df.drop(columns=[col for col in columns_to_drop if col in final_df.columns], inplace=True)
-    
-    return final_df
-
-# Step 6: Save Outputs
-def save_outputs(final_df, df_2025, df_2014, df_2016, output_dir='.', prefix=''):
-    """
-    Sauvegarde les jeux de données nettoyés et intégrés, ainsi que les métadonnées de traitement.
-
-    Args:
-        final_df (pd.DataFrame): Jeu de données final combiné.
-        df_oecd (pd.DataFrame): Données OCDE nettoyées.
-        df_2014 (pd.DataFrame): Données d’enquête 2014 nettoyées.
-        df_2016 (pd.DataFrame): Données d’enquête 2016 nettoyées.
-        validation_results (dict): Résultats de validation ou d’évaluation des données.
-        output_dir (str): Répertoire de sortie (par défaut: '.').
-        prefix (str): Préfixe facultatif pour tous les noms de fichiers.
-    """
-    """Save processed data and metadata"""
-    # Create directories if they don't exist
-    os.makedirs(DATA_PROCESSED_PATH, exist_ok=True)
-    os.makedirs(OUTPUTS_PATH, exist_ok=True)
-    # Sauvegarde des datasets CSV
-    final_df.to_csv(os.path.join(OUTPUTS_PATH, f'{prefix}integrated.csv'), index=False)
-    df_2025.to_csv(os.path.join(DATA_PROCESSED_PATH, f'{prefix}cleaned_survey_2025.csv'), index=False)
-    df_2014.to_csv(os.path.join(DATA_PROCESSED_PATH, f'{prefix}cleaned_survey_2014.csv'), index=False)
-    df_2016.to_csv(os.path.join(DATA_PROCESSED_PATH, f'{prefix}cleaned_survey_2016.csv'), index=False)
-
-    # Sauvegarde des métadonnées
-    metadata = {
-        'created_date': pd.Timestamp.now().isoformat(),
-        'data_sources': [
-            'Mental Health Survey 2025',
-            'Mental Health Survey 2014',
-            'Mental Health Survey 2016'
-        ],
-        'processing_steps': [
-            'Column standardization',
-            'Missing value imputation',
-            'Data type conversion',
-            'Feature engineering',
-            'Country-level aggregation'
-        ]
-    }
-
-    with open(f'{output_dir}/{prefix}metadata.json', 'w') as f:
-        json.dump(metadata, f, indent=4)
-
-    print(f" Data and metadata saved to directory: {output_dir}")
-
-# Main ETL Pipeline
-def run_etl():
-    """
-    Execute the complete ETL pipeline:
-    1. Load raw data
-    2. Clean and transform each dataset
-    3. Integrate data
-    4. Validate data quality
-    5. Save results
-    """
-    print("=== Starting ETL Pipeline ===")
-
-    # Step 1: Data Loading
-    print("Loading datasets...")
-    df_survey, df_2014, df_2016 = load_datasets()
-
-    # Step 2: Data Cleaning
-    print("Cleaning 2025 survey data...")
-    df_2025 = clean_survey_2025(df_survey)
-
-    print("Cleaning 2014 survey data...")
-    df_2014 = clean_survey_2014(df_2014)
-
-    print("Cleaning 2016 survey data...")
-    df_2016 = clean_survey_2016(df_2016)
-
-    # Step 3: Data Transformation
-
-    print("Transforming survey data...")
-    df_2014, df_2016, df_2025 = transform_surveys(df_2014, df_2016, df_2025)
-
-    # Step 4: Data Integration
-    print("Merging datasets...")
-    final_df = merge_all_surveys(df_2014, df_2016, df_2025)
-    final_df=clean_final_df(final_df)
-    '''# Additional cleaning
-    final_df = clean_data(final_df)
-
-    # Step 5: Data Validation
-    print("Validating data quality...")
-    validation_results = validate_data(final_df)
-'''
-    # Step 6: Save Results
-    print("Saving results...")
-    save_outputs(
-        final_df,
-        df_2025,
-        df_2014,
-        df_2016,
-        prefix='final_'
-    )
-
-    print("=== ETL Pipeline completed successfully ===")
-    return final_df
-if __name__ == "__main__":
-    final_data = run_etl()
-
-    # Display results
-    print("\nFinal data preview:")
-    print(final_data.head())
-'''
-    print("\nValidation results:")
-    for check, result in validation.items():
-        print(f"{check}: {result}")'''
\ No newline at end of file
+"""
+ETL Pipeline for Mental Health and OECD Data Integration
+
+This script performs:
+1. Data loading from multiple sources
+2. Data cleaning and standardization
+3. Data transformation and feature engineering
+4. Data integration
+5. Data quality validation
+6. Saving processed data
+"""
+
+# Step 0: Install & Import
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import numpy as np
+import json
+
+import canonical
+import config
+import normalize
+from bitmap_index import BitmapIndex
+from cache import StageCache, file_digest, frame_digest, source_digest
+from canonical import (BENEFITS_2016_SCORES, COUNTRY_ISO_CODES, INTERFERE_SCORES, VOCABULARIES, CanonicalIndex,
+                       unseen_values)
+from columnar import write_columnar
+from config import FORM_TIMESTAMP_FORMAT, MISSING_CATEGORY_THRESHOLD
+from cube import build_cube, load_cube, merge_cubes, save_cube
+from impute import impute_knn
+from instrument import StageMetrics
+from normalize import (SURVEY_GENDER_RULES, TRANSFORM_GENDER_RULES, normalize_gender, clean_age,
+                       age_value_counts, median_from_counts, map_distinct)
+from schema import apply_dtype_plan, memory_report
+from surveys import OSMI_ADAPTER, OSMI_COLUMN_MAPPING, SurveyAdapter, SurveyRegistry
+from validation import EXPECTED_ROWS, DataValidator, validate_data
+from writers import find_output, write_output
+
+# Configuration (see config.py; the CLI can point them elsewhere)
+DATA_RAW_PATH = config.DATA_RAW_PATH
+DATA_PROCESSED_PATH = config.DATA_PROCESSED_PATH
+OUTPUTS_PATH = config.OUTPUTS_PATH
+CACHE_PATH = config.CACHE_PATH
+
+
+GOOGLE_FORM_CSV_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vR3vkqIO5V9IO3ap6X7RSPVScbBp8J02ZnOKRu3vnrvQOha_9pKEJ7_bUilHiB3hgrJ1UWUZGZNR_CS/pub?gid=1966309919&single=true&output=csv"
+
+
+class CsvFormSource:
+    """
+    Google Form responses published as CSV.
+
+    The pipeline only calls fetch(), so any object with that method can be
+    injected instead, e.g. CsvFormSource('responses.csv') for a local export.
+    """
+
+    def __init__(self, location=GOOGLE_FORM_CSV_URL):
+        self.location = location
+
+    def fetch(self, **read_kwargs):
+        return pd.read_csv(self.location, **read_kwargs)
+
+
+def load_google_form_survey(csv_url=GOOGLE_FORM_CSV_URL, **read_kwargs):
+    print("Loading survey responses from Google Sheets CSV URL...")
+    df_survey = CsvFormSource(csv_url).fetch(**read_kwargs)
+    return df_survey
+
+def fetch_form_responses(form_source=None):
+    """Raw form responses from form_source (default: the published Google Sheet)"""
+    if form_source is None:
+        return load_google_form_survey()
+    return form_source.fetch()
+
+# Step 1: Data Loading Functions
+def read_raw_survey(survey_year, usecols=None):
+    """Read a raw survey file from data/raw, parsing only the usecols columns if given"""
+    return pd.read_csv(os.path.join(DATA_RAW_PATH, f'survey_{survey_year}.csv'), usecols=usecols)
+
+def load_datasets(form_source=None, prune_columns=False):
+    """
+    Load raw datasets from data/raw directory and the form responses from form_source.
+    With prune_columns, only the columns that reach the integrated output are kept (see surviving_columns).
+    """
+    df_survey = fetch_form_responses(form_source)
+    usecols = {}
+    if prune_columns:
+        df_survey, usecols = prune_form_responses(df_survey)
+    df_2014 = read_raw_survey(2014, usecols.get(2014))
+    df_2016 = read_raw_survey(2016, usecols.get(2016))
+    return df_survey, df_2014, df_2016
+
+# Step 2: Data Cleaning Functions
+
+def clean_survey_2014(df_2014, age_median=None):
+    """Clean 2014 mental health survey data"""
+    
+    # Standardize column names
+    df_2014.columns = df_2014.columns.str.lower()
+
+    # Handle missing values
+    df_2014['state'].fillna('Unknown', inplace=True)
+    df_2014['self_employed'].fillna('Unknown', inplace=True)
+    df_2014['work_interfere'].fillna('Unknown', inplace=True)
+    df_2014['comments'].fillna('No comments', inplace=True)
+
+    # Convert timestamp to datetime
+    df_2014['timestamp'] = pd.to_datetime(df_2014['timestamp'])
+
+    # Clean age column (filter outliers and replace with median)
+    df_2014['age'] = clean_age(df_2014['age'], median=age_median)
+
+    # Clean gender column
+    df_2014['gender'] = normalize_gender(df_2014['gender'], SURVEY_GENDER_RULES, default='other')
+
+    return df_2014
+
+def normalize_2016_columns(columns):
+    """Snake-case the 2016 question headers (lowercase, no '?', '/' and spaces as '_')"""
+    return columns.str.lower().str.replace(' ', '_').str.replace('?', '', regex=False).str.replace('/', '_')
+
+def clean_survey_2016(df_2016, null_columns=None, age_median=None):
+    """
+    Clean 2016 mental health survey data
+
+    Args:
+        df_2016 (pd.DataFrame): Raw 2016 survey.
+        null_columns (list): Columns to fill with 'Not specified'. Defaults to the
+            columns of df_2016 with more than MISSING_CATEGORY_THRESHOLD missing values.
+        age_median (float): Fill value for invalid ages. Defaults to the median of df_2016.
+    """
+    # Standardize column names
+    df_2016.columns = normalize_2016_columns(df_2016.columns)
+
+    # Handle missing values for key columns
+    df_2016['how_many_employees_does_your_company_or_organization_have'].fillna('Unknown', inplace=True)
+    df_2016['is_your_employer_primarily_a_tech_company_organization'].fillna('Unknown', inplace=True)
+
+    # For columns with many missing values, consider creating a "missing" category
+    if null_columns is None:
+        null_columns = [col for col in df_2016.columns if df_2016[col].isnull().mean() > MISSING_CATEGORY_THRESHOLD]
+    for col in null_columns:
+        df_2016[col].fillna('Not specified', inplace=True)
+
+    # Clean age column
+    df_2016['what_is_your_age'] = clean_age(df_2016['what_is_your_age'], median=age_median)
+
+
+    # Apply the column name mapping (the 2016 questions, see surveys.OSMI_COLUMN_MAPPING)
+    df_2016 = df_2016.rename(columns={k.lower().replace(' ', '_').replace('?', '').replace('/', '_'): v for k, v in OSMI_COLUMN_MAPPING.items()})
+
+
+    return df_2016
+
+def parse_form_timestamps(series):
+    """Parse the form's day-first 'Horodateur' timestamps (invalid values become NaT)"""
+    return pd.to_datetime(series, errors='coerce', format=FORM_TIMESTAMP_FORMAT)
+
+def form_column(df_survey, *names):
+    """Raw form column whose stripped, lowercased header is one of names (None if absent)"""
+    for column in df_survey.columns:
+        if column.strip().lower() in names:
+            return column
+    return None
+
+def clean_survey_2025(df_survey, age_median=None):
+    """Clean 2025 mental health survey data to align with 2014 schema"""
+    
+    # Create copy to avoid SettingWithCopyWarning
+    df_2025 = df_survey.copy()
+
+    # First normalize all column names to lowercase for consistent handling
+    df_2025.columns = [col.strip().lower() for col in df_2025.columns]
+    
+    # Rename mapping with lowercase keys to match normalized columns
+    rename_map = {
+        'horodateur': 'timestamp',
+        'age': 'age',
+        'gender': 'gender',
+        'country': 'country',
+        'are you self-employed?': 'self_employed',
+        'do you have a family history of mental illness?': 'family_history',
+        'have you sought treatment for a mental health condition?': 'treatment',
+        'if you have a mental health condition, do you feel that it interferes with your work?': 'work_interfere',
+        'do you work remotely (outside of an office) at least 50% of the time?': 'remote_work',
+        'is your employer primarily a tech company/organization?': 'tech_company',
+        'does your employer provide mental health benefits?': 'benefits',
+        'do you know the options for mental health care your employer provides?': 'care_options',
+        'has your employer ever discussed mental health as part of an employee wellness program?': 'wellness_program',
+        'does your employer provide resources to learn more about mental health issues and how to seek help?': 'seek_help',
+        'is your anonymity protected if you choose to take advantage of mental health or substance abuse treatment resources?': 'anonymity',
+        'how easy is it for you to take medical leave for a mental health condition?': 'leave',
+        'do you think that discussing a mental health issue with your employer would have negative consequences?': 'mental_health_consequence',
+        'do you think that discussing a physical health issue with your employer would have negative consequences?': 'phys_health_consequence',
+        'would you be willing to discuss a mental health issue with your coworkers?': 'coworkers',
+        'would you be willing to discuss a mental health issue with your supervisors?': 'supervisor',
+        'would you bring up a mental health issue with a potential employer in an interview?': 'mental_health_interview',
+        'would you bring up a physical health issue with a potential employer in an interview?': 'phys_health_interview',
+        'do you feel that your employer takes mental health as seriously as physical health?': 'mental_vs_physical',
+        'have you heard of or observed negative consequences for coworkers with mental health conditions in your workplace?': 'obs_consequence',
+        'any additional notes or comments?': 'comments'
+    }
+
+    # Apply renaming
+    df_2025 = df_2025.rename(columns=rename_map)
+
+    # Convert timestamp
+    if 'timestamp' in df_2025.columns:
+        df_2025['timestamp'] = parse_form_timestamps(df_2025['timestamp'])
+
+    # Clean age
+    if 'age' in df_2025.columns:
+        df_2025['age'] = clean_age(df_2025['age'], median=age_median)
+    
+    # Clean gender
+    if 'gender' in df_2025.columns:
+        df_2025['gender'] = normalize_gender(df_2025['gender'], SURVEY_GENDER_RULES, default='other', na_label='other')
+    else:
+        print("Warning: No gender column found after normalization and renaming")
+        print("Available columns:", df_2025.columns.tolist())
+
+    return df_2025
+
+# Schema adapter of each survey year (see surveys.py): the surveys of every run keep their clean
+# functions (their declared steps are the ones the lazy engine runs), the later OSMI years are read
+# with the 2016 question mapping (run_etl(discover_surveys=True))
+SURVEYS = SurveyRegistry([
+    SurveyAdapter([2014], clean=clean_survey_2014, profile_columns=lambda columns: columns.str.lower(),
+                  fill_values={'state': 'Unknown', 'self_employed': 'Unknown', 'work_interfere': 'Unknown',
+                               'comments': 'No comments'},
+                  survey_gender=True, interference_scores=True),
+    SurveyAdapter([2016], clean=clean_survey_2016, profile_columns=normalize_2016_columns,
+                  age_column='what_is_your_age', fill_values={'no_employees': 'Unknown', 'tech_company': 'Unknown'},
+                  missing_category=True, benefit_scores=True),
+    SurveyAdapter([2025], clean=clean_survey_2025, profile_columns=lambda columns: columns.str.strip().str.lower(),
+                  dayfirst=True, timestamp_format=FORM_TIMESTAMP_FORMAT, survey_gender=True,
+                  interference_scores=True, filename=None),
+    OSMI_ADAPTER
+])
+# Clean function of each survey, and the column normalization and age column it applies
+SURVEY_CLEANERS = {survey_year: SURVEYS.adapter(survey_year).clean_function for survey_year in (2014, 2016, 2025)}
+SURVEY_PROFILE_COLUMNS = {
+    survey_year: (SURVEYS.adapter(survey_year).profile_columns, SURVEYS.adapter(survey_year).age_column)
+    for survey_year in SURVEY_CLEANERS
+}
+
+# Step 3: Data Transformation Functions
+def transform_survey(df, survey_year, canonical_index=None):
+    """
+    Standardize countries and gender and encode answers of one cleaned survey.
+
+    Country names and the work_interfere/benefits answers are mapped to their
+    canonical spelling with canonical_index (default: a fresh CanonicalIndex).
+    """
+    canonical_index = canonical_index or CanonicalIndex()
+    adapter = SURVEYS.adapter(survey_year)
+
+    # --- Canonical Country Names and Answer Spellings ---
+    for column in VOCABULARIES:
+        if column in df.columns:
+            df[column] = canonical_index.canonicalize(df[column], column)
+
+    # --- Standardize Gender Columns ---
+    df['gender'] = normalize_gender(df['gender'], TRANSFORM_GENDER_RULES, default='Other', na_label='Other')
+
+    # --- Map work_interfere to numeric scale (2014 and 2025) ---
+    # Scores are kept as float so every chunk of a streamed survey gets the same dtype
+    if adapter.interference_scores:
+        df['mh_impact_score'] = df['work_interfere'].map(INTERFERE_SCORES).astype(float)
+
+    # --- Create has_benefits flag (2016 and later OSMI surveys) ---
+    if adapter.benefit_scores and 'benefits' in df.columns:
+        df['benefits'] = df['benefits'].map(BENEFITS_2016_SCORES).fillna(0).astype(float)
+
+    return df
+
+def transform_surveys(df_2014, df_2016, df_2025, canonical_index=None):
+    """Transform and align survey data from 2014, 2016, and 2025"""
+    df_2014 = transform_survey(df_2014, 2014, canonical_index)
+    df_2016 = transform_survey(df_2016, 2016, canonical_index)
+    df_2025 = transform_survey(df_2025, 2025, canonical_index)
+    return df_2014, df_2016, df_2025
+# Step 4: Data Integration Function
+def merge_surveys(surveys):
+    """
+    Merge any number of surveys while keeping all columns from each survey.
+    Non-matching columns will be filled with NaN values.
+
+    The union schema (columns in order of appearance, survey_year after the
+    columns of the first survey) is built by a single concat, without
+    expanding or otherwise modifying the input DataFrames, so the cost is
+    linear in the total number of rows and columns.
+
+    Args:
+        surveys (dict): survey_year -> survey DataFrame, in merge order.
+
+    Returns:
+        Merged DataFrame with all columns preserved
+    """
+    frames = list(surveys.values())
+
+    # Concatenate all surveys: concat aligns every frame on the union of the columns
+    merged_df = pd.concat(frames, axis=0, ignore_index=True, sort=False)
+
+    # Add year identifiers
+    survey_year = np.repeat(list(surveys), [len(df) for df in frames])
+    if 'survey_year' in merged_df.columns:
+        merged_df['survey_year'] = survey_year
+    else:
+        merged_df.insert(len(frames[0].columns), 'survey_year', survey_year)
+
+    return merged_df
+
+def merge_all_surveys(df_2014, df_2016, df_2025):
+    """
+    Merge the three survey datasets (2014 reference schema) with merge_surveys.
+
+    Args:
+        df_2014: 2014 survey DataFrame (reference schema)
+        df_2016: 2016 survey DataFrame
+        df_2025: 2025 survey DataFrame
+
+    Returns:
+        Merged DataFrame with all columns preserved
+    """
+    return merge_surveys({2014: df_2014, 2016: df_2016, 2025: df_2025})
+
+# Fill values of the answers still missing after the merge, and the columns dropped (see clean_final_df)
+FINAL_FILL_VALUES = {
+    'gender': 'other',  # GENDER_CLEANED
+    'self_employed': 'Unknown',
+    'family_history': 'No',
+    'treatment': 0,
+    'work_interfere': 'Unknown',
+    'no_employees': '1-5',
+    'remote_work': 'No',
+    'tech_company': 'No',
+    'benefits': "Don't know",
+    'care_options': 'Not sure',
+    'wellness_program': "Don't know",
+    'seek_help': "Don't know",
+    'anonymity': "Don't know",
+    'leave': "Don't know",
+    'state':'unknown',
+    'mental_health_consequence': 'Maybe',
+    'phys_health_consequence': 'Maybe',
+    'coworkers': 'Some of them',
+    'supervisor': 'Some of them',
+    'mental_health_interview': 'Maybe',
+    'phys_health_interview': 'Maybe',
+    'mental_vs_physical': "Don't know",
+    'obs_consequence': 'No'
+}
+
+FINAL_DROPPED_COLUMNS = [
+  'share_with_family', 'diagnosed_condition', 'client_impact', 'prev_wellness_program',
+  'coworker_perception', 'mental_health_interview_why', 'professional_diagnosis_details',
+  'suspected_condition', 'work_country',
+  'prev_phys_health_consequence', 'do you work remotely (outside of an office) at least 50% ?',
+  'professional_diagnosis', 'bad_response_experience', 'past_disorder',
+  'do_you_have_medical_coverage_(private_insurance_or_state-provided)_which_includes_treatment_of_ mental_health_issues',
+  'tech_role', 'observation_impact', 'productivity_percentage', 'prev_supervisor',
+  'previous_employers', 'prev_seek_help', 'work_state', 'prev_care_options',
+  'coworker_impact', 'prev_coworkers', 'productivity_affected', 'untreated_interference',
+  'current_disorder', 'prev_benefits', 'prev_mental_health_consequence', 'know_resources',
+  'prev_mental_vs_physical', 'treated_interference', 'reveal_to_coworkers', 'reveal_to_clients',
+  'position', 'prev_anonymity', 'prev_obs_consequence', 'why_or_why_not.1', 'career_impact','do_you_have_medical_coverage_(private_insurance_or_state-provided)_which_includes_treatment_of_ mental_health_issues'
+]
+
+def clean_final_df(final_df):
+    
+    for column, value in FINAL_FILL_VALUES.items():
+        if column in final_df.columns:
+            final_df[column].fillna(value, inplace=True)
+
+    final_df.drop(columns=[col for col in FINAL_DROPPED_COLUMNS if col in final_df.columns], inplace=True)
+    
+    return final_df
+
+# OECD indicators: wide country feature table joined on the survey rows
+OECD_COLUMN_MAPPING = {
+    'STRUCTURE': 'structure_type',
+    'STRUCTURE_ID': 'structure_identifier',
+    'STRUCTURE_NAME': 'structure_name',
+    'ACTION': 'action_type',
+    'LOCATION': 'location_code',
+    'Country': 'country_name',
+    'INDICATOR': 'indicator_code',
+    'Indicator': 'indicator_name',
+    'MEASURE': 'measure_code',
+    'Measure': 'measure_name',
+    'INEQUALITY': 'inequality',
+    'OBS_VALUE': 'observed_value',
+    'OBS_STATUS': 'status',
+    'UNIT_MEASURE': 'unit_of_measurement',
+    'Unit of Measures': 'unit_of_measurement_full',
+    'UNIT_MULT': 'multiplier',
+    'Multiplier': 'multiplier_name'
+}
+
+def load_oecd():
+    """Load the long-format OECD Better Life Index export from data/raw"""
+    return pd.read_csv(os.path.join(DATA_RAW_PATH, 'oecd_2024.csv'))
+
+def clean_oecd(df_oecd):
+    """Drop the empty columns and duplicate rows of the OECD export and rename its columns"""
+    df_oecd = df_oecd.dropna(axis=1, how='all').drop_duplicates()
+    return df_oecd.rename(columns=OECD_COLUMN_MAPPING)
+
+def transform_oecd(df_oecd):
+    """
+    Pivot the cleaned OECD data to one row per country and one standardized feature per indicator.
+
+    Only the total population values (inequality 'TOT') are kept, and the
+    OECD-wide aggregate is dropped. Missing indicators stay NaN.
+
+    Returns:
+        pd.DataFrame: Features indexed by location_code, columns oecd_<indicator code>.
+    """
+    totals = df_oecd[(df_oecd['inequality'] == 'TOT') & (df_oecd['location_code'] != 'OECD')]
+    features = totals.pivot(index='location_code', columns='indicator_code', values='observed_value')
+    features.columns = 'oecd_' + features.columns.str.lower()
+    features.columns.name = None
+
+    # Imported here so that importing the pipeline does not pay for sklearn
+    from sklearn.preprocessing import StandardScaler
+
+    # StandardScaler ignores NaN when fitting and keeps them when transforming
+    scaled = StandardScaler().fit_transform(features)
+    return pd.DataFrame(scaled, index=features.index, columns=features.columns)
+
+def join_oecd_features(final_df, oecd_features, country_codes=COUNTRY_ISO_CODES):
+    """
+    Add the country_code of each survey row and the OECD features of that country.
+
+    The canonical country names are resolved to their ISO code (the OECD
+    location code) once per distinct value, and the features are attached
+    with a single hash join on the country_code index, so the cost stays
+    linear in the number of survey rows. Rows from countries outside the
+    OECD data get NaN features.
+    """
+    codes = map_distinct(final_df['country'], lambda uniques: uniques.map(country_codes))
+    return final_df.assign(country_code=codes).join(oecd_features, on='country_code')
+
+# Column names of the OECD indicators in final_mental_health_oecd_integrated (the others keep their code)
+OECD_INDICATOR_NAMES = {
+    'CG_SENG': 'Gender_Equality_in_STEM',
+    'CG_VOTO': 'Women_Voter_Turnout',
+    'EQ_AIRP': 'Air_Pollution_Index',
+    'EQ_WATER': 'Water_Quality_Index',
+    'ES_EDUA': 'Adult_Education_Level',
+    'ES_EDUEX': 'Public_Education_Expenditure',
+    'ES_STCS': 'Student_Performance_Score',
+    'HO_BASE': 'Access_to_Basic_Housing',
+    'HO_HISH': 'High_Housing_Cost_Burden',
+    'HO_NUMR': 'Average_Number_of_Rooms',
+    'HS_LEB': 'Life_Expectancy',
+    'HS_SFRH': 'Self_Reported_Health',
+    'IW_HADI': 'Household_Disposable_Income',
+    'IW_HNFW': 'Net_Financial_Wealth',
+    'JE_EMPL': 'Employment_Rate',
+    'JE_LMIS': 'Job_Market_Insecurity',
+    'JE_LTUR': 'Long_Term_Unemployment_Rate',
+    'JE_PEARN': 'Average_Earnings'
+}
+
+def most_frequent(rows, column):
+    """Most frequent value of column for each country_code of rows"""
+    counts = rows.groupby(['country_code', column], observed=True).size().sort_values(ascending=False, kind='stable')
+    return counts.reset_index().drop_duplicates('country_code').set_index('country_code')[column]
+
+def oecd_country_table(oecd_integrated_df, oecd_features, df_oecd):
+    """
+    Country table of final_mental_health_oecd_integrated: the OECD indicators
+    and the survey answers aggregated by country, one row per OECD country.
+
+    Columns:
+        country_code, location_code: Upper-case OECD country name and location code.
+        <indicator name>: Standardized indicators (see transform_oecd and OECD_INDICATOR_NAMES).
+        composite_score: Mean of the standardized indicators.
+        <indicator code>_rank: Rank of the country on each indicator (1 = highest).
+        2014_treatment, 2014_mh_impact_score, 2014_age, 2014_gender: Share of
+            respondents who sought treatment, mean impact score, mean age and
+            most frequent gender of the 2014 rows.
+        2016_has_benefits, 2016_age, 2016_what_is_your_gender: Mean benefits
+            score, mean age and most frequent gender of the 2016 rows.
+        avg_age: Mean age of all the survey rows of the country.
+        benefit_coverage_change: 2016_has_benefits minus the share of 2014
+            respondents with benefits.
+
+    Args:
+        oecd_integrated_df (pd.DataFrame): Survey rows with their country_code (see join_oecd_features).
+        oecd_features (pd.DataFrame): Standardized indicators (see transform_oecd).
+        df_oecd (pd.DataFrame): Cleaned OECD data (country names).
+    """
+    indicators = oecd_features.set_axis(oecd_features.columns.str.removeprefix('oecd_').str.upper(), axis=1)
+    names = df_oecd.drop_duplicates('location_code').set_index('location_code')['country_name']
+    table = pd.DataFrame({'country_code': names.reindex(indicators.index).str.upper(),
+                          'location_code': indicators.index}, index=indicators.index)
+    table = table.join(indicators.rename(columns=OECD_INDICATOR_NAMES))
+    table['composite_score'] = indicators.mean(axis=1)
+    table = table.join(indicators.rank(ascending=False, method='min').add_suffix('_rank'))
+
+    # One groupby per aggregate over the survey rows
+    rows = oecd_integrated_df
+    rows_2014 = rows[rows['survey_year'] == 2014]
+    rows_2016 = rows[rows['survey_year'] == 2016]
+    countries_2014 = rows_2014.groupby('country_code')
+    countries_2016 = rows_2016.groupby('country_code')
+    benefits_2014 = rows_2014['benefits'].eq('Yes').groupby(rows_2014['country_code']).mean()
+    table['2014_treatment'] = rows_2014['treatment'].eq('Yes').groupby(rows_2014['country_code']).mean()
+    table['2014_mh_impact_score'] = countries_2014['mh_impact_score'].mean()
+    table['2014_age'] = countries_2014['age'].mean()
+    table['2014_gender'] = most_frequent(rows_2014, 'gender')
+    table['2016_has_benefits'] = pd.to_numeric(rows_2016['benefits'], errors='coerce').groupby(
+        rows_2016['country_code']).mean()
+    table['2016_age'] = countries_2016['age'].mean()
+    table['2016_what_is_your_gender'] = most_frequent(rows_2016, 'gender')
+    table['avg_age'] = rows.groupby('country_code')['age'].mean()
+    table['benefit_coverage_change'] = table['2016_has_benefits'] - benefits_2014
+    return table.reset_index(drop=True)
+
+def save_metadata(output_dir=None, prefix='', extra=None):
+    """
+    Write the processing metadata JSON (to OUTPUTS_PATH by default), with optional
+    extra run information (e.g. cache statistics)
+    """
+    output_dir = OUTPUTS_PATH if output_dir is None else output_dir
+    metadata = {
+        'created_date': pd.Timestamp.now().isoformat(),
+        'data_sources': [
+            'Mental Health Survey 2025',
+            'Mental Health Survey 2014',
+            'Mental Health Survey 2016'
+        ],
+        'processing_steps': [
+            'Column standardization',
+            'Missing value imputation',
+            'Data type conversion',
+            'Feature engineering',
+            'Country-level aggregation'
+        ]
+    }
+    metadata.update(extra or {})
+
+    with open(f'{output_dir}/{prefix}metadata.json', 'w') as f:
+        json.dump(metadata, f, indent=4)
+
+# Step 6: Save Outputs
+def save_outputs(final_df, df_2025, df_2014, df_2016, output_dir=None, prefix='', output_format='csv',
+                 metadata=None, df_oecd=None, oecd_integrated_df=None, dashboard_cube=None, surveys=None,
+                 oecd_country_df=None):
+    """
+    Sauvegarde les jeux de données nettoyés et intégrés, ainsi que les métadonnées de traitement.
+
+    Args:
+        final_df (pd.DataFrame): Jeu de données final combiné.
+        df_oecd (pd.DataFrame): Données OCDE nettoyées.
+        df_2014 (pd.DataFrame): Données d’enquête 2014 nettoyées.
+        df_2016 (pd.DataFrame): Données d’enquête 2016 nettoyées.
+        validation_results (dict): Résultats de validation ou d’évaluation des données.
+        output_dir (str): Répertoire des métadonnées (par défaut: OUTPUTS_PATH).
+        prefix (str): Préfixe facultatif pour tous les noms de fichiers.
+        output_format (str): Format des jeux de données: 'csv', 'parquet' ou 'feather'
+            (voir writers.OUTPUT_FORMATS).
+        metadata (dict): Informations d'exécution ajoutées au fichier de métadonnées.
+        oecd_integrated_df (pd.DataFrame): Jeu de données final enrichi des indicateurs OCDE, ligne
+            par ligne (integrated_oecd_features).
+        dashboard_cube (dict): Cube d'agrégats du tableau de bord (voir cube.build_cube),
+            écrit en JSON compact.
+        surveys (dict): Autres enquêtes nettoyées (année -> DataFrame), voir ingest_surveys.
+        oecd_country_df (pd.DataFrame): Indicateurs OCDE et réponses agrégées par pays
+            (mental_health_oecd_integrated, voir oecd_country_table).
+    """
+    """Save processed data and metadata"""
+    output_dir = OUTPUTS_PATH if output_dir is None else output_dir
+    # Create directories if they don't exist
+    os.makedirs(DATA_PROCESSED_PATH, exist_ok=True)
+    os.makedirs(OUTPUTS_PATH, exist_ok=True)
+    # Sauvegarde des datasets
+    write_output(final_df, os.path.join(OUTPUTS_PATH, f'{prefix}integrated'), output_format)
+    write_output(df_2025, os.path.join(DATA_PROCESSED_PATH, f'{prefix}cleaned_survey_2025'), output_format)
+    write_output(df_2014, os.path.join(DATA_PROCESSED_PATH, f'{prefix}cleaned_survey_2014'), output_format)
+    write_output(df_2016, os.path.join(DATA_PROCESSED_PATH, f'{prefix}cleaned_survey_2016'), output_format)
+    for survey_year, df in (surveys or {}).items():
+        write_output(df, os.path.join(DATA_PROCESSED_PATH, f'{prefix}cleaned_survey_{survey_year}'), output_format)
+    if df_oecd is not None:
+        write_output(df_oecd, os.path.join(DATA_PROCESSED_PATH, f'{prefix}cleaned_oecd_data'), output_format)
+    if oecd_integrated_df is not None:
+        write_output(oecd_integrated_df, os.path.join(OUTPUTS_PATH, f'{prefix}integrated_oecd_features'),
+                     output_format)
+    if oecd_country_df is not None:
+        write_output(oecd_country_df, os.path.join(OUTPUTS_PATH, f'{prefix}mental_health_oecd_integrated'),
+                     output_format)
+    if dashboard_cube is not None:
+        save_cube(dashboard_cube, os.path.join(OUTPUTS_PATH, f'{prefix}dashboard_cube.json'))
+
+    # Sauvegarde des métadonnées
+    save_metadata(output_dir, prefix, metadata)
+
+    print(f" Data and metadata saved to directory: {output_dir}")
+
+
+# Column pruning: only parse the raw columns that reach the integrated output
+def raw_survey_headers(form_columns):
+    """Raw column names of each survey; the 2014/2016 headers are read without parsing any row"""
+    return {
+        2014: pd.read_csv(os.path.join(DATA_RAW_PATH, 'survey_2014.csv'), nrows=0).columns,
+        2016: pd.read_csv(os.path.join(DATA_RAW_PATH, 'survey_2016.csv'), nrows=0).columns,
+        2025: pd.Index(form_columns)
+    }
+
+def clean_column_names(headers):
+    """
+    Cleaned name of each raw column of each survey.
+
+    The clean functions are run on empty frames with the raw headers; they
+    rename the columns in place without adding or removing any, so the
+    cleaned columns line up with the raw ones.
+
+    Args:
+        headers (dict): survey_year -> raw column names (see raw_survey_headers).
+
+    Returns:
+        dict: survey_year -> {raw column name: cleaned column name}, in file order.
+    """
+    raw_to_clean = {}
+    for survey_year, columns in headers.items():
+        df = SURVEY_CLEANERS[survey_year](pd.DataFrame(columns=columns))
+        if len(df.columns) != len(columns):
+            raise ValueError(f"Cleaning the {survey_year} survey changes its column count, cannot map its columns")
+        raw_to_clean[survey_year] = dict(zip(columns, df.columns))
+    return raw_to_clean
+
+def surviving_columns(headers):
+    """
+    Raw columns of each survey that are still present after clean_final_df.
+
+    The pipeline is run on empty frames with the raw headers (see
+    clean_column_names). Every column read by the clean/transform steps
+    (age, gender, country, work_interfere, ...) also reaches the output, so
+    dropping the others at load time leaves the integrated dataset unchanged.
+
+    Args:
+        headers (dict): survey_year -> raw column names (see raw_survey_headers).
+
+    Returns:
+        dict: survey_year -> list of raw column names to parse, in file order.
+    """
+    raw_to_clean = clean_column_names(headers)
+    transformed = {
+        survey_year: transform_survey(pd.DataFrame(columns=list(mapping.values())), survey_year)
+        for survey_year, mapping in raw_to_clean.items()
+    }
+    final_columns = set(clean_final_df(merge_all_surveys(transformed[2014], transformed[2016], transformed[2025])).columns)
+    return {
+        survey_year: [raw for raw, clean in mapping.items() if clean in final_columns]
+        for survey_year, mapping in raw_to_clean.items()
+    }
+
+def prune_form_responses(df_survey):
+    """Keep the surviving form columns; returns them with the raw columns to parse from every survey"""
+    usecols = surviving_columns(raw_survey_headers(df_survey.columns))
+    return df_survey[usecols[2025]], usecols
+
+# Streaming mode: process the surveys in bounded chunks
+def read_survey_chunks(read, chunksize, dtype=None):
+    """Iterate over a survey in DataFrames of at most chunksize rows (read takes pd.read_csv arguments)"""
+    return read(chunksize=chunksize, dtype=dtype)
+
+def merge_dtypes(left, right):
+    """dtype pandas infers for a column read as one block, given the dtypes inferred for two of its chunks"""
+    if left == right:
+        return left
+    if all(pd.api.types.is_numeric_dtype(t) and not pd.api.types.is_bool_dtype(t) for t in (left, right)):
+        return np.dtype('float64')
+    return np.dtype('object')
+
+def profile_survey(chunks, normalize_columns, age_column):
+    """
+    First streaming pass: collect the whole-file statistics the cleaning steps need.
+
+    Args:
+        chunks (iterable): Raw survey chunks.
+        normalize_columns (callable): Column name normalization of the matching clean function.
+        age_column (str): Age column after normalization.
+
+    Returns:
+        dict: rows, per-column null rate, histogram and median of the valid
+        ages and the raw columns parsed as float over the whole file (a chunk
+        without missing values would otherwise be parsed as int).
+    """
+    rows = 0
+    null_counts = pd.Series(dtype=float)
+    age_counts = pd.Series(dtype=float)
+    dtypes = {}
+    for chunk in chunks:
+        for column, dtype in chunk.dtypes.items():
+            dtypes[column] = merge_dtypes(dtypes.get(column, dtype), dtype)
+        chunk.columns = normalize_columns(chunk.columns)
+        rows += len(chunk)
+        null_counts = null_counts.add(chunk.isnull().sum(), fill_value=0)
+        if age_column in chunk.columns:
+            age_counts = age_counts.add(age_value_counts(chunk[age_column]), fill_value=0)
+
+    return {
+        'rows': rows,
+        'null_rate': null_counts / max(rows, 1),
+        'age_counts': age_counts,
+        'age_median': median_from_counts(age_counts),
+        'float_columns': [column for column, dtype in dtypes.items() if dtype == np.dtype('float64')]
+    }
+
+def streaming_sources(form_source, usecols=None):
+    """
+    (survey_year, reader, column normalization, age column, clean function) of each survey.
+    usecols (survey_year -> raw columns) restricts what the readers parse.
+    """
+    usecols = usecols or {}
+
+    def reader(read, survey_year):
+        return lambda **read_kwargs: read(usecols=usecols.get(survey_year), **read_kwargs)
+
+    def csv_reader(name):
+        path = os.path.join(DATA_RAW_PATH, name)
+        return lambda **read_kwargs: pd.read_csv(path, **read_kwargs)
+
+    readers = {
+        2014: reader(csv_reader('survey_2014.csv'), 2014),
+        2016: reader(csv_reader('survey_2016.csv'), 2016),
+        2025: reader(form_source.fetch, 2025)
+    }
+    return [
+        (survey_year, readers[survey_year], *SURVEY_PROFILE_COLUMNS[survey_year], clean)
+        for survey_year, clean in SURVEY_CLEANERS.items()
+    ]
+
+def cleaning_kwargs(survey_year, profile):
+    """Turn a survey profile into the keyword arguments of its clean function"""
+    kwargs = {'age_median': profile['age_median']}
+    if SURVEYS.adapter(survey_year).missing_category:
+        null_rate = profile['null_rate']
+        kwargs['null_columns'] = null_rate[null_rate > MISSING_CATEGORY_THRESHOLD].index.tolist()
+    return kwargs
+
+def run_etl_streaming(chunksize, form_source=None, prefix='final_', prune_columns=False):
+    """
+    Run the pipeline over the raw surveys in chunks of chunksize rows.
+
+    Pass 1 profiles each file (row count, null rates, age histogram) so the
+    median age fill and the 2016 null-column detection see the whole file.
+    Pass 2 cleans and transforms each chunk, aligns it to the integrated
+    schema and appends it to the output CSVs, so memory stays bounded by
+    the chunk size. The integrated output matches the in-memory pipeline,
+    and so does the dashboard cube, merged from the cubes of the chunks,
+    and the data quality results, from the value counts of the chunks (see
+    validation.DataValidator). The bitmap index and memory-mapped columns of
+    a previous full run are deleted (see remove_stale_outputs).
+
+    Args:
+        chunksize (int): Rows per chunk.
+        form_source: Source of the form responses (see CsvFormSource).
+        prefix (str): Output file name prefix.
+        prune_columns (bool): Only parse the raw columns that reach the
+            integrated output (see surviving_columns).
+
+    Returns:
+        str: Path of the integrated CSV.
+    """
+    os.makedirs(DATA_PROCESSED_PATH, exist_ok=True)
+    os.makedirs(OUTPUTS_PATH, exist_ok=True)
+    form_source = form_source or CsvFormSource()
+    usecols = None
+    if prune_columns:
+        usecols = surviving_columns(raw_survey_headers(form_source.fetch(nrows=0).columns))
+    sources = streaming_sources(form_source, usecols)
+    canonical_index = CanonicalIndex.load(canonical_index_path(prefix))
+
+    print("Profiling surveys...")
+    kwargs, read_dtypes, profiles = {}, {}, {}
+    for survey_year, read, normalize_columns, age_column, _ in sources:
+        profile = profile_survey(read_survey_chunks(read, chunksize), normalize_columns, age_column)
+        kwargs[survey_year] = cleaning_kwargs(survey_year, profile)
+        read_dtypes[survey_year] = dict.fromkeys(profile['float_columns'], 'float64')
+        profiles[survey_year] = profile
+
+    # The union schema only depends on the headers: run the pipeline on empty frames
+    empty = {
+        survey_year: transform_survey(clean(read(nrows=0), **kwargs[survey_year]), survey_year)
+        for survey_year, read, _, _, clean in sources
+    }
+    union_columns = merge_all_surveys(empty[2014], empty[2016], empty[2025]).columns
+
+    integrated_path = os.path.join(OUTPUTS_PATH, f'{prefix}integrated.csv')
+    first_integrated = True
+    watermark = pd.NaT
+    unseen = {}
+    dashboard_cube = None
+    validator = DataValidator()
+    for survey_year, read, _, _, clean in sources:
+        print(f"Streaming {survey_year} survey data...")
+        processed_path = os.path.join(DATA_PROCESSED_PATH, f'{prefix}cleaned_survey_{survey_year}.csv')
+        first_processed = True
+        for chunk in read_survey_chunks(read, chunksize, dtype=read_dtypes[survey_year]):
+            chunk = transform_survey(clean(chunk, **kwargs[survey_year]), survey_year, canonical_index)
+            if survey_year == 2025 and 'timestamp' in chunk.columns:
+                watermark = max_timestamp(watermark, chunk['timestamp'].max())
+            chunk.to_csv(processed_path, mode='w' if first_processed else 'a', header=first_processed, index=False)
+            first_processed = False
+            chunk['survey_year'] = survey_year
+
+            final_chunk = clean_final_df(chunk.reindex(columns=union_columns))
+            for column, values in unseen_values(final_chunk).items():
+                unseen[column] = sorted(set(unseen.get(column, [])) | set(values))
+            validator.update(final_chunk)
+            chunk_cube = build_cube(final_chunk)
+            dashboard_cube = chunk_cube if dashboard_cube is None else merge_cubes(dashboard_cube, chunk_cube)
+            final_chunk.to_csv(integrated_path, mode='w' if first_integrated else 'a', header=first_integrated,
+                               index=False)
+            first_integrated = False
+
+    if dashboard_cube is not None:
+        save_cube(dashboard_cube, os.path.join(OUTPUTS_PATH, f'{prefix}dashboard_cube.json'))
+    remove_stale_outputs(prefix)
+    save_form_state(watermark, profiles[2025]['age_counts'], prefix)
+    canonical_index.save(canonical_index_path(prefix))
+    report_unseen_values(unseen)
+    validation = validator.results()
+    report_validation(validation)
+    extra = {'unseen_values': unseen} if unseen else {}
+    save_metadata(prefix=prefix, extra={**extra, 'validation': validation})
+    return integrated_path
+
+
+# Cached mode: reuse cleaned/transformed surveys whose raw input and code did not change
+def load_cached_surveys(cache, df_survey, usecols=None, canonical_index=None):
+    """
+    Clean and transform the three surveys through a StageCache.
+
+    Stage keys combine the content hash of the raw input with a hash of the
+    code of the stage, so the frozen 2014/2016 files are only reprocessed when
+    the cleaning code changes. That code includes the survey's schema adapter
+    (see SurveyAdapter.version) and the 2016 question mapping. The 2025 form
+    export is hashed after download. A transform hit skips the clean stage
+    (and the CSV parse) entirely.
+
+    Args:
+        cache (StageCache): Stage cache.
+        df_survey (pd.DataFrame): Raw form responses.
+        usecols (dict): survey_year -> raw columns to parse (see
+            surviving_columns); part of the clean stage key.
+        canonical_index (CanonicalIndex): Index used by the transform stage.
+
+    Returns:
+        tuple: Transformed (df_2014, df_2016, df_2025).
+    """
+    usecols = usecols or {}
+    clean_version = cache.key(source_digest(normalize_2016_columns, parse_form_timestamps, normalize, config,
+                                            SurveyAdapter),
+                              json.dumps(OSMI_COLUMN_MAPPING, sort_keys=True))
+    transform_version = source_digest(transform_survey, normalize, canonical)
+
+    path_2014 = os.path.join(DATA_RAW_PATH, 'survey_2014.csv')
+    path_2016 = os.path.join(DATA_RAW_PATH, 'survey_2016.csv')
+    sources = [
+        (2014, file_digest(path_2014), lambda: read_raw_survey(2014, usecols.get(2014)), clean_survey_2014),
+        (2016, file_digest(path_2016), lambda: read_raw_survey(2016, usecols.get(2016)), clean_survey_2016),
+        (2025, frame_digest(df_survey), df_survey.copy, clean_survey_2025),
+    ]
+
+    transformed = []
+    for survey_year, digest, load, clean in sources:
+        clean_key = cache.key(digest, source_digest(clean), clean_version, SURVEYS.adapter(survey_year).version(),
+                              usecols.get(survey_year))
+        transform_key = cache.key(clean_key, transform_version)
+
+        def compute_transform(survey_year=survey_year, clean_key=clean_key, load=load, clean=clean):
+            cleaned = cache.get(f'clean_survey_{survey_year}', clean_key, lambda: clean(load()))
+            return transform_survey(cleaned, survey_year, canonical_index)
+
+        transformed.append(cache.get(f'transform_survey_{survey_year}', transform_key, compute_transform))
+    return tuple(transformed)
+
+# Canonical spellings learned across runs (see canonical.CanonicalIndex)
+def canonical_index_path(prefix='final_'):
+    return os.path.join(DATA_PROCESSED_PATH, f'{prefix}canonical_index.json')
+
+def report_unseen_values(unseen):
+    """Print the values left outside the canonical vocabularies (see canonical.unseen_values)"""
+    for column, values in unseen.items():
+        print(f"Warning: {len(values)} {column} value(s) outside the canonical vocabulary, kept as-is: {values}")
+
+def report_validation(validation):
+    """Print the failed data quality rules (see validation.DataValidator.results)"""
+    for rule in validation['rules']:
+        if not rule['passed']:
+            details = {key: value for key, value in rule.items() if key not in ('rule', 'passed')}
+            print(f"Warning: data quality rule {rule['rule']!r} failed: {details}")
+    failed = sum(not rule['passed'] for rule in validation['rules'])
+    print(f"Data quality: {len(validation['rules']) - failed}/{len(validation['rules'])} rules passed "
+          f"on {validation['rows']} rows")
+
+# Incremental ingestion: append the form responses newer than a timestamp watermark
+def form_state_path(prefix='final_'):
+    return os.path.join(DATA_PROCESSED_PATH, f'{prefix}survey_2025_state.json')
+
+def max_timestamp(current, candidate):
+    """Latest of two timestamps, ignoring NaT"""
+    if pd.isna(candidate):
+        return current
+    if pd.isna(current):
+        return candidate
+    return max(current, candidate)
+
+def form_ingestion_state(df_survey):
+    """High-water mark of the timestamps and histogram of the valid ages of raw form responses"""
+    timestamp_column = form_column(df_survey, 'horodateur', 'timestamp')
+    age_column = form_column(df_survey, 'age')
+    watermark = parse_form_timestamps(df_survey[timestamp_column]).max() if timestamp_column else pd.NaT
+    age_counts = age_value_counts(df_survey[age_column]) if age_column else pd.Series(dtype=float)
+    return watermark, age_counts
+
+def save_form_state(watermark, age_counts, prefix='final_'):
+    """Persist the form watermark and the age histogram of every response ingested so far"""
+    state = {
+        'watermark': None if pd.isna(watermark) else watermark.isoformat(),
+        'age_counts': {str(age): int(count) for age, count in age_counts.items()}
+    }
+    with open(form_state_path(prefix), 'w') as f:
+        json.dump(state, f, indent=4)
+
+def load_form_state(prefix='final_'):
+    """Watermark and age histogram written by the last full or incremental run"""
+    path = form_state_path(prefix)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No form ingestion state at {path}: run the full pipeline first")
+    with open(path) as f:
+        state = json.load(f)
+    watermark = pd.Timestamp(state['watermark']) if state['watermark'] else pd.NaT
+    age_counts = pd.Series({float(age): count for age, count in state['age_counts'].items()}, dtype=float)
+    return watermark, age_counts
+
+def bitmap_index_path(prefix='final_'):
+    return os.path.join(OUTPUTS_PATH, f'{prefix}bitmap_index.npz')
+
+def columnar_path(prefix='final_'):
+    return os.path.join(OUTPUTS_PATH, f'{prefix}integrated_columns')
+
+def remove_stale_outputs(prefix='final_'):
+    """
+    Delete the bitmap index and the memory-mapped columns of a previous full
+    run, once the streaming or incremental mode rewrote the integrated rows
+    they copy (these modes do not hold the whole frame to rebuild them; the
+    next full run does).
+    """
+    for path in (bitmap_index_path(prefix), columnar_path(prefix)):
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+        else:
+            continue
+        print(f"Removed the stale {path} (rebuilt by the next full run)")
+
+def append_aligned(df, path):
+    """Append df to an existing CSV without rewriting it, aligned on the CSV header"""
+    columns = pd.read_csv(path, nrows=0).columns
+    df.reindex(columns=columns).to_csv(path, mode='a', header=False, index=False)
+
+def run_etl_incremental(form_source=None, prefix='final_'):
+    """
+    Append the form responses newer than the stored watermark to the outputs.
+
+    Only the new rows are cleaned and transformed; they are appended to the
+    processed 2025 CSV and the integrated CSV written by a previous full run,
+    and their counts are merged into the dashboard cube (see cube.merge_cubes).
+    Invalid ages are filled with the median over all ingested responses (the
+    age histogram is kept with the watermark), earlier rows are not rewritten.
+    Responses without a parsable timestamp cannot be watermarked and are skipped.
+    The bitmap index and memory-mapped columns of the full run no longer cover
+    every row and are deleted (see remove_stale_outputs).
+
+    Args:
+        form_source: Source of the form responses (see CsvFormSource).
+        prefix (str): Output file name prefix.
+
+    Returns:
+        int: Number of appended responses.
+    """
+    watermark, age_counts = load_form_state(prefix)
+    df_survey = fetch_form_responses(form_source)
+
+    timestamp_column = form_column(df_survey, 'horodateur', 'timestamp')
+    if timestamp_column is None:
+        raise KeyError("The form responses have no 'Horodateur'/'Timestamp' column")
+    timestamps = parse_form_timestamps(df_survey[timestamp_column])
+    is_new = timestamps > watermark if pd.notna(watermark) else timestamps.notna()
+    new_rows = df_survey[is_new]
+    if new_rows.empty:
+        print("No new form responses")
+        return 0
+
+    new_watermark, new_age_counts = form_ingestion_state(new_rows)
+    age_counts = age_counts.add(new_age_counts, fill_value=0)
+
+    print(f"Appending {len(new_rows)} new form responses...")
+    df_2025 = clean_survey_2025(new_rows, age_median=median_from_counts(age_counts))
+    canonical_index = CanonicalIndex.load(canonical_index_path(prefix))
+    df_2025 = transform_survey(df_2025, 2025, canonical_index)
+    df_2025['survey_year'] = 2025
+
+    append_aligned(df_2025, os.path.join(DATA_PROCESSED_PATH, f'{prefix}cleaned_survey_2025.csv'))
+    integrated_path = os.path.join(OUTPUTS_PATH, f'{prefix}integrated.csv')
+    integrated_columns = pd.read_csv(integrated_path, nrows=0).columns
+    final_rows = clean_final_df(df_2025.reindex(columns=integrated_columns))
+    append_aligned(final_rows, integrated_path)
+    remove_stale_outputs(prefix)
+    report_unseen_values(unseen_values(final_rows))
+
+    # The dashboards only read the cube: add the counts of the new rows to it
+    cube_path = os.path.join(OUTPUTS_PATH, f'{prefix}dashboard_cube.json')
+    if os.path.exists(cube_path):
+        dashboard_cube = merge_cubes(load_cube(cube_path), build_cube(final_rows))
+    else:
+        dashboard_cube = build_cube(pd.read_csv(integrated_path, low_memory=False))
+    save_cube(dashboard_cube, cube_path)
+
+    save_form_state(max_timestamp(watermark, new_watermark), age_counts, prefix)
+    canonical_index.save(canonical_index_path(prefix))
+    return len(new_rows)
+
+# Parallel mode: clean and transform the surveys (or row partitions of them) in a process pool
+def clean_transform(survey_year, df, cleaning_kwargs=None):
+    """Clean and transform one survey or row partition (process pool task)"""
+    df = SURVEYS.adapter(survey_year).clean(df, **(cleaning_kwargs or {}))
+    return transform_survey(df, survey_year)
+
+def load_clean_transform(survey_year, raw_path, usecols=None):
+    """Load, clean and transform one raw survey file (process pool task)"""
+    df = pd.read_csv(SURVEYS.adapter(survey_year).path(raw_path, survey_year), usecols=usecols)
+    return clean_transform(survey_year, df)
+
+def frame_cleaning_kwargs(survey_year, df):
+    """Whole-survey statistics (median age, 2016 null columns) shared by all row partitions of df"""
+    adapter = SURVEYS.adapter(survey_year)
+    profile = profile_survey([df.copy(deep=False)], adapter.profile_columns, adapter.age_column)
+    return cleaning_kwargs(survey_year, profile)
+
+def process_surveys_parallel(df_survey, workers=None, partition_rows=None, usecols=None):
+    """
+    Clean and transform the three surveys concurrently.
+
+    Without partition_rows, each survey is one task: the 2014 and 2016 files
+    are also read inside the workers. With partition_rows, the raw surveys are
+    loaded first and split into row partitions of at most that size, cleaned
+    in parallel with the whole-survey median age and null columns, then put
+    back together in order. The result equals transform_surveys(clean_...).
+
+    Args:
+        df_survey (pd.DataFrame): Raw form responses.
+        workers (int): Number of worker processes (default: one per CPU).
+        partition_rows (int): Maximum rows per task for large surveys.
+        usecols (dict): survey_year -> raw columns to parse (see surviving_columns).
+
+    Returns:
+        tuple: Transformed (df_2014, df_2016, df_2025).
+    """
+    usecols = usecols or {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if partition_rows is None:
+            futures = [
+                [pool.submit(load_clean_transform, 2014, DATA_RAW_PATH, usecols.get(2014))],
+                [pool.submit(load_clean_transform, 2016, DATA_RAW_PATH, usecols.get(2016))],
+                [pool.submit(clean_transform, 2025, df_survey)]
+            ]
+        else:
+            raw = {
+                2014: read_raw_survey(2014, usecols.get(2014)),
+                2016: read_raw_survey(2016, usecols.get(2016)),
+                2025: df_survey
+            }
+            futures = []
+            for survey_year, df in raw.items():
+                kwargs = frame_cleaning_kwargs(survey_year, df)
+                futures.append([
+                    pool.submit(clean_transform, survey_year, df.iloc[start:start + partition_rows], kwargs)
+                    for start in range(0, max(len(df), 1), partition_rows)
+                ])
+
+        return tuple(pd.concat([future.result() for future in parts]) for parts in futures)
+
+# Survey discovery: every yearly file of data/raw with a registered schema adapter (see surveys.py)
+def ingest_surveys(df_survey, workers=None, raw_path=None):
+    """
+    Clean and transform every survey file of raw_path read by a registered
+    adapter (see SURVEYS.discover), and the form responses, in a process pool.
+
+    survey_<year>.csv files without an adapter are skipped with a warning.
+
+    Args:
+        df_survey (pd.DataFrame): Raw form responses.
+        workers (int): Number of worker processes (default: one per CPU).
+        raw_path (str): Directory of the raw surveys (default: DATA_RAW_PATH).
+
+    Returns:
+        dict: survey_year -> transformed survey, in year order.
+    """
+    raw_path = DATA_RAW_PATH if raw_path is None else raw_path
+    files = SURVEYS.discover(raw_path)
+    for survey_year, path in SURVEYS.raw_files(raw_path).items():
+        if survey_year not in files:
+            print(f"Warning: no schema adapter is registered for the {survey_year} survey, skipping {path}")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {survey_year: pool.submit(load_clean_transform, survey_year, raw_path) for survey_year in files}
+        futures[2025] = pool.submit(clean_transform, 2025, df_survey)
+        return {survey_year: futures[survey_year].result() for survey_year in sorted(futures)}
+
+# Lazy engine: the whole chain as one polars query plan (run_etl(engine='polars'))
+ENGINES = ('pandas', 'polars')
+
+def run_lazy_plan(df_survey):
+    """
+    Clean, transform, merge and final-clean the surveys with the lazy engine (see lazy_engine).
+
+    Returns:
+        tuple: (final_df, (df_2014, df_2016, df_2025), unseen values); the
+        per-survey frames hold the integrated columns only.
+    """
+    import lazy_engine  # polars is only needed by this engine
+
+    scans = {
+        2014: lazy_engine.scan_survey(os.path.join(DATA_RAW_PATH, 'survey_2014.csv')),
+        2016: lazy_engine.scan_survey(os.path.join(DATA_RAW_PATH, 'survey_2016.csv')),
+        2025: lazy_engine.form_frame(df_survey)
+    }
+    column_names = clean_column_names({
+        survey_year: scan.collect_schema().names() for survey_year, scan in scans.items()
+    })
+    adapters = {survey_year: SURVEYS.adapter(survey_year) for survey_year in scans}
+    final_df, surveys, unseen = lazy_engine.collect_integrated(scans, adapters, column_names, FINAL_FILL_VALUES,
+                                                               FINAL_DROPPED_COLUMNS)
+    return final_df, (surveys[2014], surveys[2016], surveys[2025]), unseen
+
+# Main ETL Pipeline
+def run_etl(chunksize=None, output_format='csv', use_cache=False, form_source=None, incremental=False,
+            workers=None, partition_rows=None, prune_columns=False, trace_memory=False, profile_stage=None,
+            impute=False, compact_dtypes=False, engine='pandas', discover_surveys=False):
+    """
+    Execute the complete ETL pipeline:
+    1. Load raw data
+    2. Clean and transform each dataset
+    3. Integrate data
+    4. Validate data quality
+    5. Save results
+
+    Args:
+        chunksize (int): If set, stream the surveys in chunks of this many rows
+            (see run_etl_streaming) and return the integrated CSV path instead
+            of the DataFrame.
+        output_format (str): Format of the saved datasets (in-memory mode only,
+            streaming always appends CSV): 'csv', 'parquet' or 'feather'.
+        use_cache (bool): Reuse the cleaned/transformed surveys stored in
+            CACHE_PATH when their raw input and code are unchanged (see
+            load_cached_surveys). Hits and misses are written to the metadata.
+        form_source: Source of the form responses (default: the published
+            Google Sheet, see CsvFormSource).
+        incremental (bool): Only append the form responses newer than the
+            last run (see run_etl_incremental) and return how many were added.
+        workers (int): If set, clean and transform the surveys in a pool of
+            this many processes (see process_surveys_parallel).
+        partition_rows (int): With workers, also split surveys larger than
+            this many rows across the workers.
+        prune_columns (bool): Only parse the raw columns that reach the
+            integrated output (see surviving_columns). The processed
+            per-survey files then hold those columns only.
+        trace_memory (bool): Also record the tracemalloc peak of each stage
+            in the metadata (see instrument.StageMetrics).
+        profile_stage (str): Name of a stage (e.g. 'clean_survey_2016') to
+            run under cProfile; the profile is dumped to
+            OUTPUTS_PATH/final_<stage>.prof.
+        impute (bool): KNN-impute the numeric, encoded answer and OECD
+            columns of the OECD-integrated dataset block by block (see
+            impute.impute_knn), with `workers` processes (default: all CPUs).
+        compact_dtypes (bool): Convert the integrated dataset to the declared
+            compact dtypes (see schema.apply_dtype_plan) before the later
+            stages; its memory usage before and after is printed and
+            recorded under 'memory' in the metadata.
+        engine (str): 'pandas' runs each stage eagerly; 'polars' runs the
+            load -> clean -> transform -> merge -> final clean chain as one
+            lazy polars plan (see lazy_engine, requires polars) with the same
+            integrated output. The processed per-survey files then hold the
+            integrated columns only; use_cache, workers and prune_columns
+            do not apply.
+        discover_surveys (bool): Also ingest every other survey_<year>.csv of
+            DATA_RAW_PATH with a registered schema adapter (see SURVEYS and
+            surveys.py), cleaned in `workers` processes (see ingest_surveys)
+            and merged in one union-schema step (see merge_surveys). Rows per
+            survey_year are recorded under 'surveys' in the metadata. Not
+            available with the polars engine nor with chunksize or
+            incremental; use_cache does not apply.
+
+    In-memory modes also join the standardized OECD indicators onto the
+    integrated rows (final_integrated_oecd_features, see join_oecd_features),
+    aggregate them by country into final_mental_health_oecd_integrated (the
+    country table shipped before, see oecd_country_table), and record the
+    wall/CPU time, memory and frame shapes of each stage under 'stages' in
+    final_metadata.json. The
+    dashboard counts are aggregated into final_dashboard_cube.json (see
+    cube.build_cube), and the answer columns of the integrated rows are
+    bitmap-indexed into final_bitmap_index.npz with the content hash of the
+    integrated output (see bitmap_index.BitmapIndex).
+    The integrated rows are also published as memory-mappable columns in
+    OUTPUTS_PATH/final_integrated_columns, which analysis processes open
+    without parsing or copying them (see columnar.load_columnar). The
+    streaming and incremental modes delete the columns and the bitmap index
+    instead (see remove_stale_outputs).
+
+    The canonical spellings learned by transform_survey are kept in
+    DATA_PROCESSED_PATH/final_canonical_index.json (worker processes start
+    from the vocabulary only), and country/answer values outside the
+    vocabularies are printed and listed under 'unseen_values'.
+
+    The integrated rows are checked against the declared data quality rules
+    of validation.py (value ranges, allowed answers, null rates, rows per
+    survey_year) in one pass; failed rules are printed and every result is
+    recorded under 'validation' in the metadata, in streaming mode too.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+    if discover_surveys and engine == 'polars':
+        raise ValueError("discover_surveys is not available with the polars engine")
+    if discover_surveys and (chunksize or incremental):
+        raise ValueError("discover_surveys is not available in the streaming and incremental modes")
+
+    print("=== Starting ETL Pipeline ===")
+
+    if incremental:
+        appended = run_etl_incremental(form_source)
+        print("=== ETL Pipeline completed successfully ===")
+        return appended
+
+    if chunksize:
+        integrated_path = run_etl_streaming(chunksize, form_source, prune_columns=prune_columns)
+        print("=== ETL Pipeline completed successfully ===")
+        return integrated_path
+
+    os.makedirs(OUTPUTS_PATH, exist_ok=True)
+    metrics = StageMetrics(trace_memory, profile_stage,
+                           os.path.join(OUTPUTS_PATH, f'final_{profile_stage}.prof'))
+    metadata = {'stages': metrics.stages}
+    canonical_index = CanonicalIndex.load(canonical_index_path('final_'))
+    usecols = {}
+    surveys = {}
+    if use_cache or workers or engine == 'polars' or discover_surveys:
+        df_survey = metrics.run('fetch_form_responses', fetch_form_responses, form_source)
+        if prune_columns and engine == 'pandas':
+            df_survey, usecols = metrics.run('prune_form_responses', prune_form_responses, df_survey)
+
+    if engine == 'polars':
+        print("Cleaning, transforming and merging surveys with the lazy engine...")
+        final_df, (df_2014, df_2016, df_2025), unseen = metrics.run('run_lazy_plan', run_lazy_plan, df_survey)
+    elif discover_surveys:
+        print("Discovering, cleaning and transforming the survey files...")
+        surveys = metrics.run('ingest_surveys', ingest_surveys, df_survey, workers)
+        df_2014, df_2016, df_2025 = surveys.pop(2014), surveys.pop(2016), surveys.pop(2025)
+        metadata['surveys'] = {survey_year: len(df) for survey_year, df in
+                               {2014: df_2014, 2016: df_2016, **surveys, 2025: df_2025}.items()}
+    elif use_cache:
+        print("Loading, cleaning and transforming surveys through the stage cache...")
+        cache = StageCache(CACHE_PATH)
+        df_2014, df_2016, df_2025 = metrics.run('load_cached_surveys', load_cached_surveys, cache, df_survey, usecols,
+                                                canonical_index)
+        metadata['cache'] = cache.stats
+    elif workers:
+        print(f"Cleaning and transforming surveys with {workers} worker processes...")
+        df_2014, df_2016, df_2025 = metrics.run('process_surveys_parallel', process_surveys_parallel,
+                                                df_survey, workers, partition_rows, usecols)
+    else:
+        # Step 1: Data Loading
+        print("Loading datasets...")
+        df_survey, df_2014, df_2016 = metrics.run('load_datasets', load_datasets, form_source, prune_columns)
+
+        # Step 2: Data Cleaning
+        print("Cleaning 2025 survey data...")
+        df_2025 = metrics.run('clean_survey_2025', clean_survey_2025, df_survey)
+
+        print("Cleaning 2014 survey data...")
+        df_2014 = metrics.run('clean_survey_2014', clean_survey_2014, df_2014)
+
+        print("Cleaning 2016 survey data...")
+        df_2016 = metrics.run('clean_survey_2016', clean_survey_2016, df_2016)
+
+        # Step 3: Data Transformation
+
+        print("Transforming survey data...")
+        df_2014, df_2016, df_2025 = metrics.run('transform_surveys', transform_surveys, df_2014, df_2016, df_2025,
+                                                canonical_index)
+
+    if engine == 'pandas':
+        # Step 4: Data Integration
+        print("Merging datasets...")
+        if surveys:
+            final_df = metrics.run('merge_surveys', merge_surveys, {2014: df_2014, 2016: df_2016, **surveys,
+                                                                     2025: df_2025})
+        else:
+            final_df = metrics.run('merge_all_surveys', merge_all_surveys, df_2014, df_2016, df_2025)
+        final_df = metrics.run('clean_final_df', clean_final_df, final_df)
+        unseen = unseen_values(final_df)
+    report_unseen_values(unseen)
+    if unseen:
+        metadata['unseen_values'] = unseen
+
+    # Step 5: Data Validation
+    print("Validating data quality...")
+    expected_rows = {**dict.fromkeys(surveys, (1, None)), **EXPECTED_ROWS}
+    metadata['validation'] = metrics.run('validate_data', validate_data, final_df, expected_rows)
+    report_validation(metadata['validation'])
+
+    if compact_dtypes:
+        compact_df = metrics.run('apply_dtype_plan', apply_dtype_plan, final_df)
+        metadata['memory'] = memory_report(final_df, compact_df)
+        print(f"Integrated dataset: {metadata['memory']['before_mb']:.2f} MB -> "
+              f"{metadata['memory']['after_mb']:.2f} MB with the compact dtypes")
+        final_df = compact_df
+    dashboard_cube = metrics.run('build_cube', build_cube, final_df)
+
+    print("Joining OECD indicators...")
+    df_oecd = metrics.run('clean_oecd', clean_oecd, metrics.run('load_oecd', load_oecd))
+    oecd_features = metrics.run('transform_oecd', transform_oecd, df_oecd)
+    oecd_integrated_df = metrics.run('join_oecd_features', join_oecd_features, final_df, oecd_features)
+    oecd_country_df = metrics.run('oecd_country_table', oecd_country_table, oecd_integrated_df, oecd_features,
+                                  df_oecd)
+    if impute:
+        print("Imputing missing values...")
+        oecd_integrated_df = metrics.run('impute_knn', impute_knn, oecd_integrated_df, workers=workers)
+    # Step 6: Save Results
+    print("Saving results...")
+    metrics.run(
+        'save_outputs',
+        save_outputs,
+        final_df,
+        df_2025,
+        df_2014,
+        df_2016,
+        prefix='final_',
+        output_format=output_format,
+        metadata=metadata,
+        df_oecd=df_oecd,
+        oecd_integrated_df=oecd_integrated_df,
+        oecd_country_df=oecd_country_df,
+        dashboard_cube=dashboard_cube,
+        surveys=surveys
+    )
+    metrics.run('write_columnar', write_columnar, final_df, columnar_path('final_'))
+    integrated_digest = file_digest(find_output(os.path.join(OUTPUTS_PATH, 'final_integrated')))
+    bitmap_index = metrics.run('build_bitmap_index', BitmapIndex.build, final_df, digest=integrated_digest)
+    bitmap_index.save(bitmap_index_path('final_'))
+    save_form_state(*form_ingestion_state(df_survey), prefix='final_')
+    canonical_index.save(canonical_index_path('final_'))
+    # save_outputs wrote the metadata before its own stage record was added
+    save_metadata(prefix='final_', extra=metadata)
+
+    print("=== ETL Pipeline completed successfully ===")
+    return final_df
+if __name__ == "__main__":
+    final_data = run_etl()
+
+    # Display results
+    print("\nFinal data preview:")
+    print(final_data.head())
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+Blocked KNN imputation of the numeric and ordinal columns.
+
+Exact KNN imputation compares every incomplete row with every row, which is
+quadratic in the number of rows. Here the rows are grouped by a partition key
+(the country by default) into blocks of at most block_rows rows: large
+partitions are split, small ones are packed together in key order. Each
+block is imputed on its own with KNNImputer, in a process pool, so the cost
+grows linearly with the number of rows. Values are standardized with the
+statistics of the whole frame first, so age does not dominate the distances.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from config import KNN_NEIGHBORS, KNN_BLOCK_ROWS
+
+# Ordinal encodings of the answers; "don't know" answers are missing values
+BENEFITS_SCORES = {
+    'Yes': 1.0,
+    'No': 0.0,
+    'Not eligible for coverage / N/A': 0.0,
+    1.0: 1.0,
+    0.0: 0.0
+}
+LEAVE_SCORES = {
+    'Very easy': 0.0,
+    'Somewhat easy': 1.0,
+    'Neither easy nor difficult': 2.0,
+    'Somewhat difficult': 3.0,
+    'Very difficult': 4.0
+}
+ENCODED_ANSWERS = {
+    'benefits_score': ('benefits', BENEFITS_SCORES),
+    'leave_score': ('leave', LEAVE_SCORES),
+}
+
+NUMERIC_COLUMNS = ['age', 'mh_impact_score']
+
+
+def encode_answers(df):
+    """Add the ordinal <answer>_score columns of the benefit and leave answers"""
+    scores = {
+        column: df[source].map(mapping).astype(float)
+        for column, (source, mapping) in ENCODED_ANSWERS.items() if source in df.columns
+    }
+    return df.assign(**scores)
+
+
+def imputation_columns(df):
+    """Numeric, encoded and OECD indicator columns of df that take part in the imputation"""
+    candidates = NUMERIC_COLUMNS + list(ENCODED_ANSWERS) + [c for c in df.columns if c.startswith('oecd_')]
+    return [column for column in candidates if column in df.columns]
+
+
+def imputation_blocks(keys, block_rows=KNN_BLOCK_ROWS):
+    """
+    Split row positions into blocks of at most block_rows rows sharing, as far as possible, the same key.
+
+    Args:
+        keys (pd.Series): Partition key of each row (missing keys form their own partition).
+        block_rows (int): Maximum rows per block.
+
+    Returns:
+        list: Arrays of row positions.
+    """
+    codes, _ = pd.factorize(keys, sort=True, use_na_sentinel=False)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    partitions = np.split(order, bounds) if len(order) else []
+
+    blocks, current = [], []
+    for positions in partitions:
+        if len(positions) > block_rows:
+            pieces = -(-len(positions) // block_rows)
+            blocks.extend(np.array_split(positions, pieces))
+            continue
+        if sum(map(len, current)) + len(positions) > block_rows:
+            blocks.append(np.concatenate(current))
+            current = []
+        current.append(positions)
+    if current:
+        blocks.append(np.concatenate(current))
+    return blocks
+
+
+def impute_block(values, n_neighbors=KNN_NEIGHBORS):
+    """KNN-impute a 2-D float array; columns without any value in the block are left missing"""
+    # Imported here so that importing the pipeline does not pay for sklearn
+    from sklearn.impute import KNNImputer
+
+    observed = ~np.isnan(values).all(axis=0)
+    result = values.copy()
+    if observed.any() and np.isnan(values[:, observed]).any():
+        result[:, observed] = KNNImputer(n_neighbors=n_neighbors).fit_transform(values[:, observed])
+    return result
+
+
+def column_stats(values):
+    """NaN-aware (mean, std) of each column; std is 1 for constant or empty columns"""
+    counts = (~np.isnan(values)).sum(axis=0)
+    mean = np.divide(np.nansum(values, axis=0), counts, out=np.full(values.shape[1], np.nan), where=counts > 0)
+    variance = np.divide(np.nansum((values - mean) ** 2, axis=0), counts, out=np.zeros(values.shape[1]),
+                         where=counts > 0)
+    std = np.sqrt(variance)
+    return mean, np.where(std > 0, std, 1.0)
+
+
+def impute_knn(df, partition='country', block_rows=KNN_BLOCK_ROWS, n_neighbors=KNN_NEIGHBORS, workers=None):
+    """
+    Impute the numeric, encoded answer and OECD indicator columns of df block by block.
+
+    Values still missing after their block (the block had no value for the
+    column) get the mean of the whole column.
+
+    Args:
+        df (pd.DataFrame): Integrated dataset, usually with the OECD features joined.
+        partition (str): Column whose values group the rows into blocks.
+        block_rows (int): Maximum rows per block; a value >= len(df) gives exact KNN.
+        n_neighbors (int): Neighbours used by KNNImputer.
+        workers (int): Worker processes (default: one per CPU; 1 imputes in-process).
+
+    Returns:
+        pd.DataFrame: Copy of df with the <answer>_score columns added and the
+        imputation columns filled.
+    """
+    df = encode_answers(df)
+    columns = imputation_columns(df)
+    values = df[columns].to_numpy(dtype=float)
+    mean, std = column_stats(values)
+    scaled = (values - mean) / std
+
+    blocks = imputation_blocks(df[partition], block_rows)
+    workers = workers or os.cpu_count()
+    if workers == 1 or len(blocks) <= 1:
+        results = [impute_block(scaled[block], n_neighbors) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(impute_block, [scaled[block] for block in blocks],
+                                    [n_neighbors] * len(blocks)))
+    for block, result in zip(blocks, results):
+        scaled[block] = result
+
+    # Observed values are kept as-is rather than round-tripped through the scaling
+    imputed = scaled * std + mean
+    values = np.where(np.isnan(values), np.where(np.isnan(imputed), mean, imputed), values)
+    return df.assign(**{column: values[:, i] for i, column in enumerate(columns)})
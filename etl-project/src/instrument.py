@@ -0,0 +1,97 @@
+"""
+Per-stage instrumentation of the pipeline.
+
+StageMetrics.run calls a stage function and records its wall time, CPU
+time, the growth of the process peak RSS, optionally the tracemalloc peak,
+and the (rows, columns) of the frames it received and returned. The records
+are written to the metadata JSON so a slow production run shows which stage
+regressed. One stage can also be run under cProfile and dumped to a .prof
+file (python -m pstats <file>).
+"""
+
+import cProfile
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size of the process so far, in MB (None where unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def frame_shapes(value):
+    """[rows, columns] of the DataFrames in value (a frame, or a tuple/list/dict of values)"""
+    if isinstance(value, pd.DataFrame):
+        return [list(value.shape)]
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (tuple, list)):
+        return [shape for item in value for shape in frame_shapes(item)]
+    return []
+
+
+class StageMetrics:
+    """
+    Collects one record per pipeline stage.
+
+    Args:
+        trace_memory (bool): Also record the tracemalloc peak of each stage
+            (more precise than the RSS growth, but slows allocations down).
+        profile_stage (str): Name of a stage to run under cProfile.
+        profile_path (str): Where the profile of profile_stage is dumped.
+    """
+
+    def __init__(self, trace_memory=False, profile_stage=None, profile_path=None):
+        self.trace_memory = trace_memory
+        self.profile_stage = profile_stage
+        self.profile_path = profile_path
+        self.stages = []
+
+    def run(self, name, func, *args, **kwargs):
+        """Call func(*args, **kwargs) as stage name and return its result"""
+        profiler = cProfile.Profile() if name == self.profile_stage else None
+        # Shapes before the call: some stages change their input frames in place
+        frames_in = frame_shapes([*args, *kwargs.values()])
+        if self.trace_memory:
+            tracemalloc.start()
+        rss_before = peak_rss_mb()
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+
+        if profiler is not None:
+            result = profiler.runcall(func, *args, **kwargs)
+        else:
+            result = func(*args, **kwargs)
+
+        record = {
+            'stage': name,
+            'wall_seconds': round(time.perf_counter() - wall_start, 6),
+            'cpu_seconds': round(time.process_time() - cpu_start, 6),
+        }
+        rss_after = peak_rss_mb()
+        if rss_after is not None:
+            record['peak_rss_mb'] = round(rss_after, 3)
+            record['peak_rss_growth_mb'] = round(rss_after - rss_before, 3)
+        if self.trace_memory:
+            _, traced_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            record['traced_peak_mb'] = round(traced_peak / 1e6, 3)
+        record['frames_in'] = frames_in
+        record['frames_out'] = frame_shapes(result)
+        if profiler is not None:
+            profiler.dump_stats(self.profile_path)
+            record['profile'] = self.profile_path
+
+        self.stages.append(record)
+        return result
@@ -0,0 +1,238 @@
+"""
+Lazy engine: load -> clean -> transform -> merge -> final clean as one polars query plan.
+
+The eager pipeline materializes a pandas frame at every stage, including
+the many raw columns that clean_final_df drops at the end. Here each step
+is a polars expression over lazily scanned CSVs, and the whole chain is
+collected at once: the optimizer pushes the final projection down to the
+scans (the dropped columns are never parsed), and the expressions run on
+all cores. Whole-column statistics the cleaning needs (the median age, the
+2016 null rates) are aggregations inside the same plan.
+
+The rules are the ones of etl.py: the cleaning steps and answer scores the
+schema adapter of each survey declares (see surveys.SurveyAdapter), the
+gender patterns of normalize, the canonical spellings and answer scores of
+canonical, the fill values and dropped columns of clean_final_df. Columns holding numbers in one survey and
+text in another get the text pandas would write for them (an integer column
+with missing values is written as floats), so the integrated output is the
+same as the pandas engine's.
+"""
+
+import re
+
+import polars as pl
+
+from canonical import BENEFITS_2016_SCORES, INTERFERE_SCORES, VOCABULARIES, CanonicalIndex
+from config import AGE_RANGE, MISSING_CATEGORY_THRESHOLD
+from normalize import SURVEY_GENDER_RULES, TRANSFORM_GENDER_RULES
+
+# Missing value markers of pd.read_csv
+PANDAS_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>',
+                    'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+
+def pandas_header(name):
+    """pd.read_csv name of a repeated header (polars reads the second 'X' as 'X_duplicated_0', pandas as 'X.1')"""
+    match = re.fullmatch(r'(.*)_duplicated_(\d+)', name)
+    return f'{match[1]}.{int(match[2]) + 1}' if match else name
+
+
+def scan_survey(path):
+    """
+    Lazy scan of a raw survey CSV, with the column names pd.read_csv gives it.
+    Every value is read as text, then numbers are printed the way pandas types them (see inferred_text).
+    """
+    scan = pl.scan_csv(path, null_values=PANDAS_NA_VALUES, infer_schema=False).rename(pandas_header)
+    return scan.with_columns(inferred_text(column) for column in scan.collect_schema().names())
+
+
+def form_frame(df_survey):
+    """Lazy frame of the form responses (fetched with pandas, see etl.CsvFormSource)"""
+    return pl.from_pandas(df_survey).lazy()
+
+
+def pandas_text(column, dtype):
+    """Text of a column as pandas writes it (integer columns with missing values are read as floats)"""
+    if dtype.is_integer():
+        values = pl.col(column)
+        return pl.when(values.null_count() > 0).then(values.cast(pl.Float64).cast(pl.String)).otherwise(
+            values.cast(pl.String))
+    return pl.col(column).cast(pl.String)
+
+
+def inferred_text(column):
+    """
+    Text of a raw text column as pandas writes it after pd.read_csv: a column of
+    integers is read as int64 (float64 if some are missing), a column of numbers
+    as float64, anything else as the raw text. Typing every column in the plan
+    is much cheaper than the schema inference pass of the scan.
+    """
+    values = pl.col(column)
+    integers = values.cast(pl.Int64, strict=False)
+    floats = values.cast(pl.Float64, strict=False)
+    return (
+        pl.when((integers.null_count() == values.null_count()) & (values.null_count() == 0))
+        .then(integers.cast(pl.String))
+        .when(floats.null_count() == values.null_count()).then(floats.cast(pl.String))
+        .otherwise(values)
+        .alias(column)
+    )
+
+
+def fill_text(column, dtype, value):
+    """column with its missing values filled with the text value (the column becomes text)"""
+    return pandas_text(column, dtype).fill_null(value).alias(column)
+
+
+def clean_age(column, age_range=AGE_RANGE):
+    """Ages outside age_range (or not numeric) filled with the median of the valid ones"""
+    age = pl.col(column).cast(pl.Float64, strict=False)
+    valid = pl.when(age.is_between(*age_range)).then(age)
+    return valid.fill_null(valid.median()).alias(column)
+
+
+def gender_label(column, rules, default, na_label=None):
+    """normalize.normalize_gender as an expression: the first rule whose pattern the answer contains wins"""
+    text = pl.col(column).cast(pl.String).str.strip_chars().str.to_lowercase()
+    if na_label is None:
+        # Missing values are matched as the string 'nan'
+        text = text.fill_null('nan')
+    label = pl.lit(default)
+    for rule_label, pattern in reversed(rules):
+        label = pl.when(text.str.contains(pattern.pattern)).then(pl.lit(rule_label)).otherwise(label)
+    if na_label is not None:
+        label = pl.when(pl.col(column).is_null()).then(pl.lit(na_label)).otherwise(label)
+    return label.alias(column)
+
+
+def canonical_value(column, spellings):
+    """canonical.CanonicalIndex.resolve as an expression (values outside the vocabulary are kept)"""
+    values = pl.col(column)
+    key = values.str.replace_all('[’‘]', "'").str.replace_all(r'\s+', ' ').str.strip_chars().str.to_lowercase()
+    return key.replace_strict(spellings, default=values).alias(column)
+
+
+def clean_plan(plan, adapter, column_names):
+    """The clean steps of one survey, as its schema adapter declares them (see surveys.SurveyAdapter)"""
+    plan = plan.rename(column_names)
+    schema = plan.collect_schema()
+    plan = plan.with_columns(
+        [fill_text(column, schema[column], value) for column, value in adapter.fill_values.items() if column in schema])
+    if adapter.missing_category:
+        # Columns with many missing values get a "Not specified" category
+        plan = plan.with_columns(
+            pl.when(pl.col(column).null_count() > MISSING_CATEGORY_THRESHOLD * pl.len())
+            .then(fill_text(column, dtype, 'Not specified'))
+            .otherwise(pandas_text(column, dtype)).alias(column)
+            for column, dtype in plan.collect_schema().items()
+        )
+    columns = plan.collect_schema().names()
+    plan = plan.with_columns(
+        # Timestamps that do not parse are missing, as with pd.to_datetime(errors='coerce')
+        *([pl.col('timestamp').cast(pl.String).str.to_datetime(adapter.timestamp_format, strict=False)]
+          if 'timestamp' in columns else []),
+        *([clean_age('age')] if 'age' in columns else []),
+        *([gender_label('gender', SURVEY_GENDER_RULES, default='other', na_label='other')]
+          if adapter.survey_gender and 'gender' in columns else []),
+    )
+    return plan
+
+
+def transform_plan(plan, adapter, spellings):
+    """The transform_survey steps of one survey"""
+    schema = plan.collect_schema()
+    plan = plan.with_columns(
+        canonical_value(column, spellings[column])
+        for column in VOCABULARIES if schema.get(column) == pl.String
+    )
+    plan = plan.with_columns(gender_label('gender', TRANSFORM_GENDER_RULES, default='Other', na_label='Other'))
+    if adapter.interference_scores:
+        plan = plan.with_columns(
+            pl.col('work_interfere').replace_strict(INTERFERE_SCORES, default=None, return_dtype=pl.Float64)
+            .alias('mh_impact_score'))
+    if adapter.benefit_scores and 'benefits' in schema:
+        plan = plan.with_columns(
+            pl.col('benefits').replace_strict(BENEFITS_2016_SCORES, default=0, return_dtype=pl.Float64).fill_null(0))
+    return plan
+
+
+def merge_plans(plans):
+    """
+    merge_all_surveys as one diagonal concat: columns in order of appearance, survey_year after the
+    2014 columns. Columns with text in one survey are text in all of them.
+    """
+    schemas = {survey_year: plan.collect_schema() for survey_year, plan in plans.items()}
+    text_columns = {column for schema in schemas.values() for column, dtype in schema.items() if dtype == pl.String}
+    return pl.concat([
+        plan.with_columns(
+            *(pandas_text(column, dtype).alias(column) for column, dtype in schemas[survey_year].items()
+              if column in text_columns and dtype.is_numeric()),
+            pl.lit(survey_year, dtype=pl.Int64).alias('survey_year'),
+        )
+        for survey_year, plan in plans.items()
+    ], how='diagonal_relaxed')
+
+
+def final_plan(plan, fill_values, dropped_columns):
+    """The clean_final_df steps: fill the missing answers and drop the unused columns"""
+    schema = plan.collect_schema()
+    fills = []
+    for column, value in fill_values.items():
+        if column not in schema:
+            continue
+        dtype = schema[column]
+        if isinstance(value, str) and dtype != pl.String:
+            fills.append(fill_text(column, dtype, value))
+        else:
+            fills.append(pl.col(column).fill_null(str(value) if dtype == pl.String else value))
+    return plan.with_columns(fills).drop(dropped_columns, strict=False)
+
+
+def unseen_plan(plans):
+    """(column, value) rows of the text values outside the vocabulary of their column (see canonical.unseen_values)"""
+    frames = []
+    for plan in plans:
+        schema = plan.collect_schema()
+        for column, vocabulary in VOCABULARIES.items():
+            if schema.get(column) == pl.String:
+                value = pl.col('value')
+                frames.append(plan.select(pl.lit(column).alias('column'), pl.col(column).alias('value'))
+                              .filter(value.is_not_null() & ~value.is_in(list(vocabulary))).unique())
+    if not frames:
+        return pl.LazyFrame(schema={'column': pl.String, 'value': pl.String})
+    return pl.concat(frames)
+
+
+def collect_integrated(scans, adapters, column_names, fill_values, dropped_columns):
+    """
+    Build the plan over the raw surveys and collect it.
+
+    Args:
+        scans (dict): survey_year -> LazyFrame of the raw survey (see scan_survey and form_frame).
+        adapters (dict): survey_year -> schema adapter of the survey (see surveys.SurveyAdapter).
+        column_names (dict): survey_year -> {raw column: cleaned column} (see etl.clean_column_names).
+        fill_values (dict): column -> fill value of clean_final_df.
+        dropped_columns (list): Columns dropped by clean_final_df.
+
+    Returns:
+        tuple: (integrated pd.DataFrame, {survey_year: transformed pd.DataFrame restricted
+        to the integrated columns}, unseen values as canonical.unseen_values returns them).
+    """
+    spellings = CanonicalIndex().spellings
+    surveys = {
+        survey_year: transform_plan(clean_plan(scan, adapters[survey_year], column_names[survey_year]),
+                                    adapters[survey_year], spellings)
+        for survey_year, scan in scans.items()
+    }
+    final = final_plan(merge_plans(surveys), fill_values, dropped_columns)
+    final_columns = final.collect_schema().names()
+    survey_frames = [plan.select(column for column in plan.collect_schema().names() if column in final_columns)
+                     for plan in surveys.values()]
+
+    # One collect: the scans shared by the plans are read once
+    final_df, *survey_dfs, unseen = pl.collect_all([final, *survey_frames, unseen_plan(surveys.values())])
+    unseen_values = {}
+    for column, value in unseen.sort('column', 'value').iter_rows():
+        unseen_values.setdefault(column, []).append(value)
+    return (final_df.to_pandas(), {survey_year: df.to_pandas() for survey_year, df in zip(surveys, survey_dfs)},
+            unseen_values)
@@ -0,0 +1,122 @@
+"""
+Shared value normalization for the survey cleaning steps.
+
+The survey columns hold a small number of distinct spellings repeated over
+many rows, so every normalizer here resolves each distinct raw value once
+and broadcasts the result back with a categorical lookup instead of running
+a Python function per row.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+from config import AGE_RANGE
+
+# Keyword lists used by clean_survey_2014 / clean_survey_2025.
+# Male keywords are checked first, so e.g. 'female' resolves to 'male'
+# ('male' is a substring); this is kept as-is to preserve existing labels.
+SURVEY_MALE_KEYWORDS = ['trans male', 'trans man', 'male', 'm', 'cis male', 'man', 'male (cis)',
+                        'malr', 'cis man', 'make', 'mail']
+SURVEY_FEMALE_KEYWORDS = ['trans woman', 'female (trans)', 'cis female', 'trans-female', 'trans female',
+                          'female', 'f', 'woman', 'female (cis)', 'cis woman']
+
+# Keyword lists used by transform_surveys (female variations are checked first)
+TRANSFORM_FEMALE_KEYWORDS = ['female', 'f', 'woman', 'fem', 'cis female', 'mtf', 'm2f']
+TRANSFORM_MALE_KEYWORDS = ['male', 'm', 'man', 'cis male', 'ftm', 'f2m']
+
+
+def _keyword_pattern(keywords):
+    """Compile a substring alternation equivalent to any(k in value for k in keywords)"""
+    return re.compile('|'.join(re.escape(k) for k in keywords))
+
+
+# (label, compiled pattern) pairs, evaluated in order; first match wins
+SURVEY_GENDER_RULES = [
+    ('male', _keyword_pattern(SURVEY_MALE_KEYWORDS)),
+    ('female', _keyword_pattern(SURVEY_FEMALE_KEYWORDS)),
+]
+TRANSFORM_GENDER_RULES = [
+    ('Female', _keyword_pattern(TRANSFORM_FEMALE_KEYWORDS)),
+    ('Male', _keyword_pattern(TRANSFORM_MALE_KEYWORDS)),
+]
+
+
+def map_distinct(series, func):
+    """
+    Apply a scalar function to each distinct value of a Series only once.
+
+    Args:
+        series (pd.Series): Raw values (missing values are passed to func as NaN).
+        func (callable): Function computing the label of a whole array of distinct values.
+
+    Returns:
+        pd.Series: Labels aligned on the original index.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    labels = np.asarray(func(pd.Index(uniques)), dtype=object)
+    return pd.Series(labels[codes], index=series.index, name=series.name)
+
+
+def normalize_gender(series, rules, default, na_label=None):
+    """
+    Map free-text gender answers to a fixed set of labels.
+
+    Args:
+        series (pd.Series): Raw gender answers.
+        rules (list): (label, compiled pattern) pairs; the first matching rule wins.
+        default (str): Label for values matching no rule.
+        na_label (str): Label for missing values. If None, missing values are
+            matched as the string 'nan', like str(value) would.
+
+    Returns:
+        pd.Series: Normalized labels.
+    """
+    def label_uniques(uniques):
+        text = uniques.astype(str).str.strip().str.lower()
+        conditions = [np.asarray(text.str.contains(pattern, regex=True), dtype=bool) for _, pattern in rules]
+        labels = np.select(conditions, [label for label, _ in rules], default=default)
+        if na_label is not None:
+            labels = np.where(uniques.isna(), na_label, labels)
+        return labels
+
+    return map_distinct(series, label_uniques)
+
+
+def valid_ages(series, age_range=AGE_RANGE):
+    """Coerce ages to float and blank out values outside age_range"""
+    age = pd.to_numeric(series, errors='coerce').astype(float)
+    return age.where(age.between(*age_range))
+
+
+def clean_age(series, age_range=AGE_RANGE, median=None):
+    """
+    Blank out ages outside age_range and fill them with the median.
+
+    Args:
+        series (pd.Series): Raw ages.
+        age_range (tuple): Inclusive (min, max) valid age.
+        median (float): Precomputed fill value (e.g. over a whole file read in
+            chunks). Defaults to the median of the valid ages in series.
+    """
+    age = valid_ages(series, age_range)
+    return age.fillna(age.median() if median is None else median)
+
+
+def age_value_counts(series, age_range=AGE_RANGE):
+    """Histogram of the valid ages in series, mergeable across chunks with Series.add"""
+    return valid_ages(series, age_range).value_counts()
+
+
+def median_from_counts(counts):
+    """Exact median of the values summarized by a value -> count histogram"""
+    counts = counts[counts > 0].sort_index()
+    total = counts.sum()
+    if total == 0:
+        return np.nan
+    cumulative = counts.cumsum().to_numpy()
+    values = counts.index.to_numpy(dtype=float)
+    # 0-based positions of the middle element(s) in the sorted values
+    lower = values[np.searchsorted(cumulative, (total - 1) // 2, side='right')]
+    upper = values[np.searchsorted(cumulative, total // 2, side='right')]
+    return (lower + upper) / 2
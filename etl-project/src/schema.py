@@ -0,0 +1,147 @@
+"""
+Declared schema and compact dtype plan of the integrated dataset.
+
+After merge_all_surveys nearly every column is an object column of short
+repeated strings, with per-survey encodings (treatment is 'Yes'/'No' in
+2014 and 1/0 in 2016, benefits 1.0/0.0 in 2016). apply_dtype_plan gives
+every declared column one encoding for all the surveys:
+
+- yes/no flags become nullable booleans ("Unknown" answers are missing);
+- answer columns become categoricals of their declared answers, the 2016
+  1/0 answers read as Yes/No and the "I don't know" spellings merged. The
+  yes/no questions with a third answer (family_history and obs_consequence
+  "I don't know", self_employed "Unknown") are answer columns: as flags,
+  that answer would be lost;
+- the survey year becomes int16, scores nullable int8 and ages float32
+  (invalid ages are filled with a median, which can be fractional).
+
+Undeclared columns (timestamp, comments, ...) are kept as they are.
+"""
+
+import numpy as np
+import pandas as pd
+
+from normalize import map_distinct
+
+INTEGER_COLUMNS = {
+    'survey_year': 'int16',
+    'age': 'float32',
+    'mh_impact_score': 'Int8',
+}
+
+FLAG_COLUMNS = ['treatment', 'tech_company']
+# Text (case-insensitive) of the flag answers; any other answer is missing
+FLAG_VALUES = {'yes': True, 'no': False, '1': True, '0': False, '1.0': True, '0.0': False}
+
+YES_NO_DONT_KNOW = ['Yes', 'No', "Don't know"]
+YES_NO_MAYBE = ['Yes', 'No', 'Maybe']
+# column -> declared answers (None: the observed values, sorted); observed
+# answers outside the declaration are appended, never dropped
+CATEGORY_COLUMNS = {
+    'gender': ['Male', 'Female', 'Other'],
+    'self_employed': ['Yes', 'No', 'Unknown'],
+    'family_history': YES_NO_DONT_KNOW,
+    'obs_consequence': YES_NO_DONT_KNOW,
+    'country': None,
+    'state': None,
+    'work_interfere': ['Never', 'Rarely', 'Sometimes', 'Often', 'Unknown', 'Not applicable'],
+    'no_employees': ['1-5', '6-25', '26-100', '100-500', '500-1000', 'More than 1000', 'Unknown'],
+    'remote_work': ['Never', 'No', 'Sometimes', 'Yes', 'Always'],
+    'benefits': YES_NO_DONT_KNOW,
+    'care_options': ['Yes', 'No', 'Not sure'],
+    'wellness_program': YES_NO_DONT_KNOW,
+    'seek_help': YES_NO_DONT_KNOW,
+    'anonymity': YES_NO_DONT_KNOW,
+    'leave': ['Very easy', 'Somewhat easy', 'Neither easy nor difficult', 'Somewhat difficult', 'Very difficult',
+              "Don't know"],
+    'mental_health_consequence': YES_NO_MAYBE,
+    'phys_health_consequence': YES_NO_MAYBE,
+    'coworkers': ['Yes', 'No', 'Some of them', 'Maybe'],
+    'supervisor': ['Yes', 'No', 'Some of them', 'Maybe'],
+    'mental_health_interview': YES_NO_MAYBE,
+    'phys_health_interview': YES_NO_MAYBE,
+    'mental_vs_physical': YES_NO_DONT_KNOW,
+}
+
+# Other spellings of the answers across the surveys (numeric answers are the 2016 1/0 encoding)
+ANSWER_SPELLINGS = {
+    "I don't know": "Don't know",
+    'Don’t know': "Don't know",
+    'I am not sure': 'Not sure',
+    "Don't know": "Don't know",
+    1: 'Yes',
+    0: 'No',
+}
+
+
+def flag_value(value):
+    """True/False of a yes/no answer, NA for any other answer"""
+    if pd.isna(value):
+        return pd.NA
+    return FLAG_VALUES.get(str(value).casefold(), pd.NA)
+
+
+def answer_value(value, column):
+    """Spelling of an answer shared by all the surveys"""
+    if pd.isna(value):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value in (0, 1):
+        return ANSWER_SPELLINGS[int(value)]
+    if column == 'care_options' and value == "Don't know":
+        return 'Not sure'
+    return ANSWER_SPELLINGS.get(value, value)
+
+
+def to_flags(series):
+    return map_distinct(series, lambda uniques: [flag_value(value) for value in uniques]).astype('boolean')
+
+
+def to_categories(series, declared=None):
+    """Categorical of the answers of series, categories in declared order then the other observed answers"""
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    labels = [answer_value(value, series.name) for value in uniques]
+    declared = list(declared or [])
+    observed = sorted({str(label) for label in labels if not pd.isna(label)} - set(declared))
+    positions = {category: code for code, category in enumerate(declared + observed)}
+    # Answer codes of the distinct raw values (-1: missing), taken for every row
+    unique_codes = np.array([-1 if pd.isna(label) else positions[str(label)] for label in labels], dtype=np.int64)
+    categorical = pd.Categorical.from_codes(unique_codes[codes], categories=declared + observed)
+    return pd.Series(categorical, index=series.index, name=series.name)
+
+
+def apply_dtype_plan(df):
+    """
+    Copy of df with the declared columns converted to their compact dtypes.
+
+    Args:
+        df (pd.DataFrame): Integrated dataset (output of clean_final_df).
+
+    Returns:
+        pd.DataFrame: Same rows and columns, declared columns re-encoded.
+    """
+    columns = {}
+    for column, dtype in INTEGER_COLUMNS.items():
+        if column in df.columns:
+            columns[column] = pd.to_numeric(df[column], errors='coerce').astype(dtype)
+    for column in FLAG_COLUMNS:
+        if column in df.columns:
+            columns[column] = to_flags(df[column])
+    for column, declared in CATEGORY_COLUMNS.items():
+        if column in df.columns:
+            columns[column] = to_categories(df[column], declared)
+    return df.assign(**columns)
+
+
+def column_memory(df):
+    """column -> deep memory usage in MB"""
+    return {column: usage / 1e6 for column, usage in df.memory_usage(deep=True, index=False).items()}
+
+
+def memory_report(before, after):
+    """Memory usage of a frame before and after apply_dtype_plan, in total and by column (MB)"""
+    before, after = column_memory(before), column_memory(after)
+    return {
+        'before_mb': round(sum(before.values()), 3),
+        'after_mb': round(sum(after.values()), 3),
+        'columns': {column: [round(before[column], 3), round(after[column], 3)] for column in before},
+    }
@@ -0,0 +1,324 @@
+"""
+Local HTTP query service over the integrated output, for the dashboard.
+
+Usage (from src/):
+    python service.py [--port 8050] [--outputs DIR (default: config.OUTPUTS_PATH)] [--prefix final_]
+
+The integrated dataset is loaded once into a ColumnStore: every answer
+column is dictionary-encoded into an integer code array (on first use), so
+a filter is a lookup of the accepted codes and a group-by is a count of
+combined codes. Requests look like
+
+    GET /query?group_by=treatment&gender=Male&country=USA&country=UK&max_age=30
+
+(repeated parameters are alternatives, min_age/max_age bound the age) and
+answer {"rows": <matching rows>, "groups": [{"treatment": "Yes", "count": 12}, ...]}.
+Results of recent requests are kept in an LRU cache. When run_etl rewrites
+the integrated output (its modification time or size changes), the store is
+reloaded and the cache cleared; a reload that caught a file being written
+is followed by another once the write is over. GET /stats reports the cache
+hits/misses. Invalid queries are answered with 400, a missing or unreadable
+integrated output with 503 and any other error with 500 (all with a JSON
+{"error": ...} body).
+"""
+
+import argparse
+import json
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from config import OUTPUTS_PATH, SERVICE_CACHE_SIZE, SERVICE_PORT
+from cube import column_codes, text_label
+from writers import find_output, read_output
+
+# Query parameters that are not column filters
+AGE_BOUNDS = {'min_age', 'max_age'}
+GROUP_BY = 'group_by'
+
+
+class QueryError(ValueError):
+    """Invalid query (unknown column or malformed bound)"""
+
+
+class OutputUnavailable(RuntimeError):
+    """The integrated output is missing or could not be read"""
+
+
+class ColumnStore:
+    """
+    Dictionary-encoded columns of a DataFrame.
+
+    Args:
+        df (pd.DataFrame): Integrated dataset (as written by save_outputs).
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.rows = len(df)
+        self.ages = pd.to_numeric(df['age'], errors='coerce').to_numpy(dtype=float) if 'age' in df.columns else None
+        self.encoded = {}
+        self.lock = threading.Lock()
+
+    def column(self, name):
+        """(codes, labels, label text -> code) of a column, encoded on first use"""
+        if name not in self.encoded:
+            if name not in self.df.columns:
+                raise QueryError(f"Unknown column {name!r}")
+            with self.lock:
+                if name not in self.encoded:
+                    codes, labels = column_codes(self.df[name], int if name == 'survey_year' else text_label)
+                    lookup = {str(label): code for code, label in enumerate(labels) if label is not None}
+                    self.encoded[name] = (codes, labels, lookup)
+        return self.encoded[name]
+
+    def mask(self, filters, min_age=None, max_age=None):
+        """Boolean mask of the rows matching every filter (column -> accepted label texts) and the age bounds"""
+        mask = np.ones(self.rows, dtype=bool)
+        for name, accepted in filters.items():
+            codes, labels, lookup = self.column(name)
+            wanted = [lookup[value] for value in accepted if value in lookup]
+            mask &= np.isin(codes, wanted)
+        if min_age is not None or max_age is not None:
+            if self.ages is None:
+                raise QueryError("No age column")
+            if min_age is not None:
+                mask &= self.ages >= min_age
+            if max_age is not None:
+                mask &= self.ages <= max_age
+        return mask
+
+    def query(self, filters=None, group_by=(), min_age=None, max_age=None):
+        """
+        Count the rows matching the filters, by the group_by columns.
+
+        Returns:
+            dict: {'rows': matching rows, 'groups': [{<column>: label, ..., 'count': n}, ...]}
+            with the groups by decreasing count (missing labels are None).
+        """
+        mask = self.mask(filters or {}, min_age, max_age)
+        rows = int(mask.sum())
+        if not group_by:
+            return {'rows': rows, 'groups': [{'count': rows}]}
+
+        # Densify the key after each column so it stays below rows * labels of the column
+        # (a product of the label counts of every column could overflow int64)
+        key = np.zeros(rows, dtype=np.int64)
+        cell_codes = np.zeros((1, 0), dtype=np.int64)
+        for name in group_by:
+            codes, labels, _ = self.column(name)
+            key, cells = pd.factorize(key * len(labels) + codes[mask])
+            cell_codes = np.column_stack([cell_codes[cells // len(labels)], cells % len(labels)])
+        counts = np.bincount(key, minlength=len(cell_codes))
+
+        groups = []
+        # By decreasing count, then by the codes of the group columns
+        for i in np.lexsort([*cell_codes.T[::-1], -counts]):
+            group = {name: to_json(self.column(name)[1][codes[i]]) for name, codes in zip(group_by, cell_codes.T)}
+            group['count'] = int(counts[i])
+            groups.append(group)
+        return {'rows': rows, 'groups': groups}
+
+
+def to_json(value):
+    """JSON-serializable form of a label"""
+    return int(value) if isinstance(value, np.integer) else value
+
+
+class LRUCache:
+    """
+    Least recently used cache of query results.
+
+    Args:
+        maxsize (int): Entries kept; the least recently used one is evicted first.
+    """
+
+    def __init__(self, maxsize=SERVICE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return self.entries[key]
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def clear(self):
+        self.entries.clear()
+
+
+def parse_query(params):
+    """
+    Normalized (filters, group_by, min_age, max_age) of query string parameters,
+    hashable so it can key the cache: filters is a sorted tuple of
+    (column, sorted accepted values).
+
+    Args:
+        params (dict): parameter -> list of values (as parse_qs returns them).
+    """
+    group_by = tuple(column for value in params.get(GROUP_BY, []) for column in value.split(',') if column)
+    bounds = {}
+    for bound in AGE_BOUNDS:
+        if bound in params:
+            try:
+                bounds[bound] = float(params[bound][-1])
+            except ValueError:
+                raise QueryError(f"{bound} must be a number, got {params[bound][-1]!r}")
+    filters = tuple(
+        (column, tuple(sorted(set(values))))
+        for column, values in sorted(params.items()) if column != GROUP_BY and column not in AGE_BOUNDS
+    )
+    return filters, group_by, bounds.get('min_age'), bounds.get('max_age')
+
+
+class QueryService:
+    """
+    Query answering with an LRU result cache, reloaded when run_etl publishes new outputs.
+
+    Args:
+        outputs_path (str): Directory of the pipeline outputs.
+        prefix (str): Output file name prefix.
+        cache_size (int): Results kept in the LRU cache.
+    """
+
+    def __init__(self, outputs_path=OUTPUTS_PATH, prefix='final_', cache_size=SERVICE_CACHE_SIZE):
+        self.data_path = os.path.join(outputs_path, f'{prefix}integrated')
+        self.cache = LRUCache(cache_size)
+        self.lock = threading.Lock()
+        self.store = None
+        self.signature = None
+        self.reloads = 0
+        self.refresh()
+
+    def publication(self):
+        """(path, modification time, size) of the latest integrated output"""
+        path = find_output(self.data_path)
+        if path is None:
+            raise OutputUnavailable(f"No integrated output at {self.data_path}.*, run the pipeline first")
+        try:
+            stat = os.stat(path)
+        except OSError as error:
+            raise OutputUnavailable(f"Cannot read {path}: {error}") from error
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def refresh(self):
+        """
+        Reload the integrated dataset and clear the cache if new outputs were published.
+
+        Raises:
+            OutputUnavailable: The output is missing or could not be read (e.g.
+            caught while run_etl rewrites it); the next request retries.
+        """
+        signature = self.publication()
+        if signature == self.signature:
+            return
+        with self.lock:
+            if signature == self.signature:
+                return
+            try:
+                df = read_output(signature[0])
+            except (OSError, ValueError) as error:
+                raise OutputUnavailable(f"Cannot read {signature[0]}: {error}") from error
+            self.store = ColumnStore(df)
+            self.signature = signature
+            self.cache.clear()
+            self.reloads += 1
+
+    def query(self, params):
+        """Answer of a /query request (params: parameter -> list of values)"""
+        self.refresh()
+        key = parse_query(params)
+        with self.lock:
+            store, result = self.store, self.cache.get(key)
+        if result is None:
+            filters, group_by, min_age, max_age = key
+            result = store.query(dict(filters), group_by, min_age, max_age)
+            with self.lock:
+                if store is self.store:
+                    self.cache.put(key, result)
+        return result
+
+    def stats(self):
+        with self.lock:
+            return {**self.cache.stats, 'entries': len(self.cache.entries), 'reloads': self.reloads,
+                    'rows': self.store.rows}
+
+
+def make_handler(service):
+    """Request handler class answering /query and /stats with service"""
+
+    class QueryHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            try:
+                if url.path == '/query':
+                    self.send_json(200, service.query(parse_qs(url.query)))
+                elif url.path == '/stats':
+                    self.send_json(200, service.stats())
+                else:
+                    self.send_json(404, {'error': f"Unknown path {url.path}"})
+            except QueryError as error:
+                self.send_json(400, {'error': str(error)})
+            except OutputUnavailable as error:
+                self.send_json(503, {'error': str(error)})
+            except Exception as error:
+                self.send_json(500, {'error': f"{type(error).__name__}: {error}"})
+
+        def send_json(self, status, body):
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            # The dashboard pages are served from another origin (or from files)
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return QueryHandler
+
+
+def make_server(service, host='127.0.0.1', port=SERVICE_PORT):
+    """HTTP server answering with service (port 0 picks a free port)"""
+    return ThreadingHTTPServer((host, port), make_handler(service))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--outputs', default=OUTPUTS_PATH, help='Directory of the pipeline outputs')
+    parser.add_argument('--prefix', default='final_', help='Output file name prefix')
+    parser.add_argument('--cache-size', type=int, default=SERVICE_CACHE_SIZE, help='Results kept in the LRU cache')
+    args = parser.parse_args()
+
+    service = QueryService(args.outputs, args.prefix, args.cache_size)
+    server = make_server(service, args.host, args.port)
+    print(f"Serving {service.store.rows:,} rows on http://{args.host}:{server.server_address[1]}/query")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""
+Registry of the survey sources and their schema adapters.
+
+A SurveyAdapter describes how a raw survey of one or more years becomes a
+cleaned survey in the shared schema: how its headers are normalized and
+mapped to the shared column names, and which normalizers its answers get
+(fill values, a "Not specified" category for sparse columns, timestamp,
+age and gender cleaning, and the answer scores of transform_survey, which
+also normalizes the gender answers).
+
+The 2014, 2016 and 2025 surveys keep their hand-written clean functions (see
+etl.SURVEYS); their adapters still declare the steps those functions take,
+which the lazy engine builds its plan from (see lazy_engine.clean_plan).
+The later OSMI questionnaires (2017-2023) ask the 2016 questions, so
+OSMI_ADAPTER reads them declaratively from the 2016 question mapping:
+adding one of those years is dropping its survey_<year>.csv into data/raw,
+and adding another source is registering one adapter.
+
+    >>> registry = SurveyRegistry([OSMI_ADAPTER])
+    >>> registry.discover('data/raw')
+    {2017: 'data/raw/survey_2017.csv', ...}
+"""
+
+import json
+import os
+import re
+
+import pandas as pd
+
+from cache import StageCache, source_digest
+from config import MISSING_CATEGORY_THRESHOLD
+from normalize import SURVEY_GENDER_RULES, clean_age, normalize_gender
+
+# Raw survey files of data/raw: survey_<year>.csv
+SURVEY_FILE_PATTERN = re.compile(r'survey_(\d{4})\.csv')
+
+# Shared column name of each OSMI question (the 2016 wording)
+OSMI_COLUMN_MAPPING = {
+    'Are you self-employed?': 'self_employed',
+    'How many employees does your company or organization have?': 'no_employees',
+    'Is your employer primarily a tech company/organization?': 'tech_company',
+    'Is your primary role within your company related to tech/IT?': 'tech_role',
+    'Does your employer provide mental health benefits as part of healthcare coverage?': 'benefits',
+    'Do you know the options for mental health care available under your employer-provided coverage?': 'care_options',
+    'Has your employer ever formally discussed mental health (for example, as part of a wellness campaign or other official communication)?': 'wellness_program',
+    'Does your employer offer resources to learn more about mental health concerns and options for seeking help?': 'seek_help',
+    'Is your anonymity protected if you choose to take advantage of mental health or substance abuse treatment resources provided by your employer?': 'anonymity',
+    'If a mental health issue prompted you to request a medical leave from work, asking for that leave would be:': 'leave',
+    'Do you think that discussing a mental health disorder with your employer would have negative consequences?': 'mental_health_consequence',
+    'Do you think that discussing a physical health issue with your employer would have negative consequences?': 'phys_health_consequence',
+    'Would you feel comfortable discussing a mental health disorder with your coworkers?': 'coworkers',
+    'Would you feel comfortable discussing a mental health disorder with your direct supervisor(s)?': 'supervisor',
+    'Do you feel that your employer takes mental health as seriously as physical health?': 'mental_vs_physical',
+    'Have you heard of or observed negative consequences for co-workers who have been open about mental health issues in your workplace?': 'obs_consequence',
+    'Do you have medical coverage (private insurance or state-provided) which includes treatment of mental health issues?': 'medical_coverage',
+    'Do you know local or online resources to seek help for a mental health disorder?': 'know_resources',
+    'If you have been diagnosed or treated for a mental health disorder, do you ever reveal this to clients or business contacts?': 'reveal_to_clients',
+    'If you have revealed a mental health issue to a client or business contact, do you believe this has impacted you negatively?': 'client_impact',
+    'If you have been diagnosed or treated for a mental health disorder, do you ever reveal this to coworkers or employees?': 'reveal_to_coworkers',
+    'If you have revealed a mental health issue to a coworker or employee, do you believe this has impacted you negatively?': 'coworker_impact',
+    'Do you believe your productivity is ever affected by a mental health issue?': 'productivity_affected',
+    'If yes, what percentage of your work time (time performing primary or secondary job functions) is affected by a mental health issue?': 'productivity_percentage',
+    'Do you have previous employers?': 'previous_employers',
+    'Have your previous employers provided mental health benefits?': 'prev_benefits',
+    'Were you aware of the options for mental health care provided by your previous employers?': 'prev_care_options',
+    'Did your previous employers ever formally discuss mental health (as part of a wellness campaign or other official communication)?': 'prev_wellness_program',
+    'Did your previous employers provide resources to learn more about mental health issues and how to seek help?': 'prev_seek_help',
+    'Was your anonymity protected if you chose to take advantage of mental health or substance abuse treatment resources with previous employers?': 'prev_anonymity',
+    'Do you think that discussing a mental health disorder with previous employers would have negative consequences?': 'prev_mental_health_consequence',
+    'Do you think that discussing a physical health issue with previous employers would have negative consequences?': 'prev_phys_health_consequence',
+    'Would you have been willing to discuss a mental health issue with your previous co-workers?': 'prev_coworkers',
+    'Would you have been willing to discuss a mental health issue with your direct supervisor(s)?': 'prev_supervisor',
+    'Did you feel that your previous employers took mental health as seriously as physical health?': 'prev_mental_vs_physical',
+    'Did you hear of or observe negative consequences for co-workers with mental health issues in your previous workplaces?': 'prev_obs_consequence',
+    'Would you be willing to bring up a physical health issue with a potential employer in an interview?': 'phys_health_interview',
+    'Why or why not?': 'phys_health_interview_why',
+    'Would you bring up a mental health issue with a potential employer in an interview?': 'mental_health_interview',
+    'Why or why not?': 'mental_health_interview_why',
+    'Do you feel that being identified as a person with a mental health issue would hurt your career?': 'career_impact',
+    'Do you think that team members/co-workers would view you more negatively if they knew you suffered from a mental health issue?': 'coworker_perception',
+    'How willing would you be to share with friends and family that you have a mental illness?': 'share_with_family',
+    'Have you observed or experienced an unsupportive or badly handled response to a mental health issue in your current or previous workplace?': 'bad_response_experience',
+    'Have your observations of how another individual who discussed a mental health disorder made you less likely to reveal a mental health issue yourself in your current workplace?': 'observation_impact',
+    'Do you have a family history of mental illness?': 'family_history',
+    'Have you had a mental health disorder in the past?': 'past_disorder',
+    'Do you currently have a mental health disorder?': 'current_disorder',
+    'If yes, what condition(s) have you been diagnosed with?': 'diagnosed_condition',
+    'If maybe, what condition(s) do you believe you have?': 'suspected_condition',
+    'Have you been diagnosed with a mental health condition by a medical professional?': 'professional_diagnosis',
+    'If so, what condition(s) were you diagnosed with?': 'professional_diagnosis_details',
+    'Have you ever sought treatment for a mental health issue from a mental health professional?': 'treatment',
+    'If you have a mental health issue, do you feel that it interferes with your work when being treated effectively?': 'treated_interference',
+    'If you have a mental health issue, do you feel that it interferes with your work when NOT being treated effectively?': 'untreated_interference',
+    'What is your age?': 'age',
+    'What is your gender?': 'gender',
+    'What country do you live in?': 'country',
+    'What US state or territory do you live in?': 'state',
+    'What country do you work in?': 'work_country',
+    'What US state or territory do you work in?': 'work_state',
+    'Which of the following best describes your work position?': 'position',
+    'Do you work remotely?': 'remote_work'
+}
+
+
+def question_key(header):
+    """Question text of a raw header: HTML tags removed and runs of spaces/newlines collapsed"""
+    text = re.sub(r'<[^>]+>', '', str(header))
+    return re.sub(r'[ \t\r\n]+', ' ', text).strip()
+
+
+def snake_case_columns(columns):
+    """Snake-case question headers as in 2016 (lowercase, no '?', '/' and spaces as '_')"""
+    return pd.Index([question_key(column) for column in columns], dtype=object).str.lower() \
+        .str.replace(' ', '_').str.replace('?', '', regex=False).str.replace('/', '_')
+
+
+class SurveyAdapter:
+    """
+    Schema adapter of a survey source.
+
+    Args:
+        years (iterable): Survey years the adapter reads (the year tag of their rows).
+        column_mapping (dict): Raw question -> shared column name. Headers and
+            questions are matched once both are normalized by normalize_columns;
+            the other headers keep their normalized name.
+        normalize_columns (callable): Header normalization, Index -> Index
+            (default: snake_case_columns).
+        fill_values (dict): Shared column -> value of its missing answers.
+        missing_category (bool): Fill the columns with more than
+            MISSING_CATEGORY_THRESHOLD missing values with 'Not specified'.
+        dayfirst (bool): Day-first timestamps.
+        timestamp_format (str): strftime format of the timestamps (default:
+            inferred); timestamps that do not parse are missing.
+        survey_gender (bool): Label the gender answers male/female/other
+            (normalize.SURVEY_GENDER_RULES, missing answers being 'other').
+        interference_scores (bool): transform_survey scores work_interfere into mh_impact_score.
+        benefit_scores (bool): transform_survey encodes the benefits answers as numbers.
+        clean (callable): Hand-written clean function clean(df, **cleaning_kwargs)
+            used instead of the declarative steps above (which then describe
+            what it does, for the lazy engine).
+        profile_columns (callable): Header normalization after which the clean
+            function reads age_column (default: column_names), used to profile
+            the whole survey before cleaning it in chunks or partitions.
+        age_column (str): Age column after profile_columns.
+        filename (str): Raw file name ('{year}' is the survey year); None for
+            sources that are not files of data/raw (the form responses).
+    """
+
+    def __init__(self, years, column_mapping=None, normalize_columns=snake_case_columns, fill_values=None,
+                 missing_category=False, dayfirst=False, timestamp_format=None, survey_gender=False,
+                 interference_scores=False, benefit_scores=False, clean=None, profile_columns=None, age_column='age',
+                 filename='survey_{year}.csv'):
+        self.years = list(years)
+        self.normalize_columns = normalize_columns
+        questions = pd.Index(list(column_mapping or {}), dtype=object)
+        self.column_mapping = dict(zip(normalize_columns(questions), (column_mapping or {}).values()))
+        self.fill_values = fill_values or {}
+        self.missing_category = missing_category
+        self.dayfirst = dayfirst
+        self.timestamp_format = timestamp_format
+        self.survey_gender = survey_gender
+        self.interference_scores = interference_scores
+        self.benefit_scores = benefit_scores
+        self.clean_function = clean
+        self.profile_columns = profile_columns or self.column_names
+        self.age_column = age_column
+        self.filename = filename
+
+    def version(self):
+        """
+        Code version of the adapter for the stage cache (see etl.load_cached_surveys):
+        a hash of its declarations and of the source of its functions.
+        """
+        functions = [function for function in (self.normalize_columns, self.clean_function, self.profile_columns)
+                     if function is not None]
+        declarations = {name: value for name, value in vars(self).items() if not callable(value)}
+        return StageCache.key(source_digest(*functions), json.dumps(declarations, sort_keys=True, default=str))
+
+    def column_names(self, columns):
+        """Shared column names of raw headers"""
+        return self.normalize_columns(pd.Index(columns, dtype=object)).map(
+            lambda column: self.column_mapping.get(column, column))
+
+    def path(self, raw_path, survey_year):
+        return os.path.join(raw_path, self.filename.format(year=survey_year))
+
+    def clean(self, df, null_columns=None, age_median=None, **cleaning_kwargs):
+        """
+        Cleaned survey in the shared schema.
+
+        Args:
+            df (pd.DataFrame): Raw survey (or a chunk of it).
+            null_columns (list): Columns filled with 'Not specified' (with
+                missing_category). Defaults to the sparse columns of df.
+            age_median (float): Fill value of the invalid ages. Defaults to the median of df.
+        """
+        if self.clean_function is not None:
+            if null_columns is not None:
+                cleaning_kwargs['null_columns'] = null_columns
+            return self.clean_function(df, age_median=age_median, **cleaning_kwargs)
+
+        df = df.copy()
+        df.columns = self.column_names(df.columns)
+        fills = {column: value for column, value in self.fill_values.items() if column in df.columns}
+        df = df.fillna(fills)
+        if self.missing_category:
+            if null_columns is None:
+                null_columns = df.columns[df.isnull().mean() > MISSING_CATEGORY_THRESHOLD]
+            df = df.fillna(dict.fromkeys([column for column in null_columns if column in df.columns],
+                                         'Not specified'))
+        if 'timestamp' in df.columns:
+            df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce', format=self.timestamp_format,
+                                             dayfirst=self.dayfirst)
+        if self.age_column in df.columns:
+            df[self.age_column] = clean_age(df[self.age_column], median=age_median)
+        if self.survey_gender and 'gender' in df.columns:
+            df['gender'] = normalize_gender(df['gender'], SURVEY_GENDER_RULES, default='other', na_label='other')
+        return df
+
+
+class SurveyRegistry:
+    """Survey year -> schema adapter"""
+
+    def __init__(self, adapters=()):
+        self.adapters = {}
+        for adapter in adapters:
+            self.register(adapter)
+
+    def register(self, adapter):
+        overlap = sorted(set(adapter.years) & set(self.adapters))
+        if overlap:
+            raise ValueError(f"Survey years {overlap} already have a schema adapter")
+        self.adapters.update(dict.fromkeys(adapter.years, adapter))
+        return adapter
+
+    def adapter(self, survey_year):
+        if survey_year not in self.adapters:
+            raise KeyError(f"No schema adapter is registered for the {survey_year} survey")
+        return self.adapters[survey_year]
+
+    def __contains__(self, survey_year):
+        return survey_year in self.adapters
+
+    def raw_files(self, raw_path):
+        """survey_year -> path of the survey_<year>.csv files of raw_path, registered or not"""
+        years = {}
+        for name in os.listdir(raw_path):
+            match = SURVEY_FILE_PATTERN.fullmatch(name)
+            if match:
+                years[int(match[1])] = os.path.join(raw_path, name)
+        return dict(sorted(years.items()))
+
+    def discover(self, raw_path):
+        """survey_year -> raw file of the surveys of raw_path read by a registered file adapter, in year order"""
+        return {
+            survey_year: path for survey_year, path in self.raw_files(raw_path).items()
+            if survey_year in self.adapters and self.adapters[survey_year].filename is not None
+        }
+
+
+# The OSMI questionnaires after 2016 (same questions and answers as 2016)
+OSMI_ADAPTER = SurveyAdapter(
+    range(2017, 2024),
+    column_mapping=OSMI_COLUMN_MAPPING,
+    fill_values={'no_employees': 'Unknown', 'tech_company': 'Unknown'},
+    missing_category=True,
+    benefit_scores=True,
+)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules in src/ import each other by plain name (as when running `python etl.py` from src/)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -0,0 +1,35 @@
+"""Paths of the test data and the base TestCase of the tests that run pipeline stages"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+import src.etl as etl
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_PATH = os.path.join(TEST_DIR, '..')
+BENCHMARKS_PATH = os.path.join(TEST_DIR, '..', '..', 'benchmarks')
+RAW_PATH = os.path.join(TEST_DIR, '..', '..', 'data', 'raw')
+FORM_CSV = os.path.join(TEST_DIR, 'fixtures', 'survey_2025_form.csv')
+
+
+class PipelineTestCase(unittest.TestCase):
+    """
+    Runs each test from a new temporary directory (self.tmp). The pipeline
+    reads the raw data of RAW_PATH and writes its processed files, outputs
+    and cache entries to self.tmp; the paths a test sets are restored after it.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp.name)
+        self.patch_paths(etl)
+
+    def patch_paths(self, module):
+        """Point the path globals of module (an etl module) at the test directories until the end of the test"""
+        patcher = mock.patch.multiple(module, DATA_RAW_PATH=RAW_PATH, DATA_PROCESSED_PATH=self.tmp.name,
+                                      OUTPUTS_PATH=self.tmp.name, CACHE_PATH=os.path.join(self.tmp.name, 'cache'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.bitmap_index import BitmapIndex, pack_rows, popcount
+from src.cache import file_digest
+
+
+def sample_frame(rows=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'age': rng.integers(18, 70, size=rows).astype(float),
+        'gender': rng.choice(['Male', 'Female', 'Other'], size=rows),
+        'country': rng.choice(['USA', 'UK', 'France', None], size=rows),
+        'benefits': rng.choice(np.array(['Yes', 'No', "Don't know", 1.0, 0.0], dtype=object), size=rows),
+        'survey_year': rng.choice([2014, 2016, 2025], size=rows),
+        'comments': [f'comment {i}' for i in range(rows)],
+    })
+
+
+class TestBitmapIndex(unittest.TestCase):
+    def setUp(self):
+        self.df = sample_frame()
+        self.index = BitmapIndex.build(self.df)
+
+    def test_indexed_columns(self):
+        self.assertEqual(list(self.index.bitmaps), ['gender', 'country', 'benefits', 'survey_year'])
+        self.assertEqual(popcount(pack_rows(np.ones(70, dtype=bool))), 70)
+
+    def test_conjunction_matches_scan(self):
+        df = self.df
+        expected = (df['country'] == 'UK') & (df['gender'] == 'Female') & (df['survey_year'] == 2016)
+        self.assertEqual(self.index.count(country='UK', gender='Female', survey_year=2016), expected.sum())
+        np.testing.assert_array_equal(self.index.row_ids(country='UK', gender='Female', survey_year='2016'),
+                                      np.flatnonzero(expected))
+
+        # Values of one column are ORed; values are matched by their CSV text
+        expected = df['country'].isin(['USA', 'UK']) & (df['benefits'] == 1.0)
+        self.assertEqual(self.index.count(country=['USA', 'UK'], benefits='1.0'), expected.sum())
+        self.assertEqual(self.index.count(country=None), df['country'].isna().sum())
+        self.assertEqual(self.index.count(country='Atlantis'), 0)
+        self.assertEqual(self.index.count(), len(df))
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'index.npz')
+            self.index.save(path)
+            loaded = BitmapIndex.load(path)
+        self.assertEqual(loaded.values('country'), self.index.values('country'))
+        self.assertEqual(loaded.count(country=[None, 'France'], gender='Other'),
+                         self.index.count(country=[None, 'France'], gender='Other'))
+
+    def test_stale_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            dataset, path = os.path.join(tmp, 'integrated.csv'), os.path.join(tmp, 'index.npz')
+            self.df.to_csv(dataset, index=False)
+            BitmapIndex.build(self.df, digest=file_digest(dataset)).save(path)
+            self.assertEqual(BitmapIndex.load(path, dataset).count(country='UK'), self.index.count(country='UK'))
+
+            self.df.iloc[:10].to_csv(dataset, mode='a', header=False, index=False)
+            with self.assertRaises(ValueError):
+                BitmapIndex.load(path, dataset)
+            # An index without a digest cannot be checked
+            self.index.save(path)
+            with self.assertRaises(ValueError):
+                BitmapIndex.load(path, dataset)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import unittest
+from unittest import mock
+import pandas as pd
+import src.etl as etl
+from src.cache import StageCache
+from support import FORM_CSV, PipelineTestCase
+
+
+class TestStageCache(PipelineTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = StageCache(self.tmp.name)
+
+    def test_hit_miss_and_eviction(self):
+        compute = mock.Mock(return_value=pd.DataFrame({'a': [1, 2]}))
+        first = self.cache.get('stage', 'k1', compute)
+        self.assertEqual(self.cache.stats, {'stage': 'miss'})
+        second = self.cache.get('stage', 'k1', compute)
+        self.assertEqual(self.cache.stats, {'stage': 'hit'})
+        self.assertEqual(compute.call_count, 1)
+        pd.testing.assert_frame_equal(first, second)
+
+        self.cache.get('stage', 'k2', compute)
+        self.assertEqual(self.cache.stats, {'stage': 'miss'})
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ['stage-k2.pkl'])
+
+    def test_cached_surveys(self):
+        df_survey = pd.read_csv(FORM_CSV)
+        first = etl.load_cached_surveys(self.cache, df_survey)
+        self.assertEqual(set(self.cache.stats.values()), {'miss'})
+
+        cache = StageCache(self.tmp.name)
+        second = etl.load_cached_surveys(cache, df_survey)
+        self.assertEqual(cache.stats, {f'transform_survey_{year}': 'hit' for year in (2014, 2016, 2025)})
+
+        for cached, fresh in zip(second, first):
+            pd.testing.assert_frame_equal(cached, fresh)
+
+    def test_adapter_changes_invalidate_cached_surveys(self):
+        df_survey = pd.read_csv(FORM_CSV)
+        etl.load_cached_surveys(self.cache, df_survey)
+
+        with mock.patch.dict(etl.OSMI_COLUMN_MAPPING, {'What is your age?': 'respondent_age'}):
+            cache = StageCache(self.tmp.name)
+            df_2016 = etl.load_cached_surveys(cache, df_survey)[1]
+        self.assertEqual(cache.stats['clean_survey_2016'], 'miss')
+        self.assertIn('respondent_age', df_2016.columns)
+
+        with mock.patch.object(etl.SURVEYS.adapter(2014), 'interference_scores', False):
+            cache = StageCache(self.tmp.name)
+            df_2014 = etl.load_cached_surveys(cache, df_survey)[0]
+        self.assertEqual(cache.stats['transform_survey_2014'], 'miss')
+        self.assertNotIn('mh_impact_score', df_2014.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
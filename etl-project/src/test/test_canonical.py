@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.canonical import COUNTRY_ISO_CODES, CanonicalIndex, unseen_values
+from support import RAW_PATH
+
+OECD_CSV = os.path.join(RAW_PATH, 'oecd_2024.csv')
+
+
+class TestCanonical(unittest.TestCase):
+    def test_spelling_variants(self):
+        index = CanonicalIndex()
+        countries = pd.Series(['United States of America', ' united  states ', 'US', 'uk', 'Tunisie', None,
+                               'Atlantis'])
+        self.assertEqual(index.canonicalize(countries, 'country').fillna('missing').tolist(),
+                         ['USA', 'USA', 'USA', 'UK', 'Tunisia', 'missing', 'Atlantis'])
+        answers = pd.Series(['Don’t know', "I don't know", 'yes'])
+        self.assertEqual(index.canonicalize(answers, 'benefits').tolist(), ["Don't know", "I don't know", 'Yes'])
+
+    def test_iso_codes_match_oecd_locations(self):
+        oecd = pd.read_csv(OECD_CSV)[['LOCATION', 'Country']].drop_duplicates()
+        oecd = oecd[oecd['LOCATION'] != 'OECD']
+        canonical = CanonicalIndex().canonicalize(oecd['Country'], 'country')
+        self.assertEqual(canonical.map(COUNTRY_ISO_CODES).tolist(), oecd['LOCATION'].tolist())
+
+    def test_learned_mappings_are_persisted(self):
+        index = CanonicalIndex()
+        index.canonicalize(pd.Series(['United Kingdom', 'Atlantis']), 'country')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'canonical_index.json')
+            index.save(path)
+            loaded = CanonicalIndex.load(path)
+        # Unseen values are not learned, so they are reported again on the next run
+        self.assertEqual(loaded.learned['country'], {'United Kingdom': 'UK'})
+
+    def test_unseen_values(self):
+        df = pd.DataFrame({'country': ['USA', 'Atlantis', None], 'benefits': ['Yes', 1.0, 'Maybe']})
+        self.assertEqual(unseen_values(df), {'country': ['Atlantis'], 'benefits': ['Maybe']})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import io
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+import src.cli as cli
+import src.config as config
+from src.cli import main
+from support import FORM_CSV, RAW_PATH, SRC_PATH, PipelineTestCase
+
+
+class TestCli(PipelineTestCase):
+    def setUp(self):
+        super().setUp()
+        # main() points the pipeline module it imports (etl, not src.etl) at the paths it was given
+        import etl
+        self.patch_paths(etl)
+
+    def test_paths_do_not_depend_on_the_current_directory(self):
+        self.assertTrue(os.path.isabs(config.DATA_RAW_PATH))
+        self.assertTrue(os.path.exists(os.path.join(config.DATA_RAW_PATH, 'survey_2014.csv')))
+
+    def test_choices(self):
+        import etl
+        import writers
+        self.assertEqual(set(cli.OUTPUT_FORMATS), set(writers.OUTPUT_FORMATS))
+        self.assertEqual(cli.ENGINES, etl.ENGINES)
+        for option in ('--output-format=xlsx', '--engine=spark'):
+            with self.assertRaises(SystemExit), mock.patch('sys.stderr', io.StringIO()) as stderr:
+                main([option])
+            self.assertIn('invalid choice', stderr.getvalue())
+
+    def test_import_does_not_load_sklearn(self):
+        code = "import sys, etl; print(sorted({name.split('.')[0] for name in sys.modules} & {'sklearn', 'polars'}))"
+        output = subprocess.run([sys.executable, '-c', code], env=dict(os.environ, PYTHONPATH=SRC_PATH),
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), '[]')
+
+    def test_run_with_paths(self):
+        processed, outputs = os.path.join(self.tmp.name, 'processed'), os.path.join(self.tmp.name, 'outputs')
+        main(['--raw-dir', RAW_PATH, '--processed-dir', processed, '--outputs-dir', outputs, '--form', FORM_CSV,
+              '--chunksize', '500'])
+
+        self.assertTrue(os.path.exists(os.path.join(processed, 'final_cleaned_survey_2016.csv')))
+        self.assertEqual(sorted(os.listdir(outputs)), ['final_dashboard_cube.json', 'final_integrated.csv',
+                                                       'final_metadata.json'])
+        # Nothing is written to the current directory
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ['outputs', 'processed'])
+
+
+if __name__ == '__main__':
+    unittest.main()
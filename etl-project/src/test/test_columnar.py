@@ -0,0 +1,124 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+import src.etl as etl
+from src.columnar import load_columnar, write_columnar
+from src.schema import apply_dtype_plan
+from src.writers import typed_frame
+from support import FORM_CSV, RAW_PATH, SRC_PATH, PipelineTestCase
+
+# Opens the dataset in one worker process and prints the anonymous (private, not file-backed)
+# memory it added, once every column has been read
+WORKER = '''
+import sys
+import pandas as pd
+from columnar import load_columnar
+
+def anonymous_kb():
+    with open('/proc/self/smaps_rollup') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith('Anonymous:'))
+
+before = anonymous_kb()
+df = load_columnar(sys.argv[2]) if sys.argv[1] == 'columnar' else pd.read_csv(sys.argv[2])
+answers = sum(int(df[column].notna().sum()) for column in df.columns)
+print(anonymous_kb() - before, answers)
+'''
+WORKERS = 3
+
+
+def integrated_rows():
+    df_2025 = etl.clean_survey_2025(pd.read_csv(FORM_CSV))
+    df_2014 = etl.clean_survey_2014(pd.read_csv(os.path.join(RAW_PATH, 'survey_2014.csv')))
+    df_2016 = etl.clean_survey_2016(pd.read_csv(os.path.join(RAW_PATH, 'survey_2016.csv')))
+    df_2014, df_2016, df_2025 = etl.transform_surveys(df_2014, df_2016, df_2025)
+    return etl.clean_final_df(etl.merge_all_surveys(df_2014, df_2016, df_2025))
+
+
+def is_mapped(array):
+    """Whether array is a view of a memory-mapped file"""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+class TestColumnar(PipelineTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.final_df = integrated_rows()
+
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.tmp.name, 'final_integrated_columns')
+
+    def test_round_trip(self):
+        for df in (self.final_df, apply_dtype_plan(self.final_df)):
+            write_columnar(df, self.path)
+            loaded = load_columnar(self.path)
+            self.assertEqual(loaded.to_csv(index=False), typed_frame(df).to_csv(index=False))
+        self.assertEqual(str(loaded['treatment'].dtype), 'boolean')
+        self.assertEqual(list(load_columnar(self.path, ['gender', 'age']).columns), ['gender', 'age'])
+        with self.assertRaises(KeyError):
+            load_columnar(self.path, ['gender', 'salary'])
+
+    def test_zero_copy(self):
+        write_columnar(self.final_df, self.path)
+        loaded = load_columnar(self.path)
+        with open(os.path.join(self.path, 'columns.json')) as f:
+            files = {column['name']: column['files'] for column in json.load(f)['columns']}
+        age = np.load(os.path.join(self.path, files['age']['values']), mmap_mode='r')
+        self.assertTrue(is_mapped(loaded['age'].to_numpy()))
+        self.assertTrue(is_mapped(loaded['gender'].cat.codes.to_numpy()))
+
+        # Copy-on-write: the process sees its change, the file is unchanged
+        loaded.loc[0, 'age'] = -1
+        self.assertEqual(loaded.loc[0, 'age'], -1)
+        self.assertEqual(age[0], self.final_df.loc[0, 'age'])
+
+    def test_rewrite_publishes_a_new_generation(self):
+        write_columnar(self.final_df, self.path)
+        mapped = load_columnar(self.path)
+        smaller = self.final_df.drop(columns=['comments']).iloc[:10]
+        write_columnar(smaller, self.path)
+
+        self.assertEqual(load_columnar(self.path).to_csv(index=False), typed_frame(smaller).to_csv(index=False))
+        # Only the sidecar and the new generation are left, without the dropped column
+        self.assertEqual(sorted(os.listdir(self.path)), ['columns.json', 'g000002'])
+        with open(os.path.join(self.path, 'columns.json')) as f:
+            files = [file for column in json.load(f)['columns'] for file in column['files'].values()]
+        self.assertEqual(sorted(os.path.join('g000002', name) for name in os.listdir(os.path.join(self.path, 'g000002'))),
+                         sorted(files))
+        # A frame mapped before the rewrite still reads the previous generation
+        self.assertEqual(mapped.to_csv(index=False), typed_frame(self.final_df).to_csv(index=False))
+
+    @unittest.skipUnless(os.path.exists('/proc/self/smaps_rollup'), 'needs /proc/self/smaps_rollup (Linux)')
+    def test_workers_share_the_mapped_pages(self):
+        df = pd.concat([self.final_df] * 40, ignore_index=True)
+        csv_path = os.path.join(self.tmp.name, 'final_integrated.csv')
+        df.to_csv(csv_path, index=False)
+        write_columnar(df, self.path)
+
+        env = dict(os.environ, PYTHONPATH=SRC_PATH)
+        memory, answers = {}, set()
+        for layout, path in [('csv', csv_path), ('columnar', self.path)]:
+            workers = [subprocess.Popen([sys.executable, '-c', WORKER, layout, path], env=env, stdout=subprocess.PIPE,
+                                        text=True) for _ in range(WORKERS)]
+            outputs = [worker.communicate()[0].split() for worker in workers]
+            self.assertTrue(all(worker.returncode == 0 for worker in workers))
+            memory[layout] = [int(kb) for kb, _ in outputs]
+            answers |= {worker_answers for _, worker_answers in outputs}
+
+        # Every worker sees the same answers
+        self.assertEqual(len(answers), 1)
+
+        # Each CSV worker holds a private copy of the data; the mapped columns are shared
+        self.assertLess(max(memory['columnar']) * 10, min(memory['csv']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import unittest
+import numpy as np
+import pandas as pd
+import src.etl as etl
+from src.cube import build_cube, merge_cubes, encode_cube, decode_cube, cube_counts
+from support import FORM_CSV, PipelineTestCase
+
+
+def sample_frame(rows=400, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'survey_year': rng.choice([2014, 2016, 2025], size=rows),
+        'age': rng.integers(18, 70, size=rows).astype(float),
+        'gender': rng.choice(['Male', 'Female', 'Other', None], size=rows),
+        'country': rng.choice(['USA', 'UK', 'France', None], size=rows),
+        'remote_work': rng.choice(['Yes', 'No'], size=rows),
+        'tech_company': rng.choice(['Yes', 'No', 1.0, 0.0], size=rows),
+        # 2014 answers Yes/No, 2016 answers 1/0
+        'treatment': rng.choice(['Yes', 'No', 1, 0], size=rows),
+        'benefits': rng.choice(['Yes', "Don't know", 1.0, None], size=rows),
+    })
+    df.loc[rng.random(rows) < 0.1, 'age'] = np.nan
+    return df
+
+
+class TestCube(unittest.TestCase):
+    def test_counts_match_filtered_rows(self):
+        df = sample_frame()
+        encoded = json.loads(json.dumps(encode_cube(build_cube(df))))
+
+        counts = cube_counts(encoded, 'treatment', max_age=39, gender='Male', country=['USA', 'UK'])
+        rows = df[(df['age'] <= 39) & (df['gender'] == 'Male') & df['country'].isin(['USA', 'UK'])]
+        expected = rows['treatment'].astype(str).value_counts()
+        self.assertEqual(counts, {(value,): count for value, count in expected.items()})
+
+        # Missing values are cells of their own
+        self.assertEqual(cube_counts(encoded, 'respondents', country=[None]), {(): df['country'].isna().sum()})
+        self.assertEqual(sum(cube_counts(encoded, 'benefits').values()), len(df))
+        self.assertEqual(encoded['values']['tech_company'], ['0.0', '1.0', 'No', 'Yes'])
+
+    def test_merged_chunks_match_whole(self):
+        df = sample_frame()
+        merged = build_cube(df.iloc[:150])
+        for start in (150, 300):
+            merged = merge_cubes(merged, build_cube(df.iloc[start:start + 150]))
+        self.assertEqual(encode_cube(merged), encode_cube(build_cube(df)))
+
+    def test_decode_round_trip(self):
+        encoded = json.loads(json.dumps(encode_cube(build_cube(sample_frame()))))
+        self.assertEqual(encode_cube(decode_cube(encoded)), encoded)
+
+
+class TestCubeOutput(PipelineTestCase):
+    def test_streaming_cube_matches_in_memory(self):
+        final_df = etl.run_etl(form_source=etl.CsvFormSource(FORM_CSV))
+        with open('final_dashboard_cube.json') as f:
+            expected = json.load(f)
+        self.assertEqual(expected['rows'], len(final_df))
+
+        etl.run_etl_streaming(500, form_source=etl.CsvFormSource(FORM_CSV))
+        with open('final_dashboard_cube.json') as f:
+            self.assertEqual(json.load(f), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
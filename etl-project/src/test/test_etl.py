@@ -1,19 +1,69 @@
-import unittest
-import pandas as pd
-from src.etl import clean_oecd, clean_survey_2014
-
-class TestETL(unittest.TestCase):
-    def test_clean_oecd(self):
-        # Create test data
-        test_data = pd.DataFrame({
-            'STRUCTURE': ['A', 'B', None],
-            'OBS_VALUE': [1, 2, 3]
-        })
-        # Test cleaning function
-        cleaned = clean_oecd(test_data)
-        self.assertFalse(cleaned.empty)
-        
-    # Add more tests for each function
-
-if __name__ == '__main__':
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from src.etl import clean_oecd, clean_survey_2014, transform_oecd, join_oecd_features, oecd_country_table
+from support import RAW_PATH
+
+OECD_CSV = os.path.join(RAW_PATH, 'oecd_2024.csv')
+# Country table shipped in data/outputs before the OECD stage was rebuilt
+COUNTRY_TABLE_CSV = os.path.join(RAW_PATH, '..', 'outputs', 'final_mental_health_oecd_integrated.csv')
+
+class TestETL(unittest.TestCase):
+    def test_clean_oecd(self):
+        # Create test data
+        test_data = pd.DataFrame({
+            'STRUCTURE': ['A', 'B', None],
+            'OBS_VALUE': [1, 2, 3]
+        })
+        # Test cleaning function
+        cleaned = clean_oecd(test_data)
+        self.assertFalse(cleaned.empty)
+
+    def test_transform_oecd(self):
+        df_oecd = clean_oecd(pd.read_csv(OECD_CSV))
+        features = transform_oecd(df_oecd)
+        # One row per country (without the OECD aggregate), one column per indicator
+        self.assertEqual(features.shape, (41, 24))
+        self.assertNotIn('OECD', features.index)
+        np.testing.assert_allclose(features.mean(), 0, atol=1e-9)
+
+    def test_join_oecd_features(self):
+        features = transform_oecd(clean_oecd(pd.read_csv(OECD_CSV)))
+        final_df = pd.DataFrame({'country': ['USA', 'UK', 'France', 'Tunisia', None, 'USA']})
+        joined = join_oecd_features(final_df, features)
+
+        self.assertEqual(joined['country_code'].tolist()[:3], ['USA', 'GBR', 'FRA'])
+        self.assertTrue(joined.loc[[3, 4], features.columns].isna().all().all())
+        self.assertEqual(joined.loc[0, 'oecd_je_lmis'], features.loc['USA', 'oecd_je_lmis'])
+        self.assertEqual(len(joined), len(final_df))
+
+    def test_oecd_country_table(self):
+        df_oecd = clean_oecd(pd.read_csv(OECD_CSV))
+        features = transform_oecd(df_oecd)
+        final_df = pd.DataFrame({
+            'survey_year': [2014, 2014, 2014, 2016, 2016, 2025],
+            'country': ['USA', 'USA', 'France', 'USA', 'USA', 'USA'],
+            'age': [30.0, 40.0, 50.0, 20.0, 30.0, 60.0],
+            'gender': ['Male', 'Female', 'Male', 'Female', 'Female', 'Male'],
+            'treatment': ['Yes', 'No', 'Yes', 1, 0, 'Yes'],
+            'mh_impact_score': [1.0, 3.0, 2.0, None, None, 0.0],
+            'benefits': ['Yes', "Don't know", 'No', 1.0, 1.0, 'Yes'],
+        })
+        table = oecd_country_table(join_oecd_features(final_df, features), features, df_oecd)
+
+        # Same name and columns as the table consumers already read
+        self.assertEqual(table.columns.tolist(), pd.read_csv(COUNTRY_TABLE_CSV, nrows=0).columns.tolist())
+        self.assertEqual(len(table), len(features))
+        usa = table.set_index('location_code').loc['USA']
+        self.assertEqual(usa['country_code'], 'UNITED STATES')
+        self.assertEqual((usa['2014_treatment'], usa['2014_age'], usa['2016_age']), (0.5, 35.0, 25.0))
+        self.assertEqual((usa['2014_mh_impact_score'], usa['2016_what_is_your_gender']), (2.0, 'Female'))
+        self.assertEqual((usa['avg_age'], usa['benefit_coverage_change']), (36.0, 0.5))
+        self.assertEqual(usa['Job_Market_Insecurity'], features.loc['USA', 'oecd_je_lmis'])
+        self.assertTrue(table.set_index('location_code').loc['JPN', ['2014_age', 'avg_age']].isna().all())
+        
+    # Add more tests for each function
+
+if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
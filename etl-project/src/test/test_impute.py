@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.impute import KNNImputer
+from src.impute import imputation_blocks, impute_knn, column_stats
+
+
+def sample_frame(rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'country': rng.choice(['USA', 'UK', 'France', 'Tunisia', None], size=rows),
+        'age': rng.integers(18, 70, size=rows).astype(float),
+        'mh_impact_score': rng.integers(0, 4, size=rows).astype(float),
+        'benefits': rng.choice(['Yes', 'No', "Don't know", 1.0, 0.0], size=rows),
+        'leave': rng.choice(['Very easy', 'Somewhat difficult', "Don't know"], size=rows),
+        'oecd_je_lmis': rng.normal(size=rows),
+    })
+    for column in ('age', 'mh_impact_score', 'oecd_je_lmis'):
+        df.loc[rng.random(rows) < 0.2, column] = np.nan
+    return df
+
+
+class TestImpute(unittest.TestCase):
+    def test_blocks_cover_rows_once(self):
+        keys = pd.Series(['b'] * 7 + ['a'] * 2 + [None] * 3 + ['c'] * 1)
+        blocks = imputation_blocks(keys, block_rows=4)
+        self.assertTrue(all(len(block) <= 4 for block in blocks))
+        np.testing.assert_array_equal(np.sort(np.concatenate(blocks)), np.arange(len(keys)))
+        # The 7 rows of 'b' are split in two blocks holding only 'b' rows
+        self.assertEqual(sum(set(keys.iloc[block]) == {'b'} for block in blocks), 2)
+
+    def test_single_block_is_exact_knn(self):
+        # Continuous values, so there are no ties between neighbour distances
+        rng = np.random.default_rng(2)
+        df = pd.DataFrame({
+            'country': rng.choice(['USA', 'UK'], size=200),
+            'age': rng.uniform(18, 70, size=200),
+            'oecd_je_lmis': rng.normal(size=200),
+            'oecd_hs_leb': rng.normal(size=200),
+        })
+        for column in ('age', 'oecd_je_lmis', 'oecd_hs_leb'):
+            df.loc[rng.random(200) < 0.2, column] = np.nan
+        result = impute_knn(df, block_rows=len(df), n_neighbors=3, workers=1)
+
+        columns = ['age', 'oecd_je_lmis', 'oecd_hs_leb']
+        values = df[columns].to_numpy()
+        mean, std = column_stats(values)
+        expected = KNNImputer(n_neighbors=3).fit_transform((values - mean) / std) * std + mean
+        expected = np.where(np.isnan(values), expected, values)
+
+        self.assertFalse(result[columns].isna().any().any())
+        np.testing.assert_allclose(result[columns].to_numpy(), expected)
+
+    def test_blocked_pool_matches_serial(self):
+        df = sample_frame(rows=500, seed=1)
+        serial = impute_knn(df, block_rows=120, workers=1)
+        pooled = impute_knn(df, block_rows=120, workers=2)
+        pd.testing.assert_frame_equal(serial, pooled)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import json
+import os
+import unittest
+import pandas as pd
+import src.etl as etl
+from src.bitmap_index import BitmapIndex
+from support import FORM_CSV, PipelineTestCase
+
+
+class TestIncremental(PipelineTestCase):
+    def run_full(self, name, form_source):
+        etl.DATA_PROCESSED_PATH = etl.OUTPUTS_PATH = os.path.join(self.tmp.name, name)
+        etl.run_etl(form_source=form_source)
+
+    def read_outputs(self):
+        return [pd.read_csv(os.path.join(etl.OUTPUTS_PATH, f'final_{name}.csv'), low_memory=False)
+                for name in ('integrated', 'cleaned_survey_2025')]
+
+    def read_cube(self):
+        with open(os.path.join(etl.OUTPUTS_PATH, 'final_dashboard_cube.json')) as f:
+            return json.load(f)
+
+    def test_append_new_responses(self):
+        responses = pd.read_csv(FORM_CSV)
+        first_batch = os.path.join(self.tmp.name, 'first_batch.csv')
+        responses.iloc[:15].to_csv(first_batch, index=False)
+
+        self.run_full('expected', etl.CsvFormSource(FORM_CSV))
+        expected = self.read_outputs()
+        expected_cube = self.read_cube()
+
+        self.run_full('incremental', etl.CsvFormSource(first_batch))
+        # The full run's index matches its integrated output
+        BitmapIndex.load(etl.bitmap_index_path(), os.path.join(etl.OUTPUTS_PATH, 'final_integrated.csv'))
+        self.assertEqual(etl.run_etl(form_source=etl.CsvFormSource(FORM_CSV), incremental=True), 8)
+        # The index and columns of the full run do not cover the appended rows
+        self.assertFalse(os.path.exists(etl.bitmap_index_path()))
+        self.assertFalse(os.path.exists(etl.columnar_path()))
+        # Nothing new on the next run
+        self.assertEqual(etl.run_etl_incremental(etl.CsvFormSource(FORM_CSV)), 0)
+
+        for result, reference in zip(self.read_outputs(), expected):
+            pd.testing.assert_frame_equal(result, reference)
+        # The dashboards read the cube only: it counts the appended responses too
+        self.assertEqual(self.read_cube(), expected_cube)
+
+    def test_requires_state(self):
+        etl.DATA_PROCESSED_PATH = etl.OUTPUTS_PATH = self.tmp.name
+        with self.assertRaises(FileNotFoundError):
+            etl.run_etl_incremental(etl.CsvFormSource(FORM_CSV))
+
+
+if __name__ == '__main__':
+    unittest.main()
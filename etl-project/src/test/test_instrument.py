@@ -0,0 +1,59 @@
+import json
+import pstats
+import unittest
+import pandas as pd
+import src.etl as etl
+from src.instrument import StageMetrics
+from support import FORM_CSV, PipelineTestCase
+
+
+class TestStageMetrics(unittest.TestCase):
+    def test_records_frame_shapes(self):
+        metrics = StageMetrics(trace_memory=True)
+        df = pd.DataFrame({'a': range(10), 'b': range(10)})
+        result = metrics.run('head', lambda frame, rows: (frame.head(rows), frame), df, rows=3)
+
+        self.assertIs(result[1], df)
+        record, = metrics.stages
+        self.assertEqual(record['stage'], 'head')
+        self.assertEqual(record['frames_in'], [[10, 2]])
+        self.assertEqual(record['frames_out'], [[3, 2], [10, 2]])
+        self.assertGreaterEqual(record['wall_seconds'], 0)
+        self.assertIn('traced_peak_mb', record)
+
+    def test_records_input_shapes_before_the_stage(self):
+        def drop_in_place(frame):
+            frame.drop(columns=['b'], inplace=True)
+            frame['c'] = 1
+            frame.drop(index=[0, 1], inplace=True)
+            return frame
+
+        metrics = StageMetrics()
+        metrics.run('drop', drop_in_place, pd.DataFrame({'a': range(10), 'b': range(10)}))
+        record, = metrics.stages
+        self.assertEqual(record['frames_in'], [[10, 2]])
+        self.assertEqual(record['frames_out'], [[8, 2]])
+
+
+class TestRunMetadata(PipelineTestCase):
+    def test_stage_metrics_in_metadata(self):
+        etl.run_etl(form_source=etl.CsvFormSource(FORM_CSV), profile_stage='clean_survey_2016')
+        with open('final_metadata.json') as f:
+            stages = json.load(f)['stages']
+
+        self.assertEqual([stage['stage'] for stage in stages], [
+            'load_datasets', 'clean_survey_2025', 'clean_survey_2014', 'clean_survey_2016',
+            'transform_surveys', 'merge_all_surveys', 'clean_final_df', 'validate_data', 'build_cube', 'load_oecd',
+            'clean_oecd', 'transform_oecd', 'join_oecd_features', 'oecd_country_table', 'save_outputs',
+            'write_columnar', 'build_bitmap_index'])
+        merge = stages[5]
+        self.assertEqual(merge['frames_out'][0][0], sum(shape[0] for shape in merge['frames_in']))
+        # clean_final_df drops columns of its input in place: its input shape is the merged one
+        self.assertEqual(stages[6]['frames_in'], merge['frames_out'])
+
+        profile_path = stages[3]['profile']
+        self.assertIn('clean_survey_2016', {func[2] for func in pstats.Stats(profile_path).stats})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import unittest
+import pandas as pd
+import src.etl as etl
+from support import BENCHMARKS_PATH, FORM_CSV, RAW_PATH, PipelineTestCase
+
+HAS_POLARS = importlib.util.find_spec('polars') is not None
+
+sys.path.insert(0, BENCHMARKS_PATH)
+
+from synthetic import write_synthetic_surveys  # noqa: E402
+
+
+@unittest.skipUnless(HAS_POLARS, 'polars is not installed')
+class TestLazyEngine(PipelineTestCase):
+    def run_outputs(self, form_csv, **kwargs):
+        """(integrated CSV text, dashboard cube) of one run"""
+        etl.run_etl(form_source=etl.CsvFormSource(form_csv), **kwargs)
+        with open('final_integrated.csv') as f:
+            integrated = f.read()
+        with open('final_dashboard_cube.json') as f:
+            return integrated, json.load(f)
+
+    def test_matches_pandas_engine(self):
+        expected = self.run_outputs(FORM_CSV)
+        self.assertEqual(self.run_outputs(FORM_CSV, engine='polars'), expected)
+        processed = pd.read_csv('final_cleaned_survey_2016.csv')
+        self.assertLessEqual(set(processed.columns), set(pd.read_csv('final_integrated.csv', nrows=0).columns))
+
+    def test_matches_pandas_engine_on_messy_surveys(self):
+        # Out-of-range and non-numeric ages, free-text genders, country spellings, unparseable timestamps
+        raw_path = os.path.join(self.tmp.name, 'raw')
+        os.makedirs(raw_path)
+        form_csv = write_synthetic_surveys(raw_path, scale=0.5, seed=1)
+        shutil.copy(os.path.join(RAW_PATH, 'oecd_2024.csv'), raw_path)
+        etl.DATA_RAW_PATH = raw_path
+
+        expected = self.run_outputs(form_csv)
+        self.assertEqual(self.run_outputs(form_csv, engine='polars'), expected)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            etl.run_etl(form_source=etl.CsvFormSource(FORM_CSV), engine='spark')
+
+
+if __name__ == '__main__':
+    unittest.main()
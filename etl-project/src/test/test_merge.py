@@ -0,0 +1,26 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.etl import merge_all_surveys
+
+
+class TestMergeAllSurveys(unittest.TestCase):
+    def test_union_schema_without_touching_inputs(self):
+        df_2014 = pd.DataFrame({'age': [30.0, 41.0], 'benefits': ['Yes', 'No'], 'comments': ['a', np.nan]})
+        df_2016 = pd.DataFrame({'age': [25.0], 'benefits': [1.0], 'tech_role': [0.0]})
+        df_2025 = pd.DataFrame({'benefits': ["Don't know"], 'age': [52.0]})
+        inputs = [df.copy() for df in (df_2014, df_2016, df_2025)]
+
+        merged = merge_all_surveys(df_2014, df_2016, df_2025)
+
+        self.assertEqual(merged.columns.tolist(), ['age', 'benefits', 'comments', 'survey_year', 'tech_role'])
+        self.assertEqual(merged['survey_year'].tolist(), [2014, 2014, 2016, 2025])
+        self.assertEqual(merged['age'].dtype, np.float64)
+        self.assertEqual(merged['benefits'].tolist(), ['Yes', 'No', 1.0, "Don't know"])
+        self.assertEqual(merged['tech_role'].isna().tolist(), [True, True, False, True])
+        for df, original in zip((df_2014, df_2016, df_2025), inputs):
+            pd.testing.assert_frame_equal(df, original)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.normalize import (SURVEY_GENDER_RULES, TRANSFORM_GENDER_RULES, normalize_gender, clean_age,
+                           age_value_counts, median_from_counts)
+
+
+class TestNormalize(unittest.TestCase):
+    def test_survey_gender_rules(self):
+        raw = pd.Series(['Male', ' f ', 'Female', 'Woman', 'non-binary', np.nan, 'M'])
+        cleaned = normalize_gender(raw, SURVEY_GENDER_RULES, default='other')
+        # Male keywords are checked first, so 'female' and 'woman' resolve to 'male'
+        self.assertEqual(cleaned.tolist(), ['male', 'female', 'male', 'male', 'other', 'other', 'male'])
+
+    def test_transform_gender_rules(self):
+        raw = pd.Series(['male', 'female', 'other', None, 'Cis Man', 'fluid'], index=[5, 3, 1, 0, 2, 4])
+        cleaned = normalize_gender(raw, TRANSFORM_GENDER_RULES, default='Other', na_label='Other')
+        self.assertEqual(cleaned.tolist(), ['Male', 'Female', 'Other', 'Other', 'Male', 'Female'])
+        self.assertEqual(cleaned.index.tolist(), raw.index.tolist())
+
+    def test_clean_age(self):
+        cleaned = clean_age(pd.Series([25, 'x', 150, 17, 35]))
+        self.assertEqual(cleaned.tolist(), [25.0, 30.0, 30.0, 30.0, 35.0])
+
+    def test_median_from_chunk_counts(self):
+        ages = pd.Series([40, 22, 22, 200, 31, 35, 'x', 58, 22])
+        counts = age_value_counts(ages[:4]).add(age_value_counts(ages[4:]), fill_value=0)
+        self.assertEqual(median_from_counts(counts), 31.0)
+        self.assertEqual(median_from_counts(age_value_counts(ages[:2])), 31.0)
+        self.assertEqual(median_from_counts(age_value_counts(ages[1:4])), 22.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import os
+import unittest
+from unittest import mock
+import pandas as pd
+import src.etl as etl
+from support import FORM_CSV, RAW_PATH
+
+
+class TestParallel(unittest.TestCase):
+    def setUp(self):
+        self.form = pd.read_csv(FORM_CSV)
+        self.expected = etl.transform_surveys(
+            etl.clean_survey_2014(pd.read_csv(os.path.join(RAW_PATH, 'survey_2014.csv'))),
+            etl.clean_survey_2016(pd.read_csv(os.path.join(RAW_PATH, 'survey_2016.csv'))),
+            etl.clean_survey_2025(self.form.copy())
+        )
+
+    def check(self, partition_rows):
+        with mock.patch.object(etl, 'DATA_RAW_PATH', RAW_PATH):
+            result = etl.process_surveys_parallel(self.form, workers=2, partition_rows=partition_rows)
+        for survey, expected in zip(result, self.expected):
+            pd.testing.assert_frame_equal(survey, expected)
+
+    def test_one_task_per_survey(self):
+        self.check(partition_rows=None)
+
+    def test_row_partitions(self):
+        # Partitions must share the whole-survey median age and 2016 null columns
+        self.check(partition_rows=300)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import os
+import unittest
+import pandas as pd
+import src.etl as etl
+from support import FORM_CSV, RAW_PATH, PipelineTestCase
+
+
+class TestColumnPruning(PipelineTestCase):
+    def integrated(self, prune_columns):
+        df_survey, df_2014, df_2016 = etl.load_datasets(etl.CsvFormSource(FORM_CSV), prune_columns)
+        df_2014, df_2016, df_2025 = etl.transform_surveys(
+            etl.clean_survey_2014(df_2014), etl.clean_survey_2016(df_2016), etl.clean_survey_2025(df_survey))
+        return etl.clean_final_df(etl.merge_all_surveys(df_2014, df_2016, df_2025)).to_csv(index=False)
+
+    def test_surviving_columns_skip_dropped_2016_questions(self):
+        usecols = etl.surviving_columns(etl.raw_survey_headers(pd.read_csv(FORM_CSV, nrows=0).columns))
+        header_2016 = pd.read_csv(os.path.join(RAW_PATH, 'survey_2016.csv'), nrows=0).columns
+        self.assertLess(len(usecols[2016]), len(header_2016))
+        self.assertIn('What is your age?', usecols[2016])
+        self.assertNotIn('Why or why not?', usecols[2016])
+
+    def test_pruned_load_keeps_integrated_output(self):
+        self.assertEqual(self.integrated(True), self.integrated(False))
+
+    def test_pruned_streaming_matches_in_memory(self):
+        path = etl.run_etl_streaming(211, form_source=etl.CsvFormSource(FORM_CSV), prune_columns=True)
+        with open(path) as f:
+            self.assertEqual(f.read(), self.integrated(False))
+
+
+if __name__ == '__main__':
+    unittest.main()
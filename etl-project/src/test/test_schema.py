@@ -0,0 +1,91 @@
+import json
+import unittest
+import pandas as pd
+import src.etl as etl
+from src.schema import answer_value, apply_dtype_plan, memory_report
+from support import FORM_CSV, PipelineTestCase
+
+
+class TestDtypePlan(unittest.TestCase):
+    def test_one_encoding_across_surveys(self):
+        df = pd.DataFrame({
+            'survey_year': [2014, 2016, 2016, 2025],
+            'age': [30.0, 41.0, 25.0, 52.0],
+            # 2014 answers Yes/No, 2016 answers 1/0
+            'treatment': ['Yes', 1, 0, 'No'],
+            'tech_company': ['Yes', 1.0, 'Unknown', 0.0],
+            'family_history': ['Yes', 'No', "I don't know", 'No'],
+            'self_employed': ['Unknown', 1, 0, 'Yes'],
+            'benefits': ['Yes', 0.0, "I don't know", 'Don’t know'],
+            'care_options': ['Not sure', 'I am not sure', "Don't know", 'Yes'],
+            'remote_work': ['Yes', 'No', 'Hybrid', None],
+            'comments': ['No comments', None, 'x', 'y'],
+        })
+        compact = apply_dtype_plan(df)
+
+        self.assertEqual(str(compact['survey_year'].dtype), 'int16')
+        self.assertEqual(str(compact['age'].dtype), 'float32')
+        self.assertEqual(compact['treatment'].tolist(), [True, True, False, False])
+        self.assertEqual(compact['tech_company'].tolist(), [True, True, pd.NA, False])
+        # Yes/no questions with a third answer keep it
+        self.assertEqual(compact['family_history'].tolist(), ['Yes', 'No', "Don't know", 'No'])
+        self.assertEqual(compact['self_employed'].tolist(), ['Unknown', 'Yes', 'No', 'Yes'])
+        self.assertEqual(compact['benefits'].tolist(), ['Yes', 'No', "Don't know", "Don't know"])
+        self.assertEqual(compact['care_options'].tolist(), ['Not sure', 'Not sure', 'Not sure', 'Yes'])
+        # Answers outside the declaration are kept, after the declared ones
+        self.assertEqual(list(compact['remote_work'].cat.categories), ['Never', 'No', 'Sometimes', 'Yes', 'Always',
+                                                                       'Hybrid'])
+        self.assertTrue(compact['remote_work'].isna().iloc[3])
+        self.assertEqual(compact['comments'].dtype, object)
+
+    def test_memory_report(self):
+        df = pd.DataFrame({'survey_year': [2014] * 1000, 'gender': ['Male', 'Female'] * 500})
+        report = memory_report(df, apply_dtype_plan(df))
+        self.assertLess(report['after_mb'] * 4, report['before_mb'])
+        self.assertEqual(set(report['columns']), {'survey_year', 'gender'})
+
+
+class TestCompactPipeline(PipelineTestCase):
+    def test_compact_run_keeps_rows(self):
+        expected = etl.run_etl(form_source=etl.CsvFormSource(FORM_CSV))
+        final_df = etl.run_etl(form_source=etl.CsvFormSource(FORM_CSV), compact_dtypes=True)
+
+        self.assertEqual(final_df.shape, expected.shape)
+        self.assertEqual(final_df['survey_year'].value_counts().to_dict(),
+                         expected['survey_year'].value_counts().to_dict())
+        self.assertEqual(final_df['country'].astype(object).where(final_df['country'].notna()).tolist(),
+                         expected['country'].tolist())
+        # Every answer keeps its count, under its shared spelling
+        for column in ['self_employed', 'family_history', 'obs_consequence']:
+            self.assertEqual(final_df[column].value_counts(dropna=False).to_dict(),
+                             {answer: count for answer, count in
+                              expected[column].map(lambda value: answer_value(value, column)).value_counts().items()
+                              if count},
+                             column)
+        with open('final_metadata.json') as f:
+            memory = json.load(f)['memory']
+        self.assertLess(memory['after_mb'], memory['before_mb'])
+
+    def test_compact_run_keeps_dashboard_cube(self):
+        etl.run_etl(form_source=etl.CsvFormSource(FORM_CSV))
+        with open('final_dashboard_cube.json') as f:
+            expected = json.load(f)
+        etl.run_etl(form_source=etl.CsvFormSource(FORM_CSV), compact_dtypes=True)
+        with open('final_dashboard_cube.json') as f:
+            self.assertEqual(json.load(f), expected)
+
+    def test_compact_run_keeps_fractional_median_age(self):
+        form = pd.read_csv(FORM_CSV)
+        # One invalid age, filled with the median of 30 and 31
+        form['Age'] = [150] + [30, 31] * 11
+        form.to_csv('form.csv', index=False)
+
+        final_df = etl.run_etl(form_source=etl.CsvFormSource('form.csv'), compact_dtypes=True)
+
+        ages = final_df.loc[final_df['survey_year'] == 2025, 'age']
+        self.assertEqual(ages.iloc[0], 30.5)
+        self.assertEqual(ages.iloc[1:].tolist(), [30, 31] * 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+import numpy as np
+import pandas as pd
+from src.service import ColumnStore, LRUCache, QueryService, make_server
+from support import PipelineTestCase
+
+
+def sample_frame(rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'age': rng.integers(18, 70, size=rows).astype(float),
+        'gender': rng.choice(['Male', 'Female', 'Other'], size=rows),
+        'country': rng.choice(['USA', 'UK', 'France', None], size=rows),
+        'treatment': rng.choice(['Yes', 'No', 1, 0], size=rows),
+        'survey_year': rng.choice([2014, 2016, 2025], size=rows),
+    })
+    df.loc[rng.random(rows) < 0.1, 'age'] = np.nan
+    return df
+
+
+class TestColumnStore(unittest.TestCase):
+    def test_query_matches_pandas(self):
+        df = sample_frame()
+        result = ColumnStore(df).query({'country': ('UK', 'USA'), 'survey_year': ('2016',)}, ('gender', 'treatment'),
+                                       max_age=40)
+
+        rows = df[df['country'].isin(['UK', 'USA']) & (df['survey_year'] == 2016) & (df['age'] <= 40)]
+        expected = rows.astype({'treatment': str}).groupby(['gender', 'treatment']).size()
+        self.assertEqual(result['rows'], len(rows))
+        self.assertEqual({(g['gender'], g['treatment']): g['count'] for g in result['groups']}, expected.to_dict())
+        self.assertEqual([g['count'] for g in result['groups']], sorted(expected, reverse=True))
+
+    def test_missing_labels_are_groups(self):
+        df = sample_frame()
+        groups = ColumnStore(df).query(group_by=('country',))['groups']
+        self.assertEqual({g['country']: g['count'] for g in groups}[None], df['country'].isna().sum())
+
+    def test_many_group_columns(self):
+        # The product of the label counts (400 ** 8) does not fit in int64
+        df = pd.DataFrame({f'c{i}': [f'{i}-{row}' for row in range(400)] for i in range(8)})
+        result = ColumnStore(df).query(group_by=tuple(df.columns))
+        self.assertEqual(len(result['groups']), 400)
+        self.assertEqual({tuple(g[c] for c in df.columns) for g in result['groups']},
+                         set(df.itertuples(index=False, name=None)))
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c')), (1, 3))
+        self.assertEqual(cache.stats, {'hits': 3, 'misses': 1, 'evictions': 1})
+
+
+class TestQueryService(PipelineTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.tmp.name, 'final_integrated.csv')
+        sample_frame().to_csv(self.path, index=False)
+        self.service = QueryService(self.tmp.name)
+
+    def test_cache_invalidated_by_new_output(self):
+        params = {'group_by': ['gender'], 'country': ['USA']}
+        first = self.service.query(params)
+        self.assertIs(self.service.query(params), first)
+
+        sample_frame(rows=500, seed=1).to_csv(self.path, index=False)
+        second = self.service.query(params)
+        self.assertNotEqual(second, first)
+        self.assertEqual(self.service.stats()['reloads'], 2)
+        self.assertEqual(self.service.stats()['rows'], 500)
+
+    def test_http(self):
+        server = make_server(self.service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f'http://127.0.0.1:{server.server_address[1]}'
+        try:
+            with urllib.request.urlopen(f'{url}/query?group_by=treatment&gender=Male&max_age=30') as response:
+                body = json.load(response)
+            self.assertEqual(body, self.service.query({'group_by': ['treatment'], 'gender': ['Male'],
+                                                       'max_age': ['30']}))
+            with self.assertRaises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(f'{url}/query?group_by=unknown')
+            self.assertEqual(error.exception.code, 400)
+
+            with mock.patch.object(self.service, 'stats', side_effect=RuntimeError('boom')):
+                with self.assertRaises(urllib.error.HTTPError) as error:
+                    urllib.request.urlopen(f'{url}/stats')
+            self.assertEqual(error.exception.code, 500)
+            self.assertEqual(json.load(error.exception), {'error': 'RuntimeError: boom'})
+
+            # A missing output (e.g. while the pipeline rewrites it) is reported, not fatal
+            os.remove(self.path)
+            with self.assertRaises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(f'{url}/query?group_by=treatment')
+            self.assertEqual(error.exception.code, 503)
+            self.assertIn('run the pipeline first', json.load(error.exception)['error'])
+
+            sample_frame().to_csv(self.path, index=False)
+            with urllib.request.urlopen(f'{url}/query?group_by=treatment') as response:
+                self.assertEqual(response.status, 200)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import os
+import unittest
+import pandas as pd
+import src.etl as etl
+from support import FORM_CSV, RAW_PATH, PipelineTestCase
+
+
+class TestStreaming(PipelineTestCase):
+    def in_memory_integrated(self):
+        df_2025 = etl.clean_survey_2025(pd.read_csv(FORM_CSV))
+        df_2014 = etl.clean_survey_2014(pd.read_csv(os.path.join(RAW_PATH, 'survey_2014.csv')))
+        df_2016 = etl.clean_survey_2016(pd.read_csv(os.path.join(RAW_PATH, 'survey_2016.csv')))
+        df_2014, df_2016, df_2025 = etl.transform_surveys(df_2014, df_2016, df_2025)
+        final_df = etl.clean_final_df(etl.merge_all_surveys(df_2014, df_2016, df_2025))
+        return final_df.to_csv(index=False)
+
+    def test_streaming_matches_in_memory(self):
+        expected = self.in_memory_integrated()
+        # Small chunks: the median age and 2016 null columns must still come from the whole files
+        os.makedirs(etl.columnar_path())
+        open(etl.bitmap_index_path(), 'w').close()
+        path = etl.run_etl_streaming(97, form_source=etl.CsvFormSource(FORM_CSV))
+        with open(path) as f:
+            self.assertEqual(f.read(), expected)
+        # The outputs of a previous full run would describe other rows
+        self.assertFalse(os.path.exists(etl.columnar_path()))
+        self.assertFalse(os.path.exists(etl.bitmap_index_path()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import unittest
+import pandas as pd
+import src.etl as etl
+from src.surveys import OSMI_ADAPTER, SurveyAdapter, SurveyRegistry
+from support import FORM_CSV, RAW_PATH, PipelineTestCase
+
+
+def later_osmi_survey(path):
+    """The 2016 answers with some headers reworded as in the later OSMI exports (HTML markup, line breaks)"""
+    df = pd.read_csv(os.path.join(RAW_PATH, 'survey_2016.csv'))
+    headers = {
+        'What is your age?': 'What is your <strong>age</strong>?',
+        'What is your gender?': 'What is your\ngender?',
+        'Does your employer provide mental health benefits as part of healthcare coverage?':
+            '<b>Does your employer provide mental health benefits</b>  as part of healthcare coverage?',
+    }
+    df.rename(columns=headers).to_csv(path, index=False)
+
+
+class TestSurveys(PipelineTestCase):
+    def setUp(self):
+        super().setUp()
+        self.raw = os.path.join(self.tmp.name, 'raw')
+        os.makedirs(self.raw)
+        for name in ('survey_2014.csv', 'survey_2016.csv', 'oecd_2024.csv'):
+            shutil.copy(os.path.join(RAW_PATH, name), self.raw)
+        later_osmi_survey(os.path.join(self.raw, 'survey_2017.csv'))
+        # No adapter is registered for 1999
+        pd.DataFrame({'Age': [30]}).to_csv(os.path.join(self.raw, 'survey_1999.csv'), index=False)
+        self.form = pd.read_csv(FORM_CSV)
+
+    def test_registry(self):
+        registry = SurveyRegistry([OSMI_ADAPTER])
+        with self.assertRaises(ValueError):
+            registry.register(SurveyAdapter([2014, 2018]))
+        with self.assertRaises(KeyError):
+            registry.adapter(1999)
+        self.assertEqual(list(etl.SURVEYS.discover(self.raw)), [2014, 2016, 2017])
+
+    def test_declarative_clean(self):
+        adapter = SurveyAdapter([2030], column_mapping={'Horodateur': 'timestamp', 'Your gender?': 'gender'},
+                                fill_values={'state': 'Unknown'}, timestamp_format='%d/%m/%Y %H:%M:%S',
+                                survey_gender=True)
+        df = adapter.clean(pd.DataFrame({'Horodateur': ['03/02/2030 10:00:00', 'yesterday'],
+                                         'Your gender?': ['F', None], 'State': [None, 'CA'], 'Age': [200, 30]}))
+
+        self.assertEqual(df['timestamp'].tolist(), [pd.Timestamp('2030-02-03 10:00:00'), pd.NaT])
+        self.assertEqual(df['gender'].tolist(), ['female', 'other'])
+        self.assertEqual(df['state'].tolist(), ['Unknown', 'CA'])
+        self.assertEqual(df['age'].tolist(), [30, 30])
+
+    def test_later_osmi_year_is_read_with_the_2016_mapping(self):
+        surveys = etl.ingest_surveys(self.form, workers=2, raw_path=self.raw)
+
+        self.assertEqual(list(surveys), [2014, 2016, 2017, 2025])
+        pd.testing.assert_frame_equal(surveys[2017], surveys[2016])
+
+    def test_invalid_run_options(self):
+        form_source = etl.CsvFormSource(FORM_CSV)
+        for options in ({'chunksize': 500}, {'incremental': True}, {'engine': 'polars'}):
+            with self.assertRaises(ValueError):
+                etl.run_etl(form_source=form_source, discover_surveys=True, **options)
+        # The engine is checked before the streaming and incremental modes start
+        with self.assertRaises(ValueError):
+            etl.run_etl(form_source=form_source, chunksize=500, engine='spark')
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ['raw'])
+
+    def test_merge_surveys(self):
+        surveys = {2014: pd.DataFrame({'a': [1, 2]}), 2016: pd.DataFrame({'b': [3]}), 2017: pd.DataFrame({'a': [4]})}
+        merged = etl.merge_surveys(surveys)
+
+        self.assertEqual(merged.columns.tolist(), ['a', 'survey_year', 'b'])
+        self.assertEqual(merged['survey_year'].tolist(), [2014, 2014, 2016, 2017])
+        self.assertEqual(merged['a'].tolist()[3], 4)
+
+    def test_run_with_discovered_surveys(self):
+        outputs, processed = os.path.join(self.tmp.name, 'outputs'), os.path.join(self.tmp.name, 'processed')
+        etl.DATA_RAW_PATH, etl.DATA_PROCESSED_PATH, etl.OUTPUTS_PATH = self.raw, processed, outputs
+        final_df = etl.run_etl(form_source=etl.CsvFormSource(FORM_CSV), discover_surveys=True)
+
+        self.assertEqual(final_df['survey_year'].value_counts().to_dict(),
+                         {2014: 1259, 2016: 1433, 2017: 1433, 2025: len(self.form)})
+        self.assertTrue(os.path.exists(os.path.join(processed, 'final_cleaned_survey_2017.csv')))
+        with open(os.path.join(outputs, 'final_metadata.json')) as f:
+            metadata = json.load(f)
+        self.assertEqual(metadata['surveys']['2017'], 1433)
+        self.assertTrue(metadata['validation']['passed'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import json
+import unittest
+import pandas as pd
+import src.etl as etl
+from src.validation import DataValidator, validate_data
+from support import FORM_CSV, PipelineTestCase
+
+
+COLUMN_RULES = {
+    'age': {'range': (18, 100), 'max_null_rate': 0},
+    'treatment': {'allowed': ['Yes', 'No', 'Unknown'], 'max_null_rate': 0.25},
+    'benefits': {'allowed': ['Yes', 'No', "Don't know"]},
+    'survey_year': {'max_null_rate': 0},
+}
+
+
+class TestValidation(PipelineTestCase):
+    def test_rules(self):
+        df = pd.DataFrame({
+            'survey_year': [2014, 2016, 2016, 2030],
+            'age': [30.0, 17.0, 'abc', 52.0],
+            # The 2016 1/0 answers and the "I don't know" spellings are allowed answers
+            'treatment': ['Yes', 1, '0', None],
+            'benefits': ["I don't know", 1.0, 'Don’t know', 'Hybrid'],
+        })
+        validator = DataValidator(COLUMN_RULES, {2014: (1, 1), 2016: (3, None)})
+        results = validator.update(df.iloc[:2]).update(df.iloc[2:]).results()
+        rules = {(rule['rule'], rule.get('column', rule.get('survey_year'))): rule for rule in results['rules']}
+
+        self.assertFalse(results['passed'])
+        self.assertEqual(results['rows'], 4)
+        self.assertEqual((rules['range', 'age']['violations'], rules['range', 'age']['unexpected']), (2, ['17.0', 'abc']))
+        self.assertTrue(rules['allowed', 'treatment']['passed'])
+        self.assertEqual(rules['max_null_rate', 'treatment']['null_rate'], 0.25)
+        self.assertTrue(rules['max_null_rate', 'treatment']['passed'])
+        self.assertEqual(rules['allowed', 'benefits']['unexpected'], ['Hybrid'])
+        self.assertTrue(rules['rows', 2014]['passed'])
+        self.assertEqual((rules['rows', 2016]['rows'], rules['rows', 2016]['passed']), (2, False))
+        # Years without expected rows fail
+        self.assertFalse(rules['rows', 2030]['passed'])
+        json.dumps(results)
+
+    def test_missing_column(self):
+        results = validate_data(pd.DataFrame({'survey_year': [2014]}))
+        self.assertIn({'rule': 'present', 'column': 'age', 'passed': False}, results['rules'])
+
+    def test_streaming_matches_in_memory(self):
+        etl.run_etl(form_source=etl.CsvFormSource(FORM_CSV))
+        with open('final_metadata.json') as f:
+            expected = json.load(f)['validation']
+        etl.run_etl_streaming(97, form_source=etl.CsvFormSource(FORM_CSV))
+        with open('final_metadata.json') as f:
+            validation = json.load(f)['validation']
+
+        self.assertTrue(expected['passed'])
+        self.assertEqual(validation, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.writers import typed_frame, write_output
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+
+class TestWriters(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'timestamp': ['2014-08-27 11:29:31', None, '2025-05-23 12:21:33', '2014-08-27 11:30:00'],
+            'age': [37.0, 44.0, 31.0, 29.0],
+            'treatment': ['Yes', 1, 0, 'Yes'],
+            'benefits': ['Yes', 0.0, np.nan, 'Yes'],
+            'survey_year': [2014, 2016, 2025, 2014],
+        })
+        self.df = pd.concat([self.df] * 3, ignore_index=True)
+        self.df['comments'] = [f'comment {i}' for i in range(len(self.df))]
+
+    def test_typed_frame(self):
+        typed = typed_frame(self.df)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(typed['timestamp']))
+        self.assertEqual(typed['age'].dtype, np.float32)
+        self.assertEqual(typed['survey_year'].dtype, np.int16)
+        self.assertIsInstance(typed['treatment'].dtype, pd.CategoricalDtype)
+        # Mixed answers are stored as their CSV text
+        self.assertEqual(typed['benefits'].tolist()[:2], ['Yes', '0.0'])
+        self.assertTrue(pd.isna(typed['benefits'][2]))
+        # Free text is not dictionary-encoded
+        self.assertEqual(typed['comments'].dtype, object)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            write_output(self.df, 'integrated', 'xlsx')
+
+    @unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+    def test_parquet_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_output(self.df, os.path.join(tmp, 'integrated'), 'parquet')
+            self.assertTrue(path.endswith('.parquet'))
+            pd.testing.assert_frame_equal(pd.read_parquet(path), typed_frame(self.df))
+
+
+if __name__ == '__main__':
+    unittest.main()
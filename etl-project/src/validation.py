@@ -0,0 +1,170 @@
+"""
+Declarative data quality rules of the integrated dataset, checked in one pass.
+
+Every rule is declared in COLUMN_RULES or EXPECTED_ROWS:
+
+- 'range': inclusive bounds of the numeric values (a value that is not a
+  number is a violation);
+- 'allowed': declared answers of the column (see schema.py), the raw
+  values being compared through their shared spelling (see answer_label),
+  so the 2016 1/0 encodings and the "I don't know" spellings pass;
+- 'max_null_rate': highest share of missing values;
+- EXPECTED_ROWS: (min, max) rows of each survey_year, any other year failing.
+
+DataValidator scans each ruled column once, whatever the number of rules on
+it: the column is factorized and only its distinct values are checked. The
+value counts of a pass can be updated chunk by chunk, so the streaming
+pipeline validates the same rules as the in-memory one.
+
+    >>> results = validate_data(final_df)
+    >>> results['passed'], [rule for rule in results['rules'] if not rule['passed']]
+"""
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from canonical import INTERFERE_SCORES
+from config import AGE_RANGE
+from schema import CATEGORY_COLUMNS, FLAG_COLUMNS, answer_value, flag_value
+
+# Answers of the yes/no flags ("Unknown"/"Don't know" being the filled-in missing answers)
+FLAG_ANSWERS = ['Yes', 'No', 'Unknown', "Don't know"]
+
+# column -> rules; every answer column is filled by clean_final_df, so none may be missing
+COLUMN_RULES = {
+    'survey_year': {'max_null_rate': 0},
+    'age': {'range': AGE_RANGE, 'max_null_rate': 0},
+    'country': {'max_null_rate': 0},
+    'state': {'max_null_rate': 0},
+    'mh_impact_score': {'range': (min(INTERFERE_SCORES.values()), max(INTERFERE_SCORES.values()))},
+    **{column: {'allowed': FLAG_ANSWERS, 'max_null_rate': 0} for column in FLAG_COLUMNS},
+    **{column: {'allowed': declared, 'max_null_rate': 0}
+       for column, declared in CATEGORY_COLUMNS.items() if declared is not None},
+}
+
+# survey_year -> (min, max) rows (None: no bound); the 2014 and 2016 surveys are closed,
+# the 2025 form keeps growing
+EXPECTED_ROWS = {2014: (1259, 1259), 2016: (1433, 1433), 2025: (1, None)}
+
+# Unexpected values listed per failed rule
+MAX_UNEXPECTED_VALUES = 10
+
+
+def answer_label(value, column):
+    """Shared spelling of a raw answer (1/0 answers, as numbers or text, read as Yes/No)"""
+    label = answer_value(value, column)
+    flag = flag_value(label) if not isinstance(label, str) or label[:1].isdigit() else pd.NA
+    if pd.isna(flag):
+        return str(label)
+    return 'Yes' if flag else 'No'
+
+
+def range_violations(values, bounds):
+    """Mask of the distinct values outside the inclusive bounds (or not numeric)"""
+    numbers = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=float)
+    low, high = bounds
+    with np.errstate(invalid='ignore'):
+        return ~((numbers >= low) & (numbers <= high))
+
+
+def allowed_violations(values, column, allowed):
+    """Mask of the distinct values whose spelling is not an allowed answer"""
+    allowed = set(allowed)
+    return np.array([answer_label(value, column) not in allowed for value in values], dtype=bool)
+
+
+def sorted_texts(values):
+    return sorted({str(value) for value in values})[:MAX_UNEXPECTED_VALUES]
+
+
+class DataValidator:
+    """Value counts of the ruled columns, accumulated frame by frame, and the rules checked on them"""
+
+    def __init__(self, column_rules=None, expected_rows=None):
+        self.column_rules = COLUMN_RULES if column_rules is None else column_rules
+        self.expected_rows = EXPECTED_ROWS if expected_rows is None else expected_rows
+        self.rows = 0
+        self.nulls = Counter()
+        self.values = {column: Counter() for column in self.column_rules}
+        self.missing_columns = set()
+
+    def update(self, df):
+        """Add the rows of df (the integrated dataset, or one chunk of it)"""
+        self.rows += len(df)
+        for column in self.column_rules:
+            if column not in df.columns:
+                self.missing_columns.add(column)
+                continue
+            # One scan of the column: its distinct values and how often each occurs
+            codes, uniques = pd.factorize(df[column])
+            counts = np.bincount(codes + 1, minlength=len(uniques) + 1)
+            self.nulls[column] += int(counts[0])
+            self.values[column].update(dict(zip(uniques.tolist(), counts[1:].tolist())))
+        return self
+
+    def year_rows(self):
+        """survey_year -> rows (the years are the counted survey_year values)"""
+        rows = Counter()
+        for value, count in self.values.get('survey_year', {}).items():
+            rows[int(value)] += count
+        return rows
+
+    def column_results(self, column, rules):
+        if column in self.missing_columns:
+            return [{'rule': 'present', 'column': column, 'passed': False}]
+        values = list(self.values[column])
+        counts = np.array([self.values[column][value] for value in values], dtype=np.int64)
+        results = []
+        for rule, expected in rules.items():
+            if rule == 'max_null_rate':
+                null_rate = self.nulls[column] / self.rows if self.rows else 0.0
+                results.append({'rule': rule, 'column': column, 'expected': expected,
+                                'null_rate': round(null_rate, 6), 'passed': null_rate <= expected})
+                continue
+            if rule == 'range':
+                mask = range_violations(values, expected)
+                expected = list(expected)
+            elif rule == 'allowed':
+                mask = allowed_violations(values, column, expected)
+                expected = list(expected)
+            else:
+                raise ValueError(f"Unknown validation rule {rule!r} for column {column!r}")
+            violations = int(counts[mask].sum()) if len(values) else 0
+            results.append({'rule': rule, 'column': column, 'expected': expected, 'violations': violations,
+                            'unexpected': sorted_texts(value for value, bad in zip(values, mask) if bad),
+                            'passed': violations == 0})
+        return results
+
+    def row_results(self):
+        rows = self.year_rows()
+        results = []
+        for survey_year in sorted(set(self.expected_rows) | set(rows)):
+            low, high = self.expected_rows.get(survey_year, (None, 0))
+            count = rows.get(survey_year, 0)
+            passed = (low is None or count >= low) and (high is None or count <= high)
+            results.append({'rule': 'rows', 'survey_year': int(survey_year), 'expected': [low, high],
+                            'rows': int(count), 'passed': passed})
+        return results
+
+    def results(self):
+        """
+        The rules checked on the rows added so far.
+
+        Returns:
+            dict: {'passed': all the rules passed, 'rows': rows checked, 'rules': one
+            record per rule (rule, column or survey_year, expected, the measured
+            violations/null_rate/rows with up to MAX_UNEXPECTED_VALUES unexpected
+            values, passed)}, JSON-serializable.
+        """
+        rules = [result for column, column_rules in self.column_rules.items()
+                 for result in self.column_results(column, column_rules)]
+        if 'survey_year' in self.column_rules and 'survey_year' not in self.missing_columns:
+            rules += self.row_results()
+        return {'passed': all(rule['passed'] for rule in rules), 'rows': self.rows, 'rules': rules}
+
+
+def validate_data(df, expected_rows=None):
+    """Check the declared rules on the integrated dataset (see DataValidator.results)"""
+    return DataValidator(expected_rows=expected_rows).update(df).results()
@@ -0,0 +1,95 @@
+"""
+Output backends for save_outputs (and the matching readers).
+
+CSV keeps the historical text format. The columnar backends (Parquet and
+Feather, via pyarrow) store a typed copy of each frame: the timestamp as a
+datetime, ages/scores as floats, the survey year as a small integer and the
+repeated answer columns as dictionary-encoded categoricals, all compressed.
+"""
+
+import os
+
+import pandas as pd
+
+DATETIME_COLUMNS = ['timestamp']
+FLOAT_COLUMNS = ['age', 'mh_impact_score']
+INTEGER_COLUMNS = {'survey_year': 'int16'}
+
+# Text columns with at most this share of distinct values are stored as categoricals
+MAX_CATEGORY_RATIO = 0.5
+
+COMPRESSION = 'zstd'
+
+
+def typed_frame(df):
+    """
+    Build the typed copy of df written by the columnar backends.
+
+    Mixed object columns (e.g. treatment holds 'Yes' and 0/1 across surveys)
+    are stored as the strings the CSV output would contain.
+    """
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        if column in DATETIME_COLUMNS:
+            values = pd.to_datetime(values, errors='coerce')
+        elif column in FLOAT_COLUMNS:
+            values = pd.to_numeric(values, errors='coerce').astype('float32')
+        elif column in INTEGER_COLUMNS and values.notna().all():
+            values = values.astype(INTEGER_COLUMNS[column])
+        elif values.dtype == object:
+            values = values.where(values.isna(), values.astype(str))
+            if values.nunique() <= MAX_CATEGORY_RATIO * max(len(values), 1):
+                values = values.astype('category')
+        columns[column] = values
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(df)))
+
+
+def write_csv(df, path):
+    df.to_csv(path, index=False)
+
+
+def write_parquet(df, path):
+    typed_frame(df).to_parquet(path, index=False, compression=COMPRESSION)
+
+
+def write_feather(df, path):
+    typed_frame(df).to_feather(path, compression=COMPRESSION)
+
+
+# format name -> (file extension, writer)
+OUTPUT_FORMATS = {
+    'csv': ('.csv', write_csv),
+    'parquet': ('.parquet', write_parquet),
+    'feather': ('.feather', write_feather),
+}
+
+
+def write_output(df, path_without_extension, output_format='csv'):
+    """Write df with the given backend and return the file path"""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {output_format!r}, expected one of {sorted(OUTPUT_FORMATS)}")
+    extension, writer = OUTPUT_FORMATS[output_format]
+    path = path_without_extension + extension
+    writer(df, path)
+    return path
+
+
+# file extension -> reader
+OUTPUT_READERS = {
+    '.csv': pd.read_csv,
+    '.parquet': pd.read_parquet,
+    '.feather': pd.read_feather,
+}
+
+
+def find_output(path_without_extension):
+    """Most recently written file of path_without_extension in any output format (None if there is none)"""
+    paths = [path_without_extension + extension for extension, _ in OUTPUT_FORMATS.values()]
+    paths = [path for path in paths if os.path.exists(path)]
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def read_output(path):
+    """Read a file written by write_output"""
+    return OUTPUT_READERS[os.path.splitext(path)[1]](path)